@@ -0,0 +1,113 @@
+"""Asset loading on a thread pool, in named groups, with a startup profile.
+
+Every file is loaded by a job on a worker thread. pygame.image.load,
+convert_alpha, smoothscale and mixer.Sound release the GIL while SDL does
+the work, so the groups overlap each other and whatever the main thread does
+meanwhile (fonts, building the first screen). wait(group) blocks until that
+group's jobs are done; the game waits for what the first screen needs and
+collects the rest later.
+
+Each group records its number of jobs, the summed job time and when it was
+finished (relative to the loader's creation); format_report() is the startup
+breakdown. Work done on the calling thread can be booked on a group with
+`with loader.timed(group):`.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class AssetGroup:
+    def __init__(self, name):
+        self.name = name
+        self.futures = []
+        self.work_ms = 0.0
+        self.inline_ms = 0.0
+        self.ready_ms = None
+
+
+class AssetLoader:
+    def __init__(self, workers=None):
+        self.workers = workers or min(8, (os.cpu_count() or 1) + 2)
+        self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix="assets")
+        self.lock = threading.Lock()
+        self.t0 = time.perf_counter()
+        self.groups = {}
+        self.marks = []
+
+    def _now_ms(self):
+        return (time.perf_counter() - self.t0) * 1000.0
+
+    def group(self, name):
+        g = self.groups.get(name)
+        if g is None:
+            g = self.groups[name] = AssetGroup(name)
+        return g
+
+    def load(self, group, fn, *args):
+        """Run fn(*args) on the pool as part of `group`; returns a Future."""
+        g = self.group(group)
+
+        def job():
+            t0 = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                with self.lock:
+                    g.work_ms += (time.perf_counter() - t0) * 1000.0
+                    g.ready_ms = max(g.ready_ms or 0.0, self._now_ms())
+        future = self.pool.submit(job)
+        g.futures.append(future)
+        return future
+
+    @contextmanager
+    def timed(self, group):
+        """Book the work in the with-block (on this thread) on `group`."""
+        g = self.group(group)
+        t0 = time.perf_counter()
+        try:
+            yield g
+        finally:
+            g.inline_ms += (time.perf_counter() - t0) * 1000.0
+            g.ready_ms = max(g.ready_ms or 0.0, self._now_ms())
+
+    def ready(self, *groups):
+        """True when every job of `groups` has finished (does not block)."""
+        return all(f.done() for name in groups for f in self.group(name).futures)
+
+    def wait(self, *groups):
+        """Block until `groups` are loaded; re-raises the first job error."""
+        for name in groups:
+            for f in self.group(name).futures:
+                f.result()
+
+    def mark(self, label):
+        """Record when `label` first happened (e.g. the first frame), for the report."""
+        if label not in dict(self.marks):
+            self.marks.append((label, self._now_ms()))
+
+    def stats(self):
+        return {
+            name: {
+                "jobs": len(g.futures),
+                "work_ms": g.work_ms,
+                "inline_ms": g.inline_ms,
+                "ready_ms": g.ready_ms,
+            }
+            for name, g in self.groups.items()
+        }
+
+    def format_report(self):
+        lines = [f"startup profile ({self.workers} loader threads):"]
+        for g in self.groups.values():
+            if self.ready(g.name) and g.ready_ms is not None:
+                ready = f"ready at {g.ready_ms:7.1f} ms"
+            else:
+                ready = "still loading"
+            lines.append(f"  {g.name:<8} {len(g.futures):3d} jobs  {g.work_ms:7.1f} ms on workers  "
+                         f"{g.inline_ms:6.1f} ms inline  {ready}")
+        for label, at_ms in self.marks:
+            lines.append(f"  {label} at {at_ms:.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,107 @@
+"""Mixer channel management: reserved loop channels and per-sound voice limits.
+
+Sound.play() takes any free mixer channel and silently does nothing when
+all are busy, so a burst of short effects (rapid fire, chained explosions)
+can crowd out other effects. AudioManager splits the mixer into:
+
+- reserved loop channels (the engine), which no effect can take. set_loop()
+  only touches the channel when the requested sound changes, so callers can
+  state what should be looping every frame without polling the mixer;
+- a shared pool for one-shot effects, with an optional voice limit per
+  effect. When an effect is at its limit, its oldest voice is stopped and
+  reused ("stolen"). When the pool is full, the new voice is dropped.
+
+pygame.mixer.music streams outside the channels, so music never competes
+with effects.
+"""
+from collections import deque
+
+import pygame
+
+
+class AudioManager:
+    def __init__(self, channels=16, loops=("engine",), limits=None):
+        pygame.mixer.set_num_channels(channels)
+        # also keeps plain Sound.play() calls off the loop channels
+        pygame.mixer.set_reserved(len(loops))
+        self.loops = {name: pygame.mixer.Channel(i) for i, name in enumerate(loops)}
+        self.looping = {name: None for name in loops}
+        self.pool = [pygame.mixer.Channel(i) for i in range(len(loops), channels)]
+        self.limits = dict(limits or {})
+        self.voices = {}
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+        self.dropped_by_name = {}
+
+    def _live_voices(self, name, sound):
+        voices = self.voices.get(name)
+        if voices is None:
+            voices = self.voices[name] = deque()
+        # a voice is over when its channel finished or plays something else now
+        live = [ch for ch in voices if ch.get_sound() is sound]
+        if len(live) != len(voices):
+            voices.clear()
+            voices.extend(live)
+        return voices
+
+    def _free_channel(self):
+        for ch in self.pool:
+            if not ch.get_busy():
+                return ch
+        return None
+
+    def play(self, name, sound):
+        """Play the one-shot effect `name`; returns its channel, or None if dropped."""
+        if sound is None:
+            return None
+        voices = self._live_voices(name, sound)
+        limit = self.limits.get(name)
+        if limit is not None and len(voices) >= limit:
+            ch = voices.popleft()
+            ch.stop()
+            self.stolen += 1
+        else:
+            ch = self._free_channel()
+            if ch is None:
+                self.dropped += 1
+                self.dropped_by_name[name] = self.dropped_by_name.get(name, 0) + 1
+                return None
+        ch.play(sound)
+        voices.append(ch)
+        self.played += 1
+        return ch
+
+    def set_loop(self, name, sound):
+        """Make loop channel `name` play `sound` endlessly (None = silence)."""
+        if sound is self.looping[name]:
+            return
+        ch = self.loops[name]
+        if sound is None:
+            ch.stop()
+        else:
+            ch.play(sound, loops=-1)
+        self.looping[name] = sound
+
+    def stop(self):
+        """Silence every loop and effect."""
+        for name in self.loops:
+            self.set_loop(name, None)
+        for ch in self.pool:
+            ch.stop()
+        self.voices.clear()
+
+    def stats(self):
+        return {
+            "played": self.played,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+            "dropped_by_name": dict(self.dropped_by_name),
+            "busy_channels": sum(ch.get_busy() for ch in self.pool),
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        dropped = ", ".join(f"{n} {c}" for n, c in sorted(s["dropped_by_name"].items())) or "none"
+        return (f"audio: {s['played']} voices played, {s['stolen']} stolen by voice limits, "
+                f"{s['dropped']} dropped (pool full: {dropped}), {len(self.pool)} pool channels")
@@ -0,0 +1,27 @@
+"""Per-frame cost of the sky/terrain layer, immediate mode vs. phase cache.
+
+    python benchmarks/bench_background.py [frames]
+"""
+import sys
+
+from common import load_game, print_row, time_calls
+
+game = load_game()
+import pygame
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    frame = pygame.Surface((game.W, game.H)).convert()
+    step = 0.0015 * 2.0   # dash_offset advance per frame at base speed
+
+    before = time_calls(lambda i: game.render_background_and_terrain(frame, (i * step) % 1.0), frames)
+    game.BACKGROUND_CACHE.clear()
+    after = time_calls(lambda i: game.draw_background_and_terrain(frame, (i * step) % 1.0), frames)
+
+    print_row("uncached (before)", before)
+    print_row("phase cache (after)", after)
+
+
+if __name__ == "__main__":
+    main()
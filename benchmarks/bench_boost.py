@@ -0,0 +1,84 @@
+"""Boost post-process cost per frame: the old per-frame allocations vs. BoostPostFX tiers.
+
+Post-processes a drawn race frame at full boost intensity.
+
+    python benchmarks/bench_boost.py [frames]
+"""
+import random
+import sys
+
+from common import load_game, print_row, time_calls
+
+game = load_game()
+import pygame
+
+W, H = game.W, game.H
+
+
+def draw_boost_warp(surf, intensity, origin):
+    w, h = surf.get_size()
+    ox, oy = origin
+    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+    n = int(10 + 22 * intensity)
+    max_len = int(140 + 220 * intensity)
+    base_alpha = int(18 + 55 * intensity)
+    for _ in range(n):
+        ang = random.uniform(-2.6, 2.6)
+        start_r = random.uniform(70, 160)
+        vx, vy = pygame.math.Vector2(1, 0).rotate_rad(ang)
+        x0 = ox + int(start_r * 1.15 * vx)
+        y0 = oy + int(start_r * 0.95 * vy)
+        end_r = start_r + random.uniform(max_len * 0.45, max_len)
+        x1 = ox + int(end_r * 1.20 * vx)
+        y1 = oy + int(end_r * 1.00 * vy)
+        x0 = game.clamp(x0, -80, w + 80); y0 = game.clamp(y0, -80, h + 80)
+        x1 = game.clamp(x1, -80, w + 80); y1 = game.clamp(y1, -80, h + 80)
+        thick = 1 if random.random() < 0.85 else 2
+        dist = max(1, ((x0 - ox) ** 2 + (y0 - oy) ** 2) ** 0.5)
+        fade = game.clamp(dist / 260.0, 0.25, 1.0)
+        pygame.draw.line(overlay, (200, 255, 255, int(base_alpha * fade)), (x0, y0), (x1, y1), thick)
+    overlay.set_alpha(int(160 * intensity))
+    surf.blit(overlay, (0, 0))
+
+
+def old_boost(frame, intensity, origin):
+    """The boost path as it was in main(): copy, overlay and a full smoothscale per frame."""
+    ghost = frame.copy()
+    ghost.blit(frame, (0, 6))
+    ghost.set_alpha(int(60 + 90 * intensity))
+    frame.blit(ghost, (0, 0))
+    draw_boost_warp(frame, intensity, origin)
+    zoom = 1.0 + (0.06 * intensity)
+    zoom_w, zoom_h = int(W * zoom), int(H * zoom)
+    zoomed = pygame.transform.smoothscale(frame, (zoom_w, zoom_h))
+    return zoomed.subsurface(((zoom_w - W) // 2, (zoom_h - H) // 2, W, H))
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    random.seed(3)
+    world = game.World()
+    world.start(0)
+    for _ in range(400):
+        world.step(game.FrameInput(boost=True))
+    scene = pygame.Surface((W, H))
+    game.draw_world(scene, world)
+    frame = scene.copy()
+    pr = world.player.get_rect()
+    origin = (pr.centerx, pr.centery - int(pr.h * 0.25))
+
+    def run(fn):
+        def step(i):
+            frame.blit(scene, (0, 0))
+            fn(frame, 1.0, origin)
+        return step
+
+    print_row("no post-process", time_calls(run(lambda f, i, o: f), frames))
+    print_row("old (allocating)", time_calls(run(old_boost), frames))
+    for quality in ("high", "low"):
+        fx = game.BoostPostFX((W, H), quality)
+        print_row(f"BoostPostFX {quality}", time_calls(run(fx.apply), frames))
+
+
+if __name__ == "__main__":
+    main()
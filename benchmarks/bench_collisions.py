@@ -0,0 +1,89 @@
+"""Bullet/obstacle collision cost: all-pairs loop vs. lane broad phase.
+
+Builds random bullet and obstacle fields of growing size, checks that both
+methods report the same hit for every bullet and prints the time per frame,
+plus the method World.update_bullets picks for that field (use_broad_phase).
+
+The crossover does not follow bullets x obstacles alone. The all-pairs loop
+stops at a bullet's first hit, so it wins with one to three bullets, and
+whenever there are many obstacles per bullet (dense fields are hit almost at
+once). The broad phase builds every obstacle rect first and wins from about
+four bullets up, as long as there are at most about eight obstacles per
+bullet. Those limits are BROAD_PHASE_MIN_BULLETS and
+BROAD_PHASE_MAX_OBSTACLES_PER_BULLET in main.py.
+
+    python benchmarks/bench_collisions.py [repeats]
+"""
+import random
+import sys
+
+from common import load_game, time_calls
+
+game = load_game()
+
+BULLET_COUNTS = (1, 2, 4, 10, 50, 200, 800)
+OBSTACLE_COUNTS = (5, 10, 50, 200, 800)
+
+
+def make_field(n_bullets, n_obstacles, rng):
+    obstacles = []
+    for _ in range(n_obstacles):
+        kind = rng.choice(("car", "car", "car", "cone", "roadblock"))
+        lane = rng.randrange(game.LANES - 1 if kind == "roadblock" else game.LANES)
+        obstacles.append(game.Obstacle(lane, rng.uniform(0.03, 1.0), kind))
+    bullets = [game.Bullet(rng.randrange(game.LANES), rng.uniform(0.02, 0.84), robot=rng.random() < 0.5)
+               for _ in range(n_bullets)]
+    return bullets, obstacles
+
+
+def all_pairs(bullets, obstacles):
+    hits = []
+    for blt in bullets:
+        brect = blt.get_rect()
+        hit = None
+        for order, obs in enumerate(obstacles):
+            if brect.colliderect(obs.get_rect()):
+                hit = order
+                break
+        hits.append(hit)
+    return hits
+
+
+def broad_phase(bullets, obstacles, corridors):
+    broad = game.LaneBroadPhase(obstacles, corridors)
+    hits = []
+    for blt in bullets:
+        hit = broad.first_hit(blt.get_rect(), blt.lane)
+        hits.append(None if hit is None else hit[0])
+    return hits
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = random.Random(1)
+    corridors = game.bullet_lane_corridors()
+    print(f"{'bullets':>8} {'obstacles':>10} {'hit %':>6} {'all-pairs ms':>13} {'broad ms':>10} {'speedup':>8}"
+          f"  {'World uses':<10}")
+    fields = faster_picked = 0
+    for n_bullets in BULLET_COUNTS:
+        for n_obstacles in OBSTACLE_COUNTS:
+            bullets, obstacles = make_field(n_bullets, n_obstacles, rng)
+            hits = all_pairs(bullets, obstacles)
+            if hits != broad_phase(bullets, obstacles, corridors):
+                raise SystemExit(f"hit mismatch at {n_bullets} bullets / {n_obstacles} obstacles")
+            hit_pct = 100.0 * sum(h is not None for h in hits) / len(hits)
+            before = time_calls(lambda i: all_pairs(bullets, obstacles), repeats, warmup=1)
+            after = time_calls(lambda i: broad_phase(bullets, obstacles, corridors), repeats, warmup=1)
+            b = sum(before) / len(before)
+            a = sum(after) / len(after)
+            broad = game.use_broad_phase(n_bullets, n_obstacles)
+            fields += 1
+            faster_picked += broad == (a < b)
+            print(f"{n_bullets:>8} {n_obstacles:>10} {hit_pct:>6.0f} {b:>13.3f} {a:>10.3f} {b / a if a else 0:>7.1f}x"
+                  f"  {'broad' if broad else 'all-pairs':<10}")
+    print(f"crossover: broad phase from {game.BROAD_PHASE_MIN_BULLETS} bullets, up to "
+          f"{game.BROAD_PHASE_MAX_OBSTACLES_PER_BULLET} obstacles per bullet; "
+          f"World picked the faster method for {faster_picked}/{fields} fields")
+
+if __name__ == "__main__":
+    main()
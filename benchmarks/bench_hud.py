@@ -0,0 +1,80 @@
+"""HUD cost per frame: font.render every frame vs. text cache + digit atlas.
+
+Runs the seeded autopilot race and times draw_hud() each frame. The score
+changes every frame, the robot and ammo lines now and then.
+
+    python benchmarks/bench_hud.py [frames]
+"""
+import random
+import sys
+import time
+
+from common import load_game, print_row
+
+game = load_game()
+import pygame
+
+import simulate
+
+
+def uncached_draw_text_with_outline(surf, text, font, color, pos, center=False):
+    outline_color = (0, 0, 0)
+    render_base = font.render(text, True, color)
+    render_outline = font.render(text, True, outline_color)
+    if center:
+        rect = render_base.get_rect(center=pos)
+        x, y = rect.topleft
+    else:
+        x, y = pos
+    rect = surf.blit(render_outline, (x-2, y))
+    rect.union_ip(surf.blit(render_outline, (x+2, y)))
+    rect.union_ip(surf.blit(render_outline, (x, y-2)))
+    rect.union_ip(surf.blit(render_outline, (x+2, y)))
+    rect.union_ip(surf.blit(render_base, (x, y)))
+    return rect
+
+
+def uncached_draw_score(surf, score, pos=(20, 20)):
+    return uncached_draw_text_with_outline(surf, f"SCORE: {score}", game.FONT, game.WHITE, pos)
+
+
+def race(seed=3):
+    random.seed(seed)
+    rng = random.Random(seed)
+    world = game.World()
+    world.start(0)
+    frame = pygame.Surface((game.W, game.H)).convert()
+
+    def step(i):
+        world.step(simulate.autopilot(world, rng))
+        world.take_events()
+        if not world.alive and not world.explosions:
+            world.start(0)
+        t0 = time.perf_counter_ns()
+        game.draw_hud(frame, world)
+        return (time.perf_counter_ns() - t0) / 1e6
+    return step
+
+
+def hud_times(frames):
+    """draw_hud() times in ms; the simulation step is not timed."""
+    step = race()
+    return [step(i) for i in range(frames)]
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    cached = (game.draw_text_with_outline, game.draw_score)
+    game.draw_text_with_outline, game.draw_score = uncached_draw_text_with_outline, uncached_draw_score
+    before = hud_times(frames)
+    game.draw_text_with_outline, game.draw_score = cached
+    game.TEXT_CACHE.clear()
+    after = hud_times(frames)
+
+    print_row("font.render per frame", before)
+    print_row("text cache + glyph atlas", after)
+    print(game.TEXT_CACHE.format_stats())
+
+
+if __name__ == "__main__":
+    main()
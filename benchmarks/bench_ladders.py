@@ -0,0 +1,68 @@
+"""Scaling enemy cars on demand vs. the LRU sprite cache vs. sprite ladders.
+
+Eight cars approach from the horizon to the player (z 0.03 -> 1.3), as in a
+race; each frame draws them at their projected size.
+
+    python benchmarks/bench_ladders.py [frames] [rungs ...]
+"""
+import sys
+import time
+
+from common import load_game, print_row, time_calls
+
+game = load_game()
+import pygame
+
+from sprite_cache import SpriteCache
+from sprite_ladder import LadderSet
+
+CARS = 8
+
+
+def car_sizes(i, frames):
+    """(img, (w, h)) for every car on screen in frame i."""
+    out = []
+    for c in range(CARS):
+        t = ((i / frames) * 4 + c / CARS) % 1.0
+        z = 0.03 + 1.27 * t
+        s = game.PROJECTION.at(z)[1]
+        w, h = game.OBSTACLE_SIZES["car"]
+        out.append((game.IMG_ENEMIES[c % len(game.IMG_ENEMIES)], (max(1, int(w * s)), max(1, int(h * s)))))
+    return out
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    rung_counts = [int(a) for a in sys.argv[2:]] or [16, 40, 96]
+    frame = pygame.Surface((game.W, game.H)).convert()
+    plan = [car_sizes(i, frames) for i in range(frames + 10)]
+
+    def on_demand(i):
+        for img, size in plan[i]:
+            frame.blit(pygame.transform.scale(img, size), (0, 0))
+
+    cache = SpriteCache()
+    def cached(i):
+        for img, size in plan[i]:
+            frame.blit(cache.scale(img, size), (0, 0))
+
+    print_row("scale every frame", time_calls(on_demand, frames))
+    print_row("sprite cache", time_calls(cached, frames))
+    print(f"    {cache.format_stats()}")
+
+    for rungs in rung_counts:
+        t0 = time.perf_counter()
+        ladders = LadderSet(rungs, prebuild=True)
+        for img in game.IMG_ENEMIES:
+            ladders.add(img, game.OBSTACLE_SIZES["car"], 0.15, 1.6)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        def laddered(i):
+            for img, size in plan[i]:
+                frame.blit(ladders.get(img).nearest(size), (0, 0))
+
+        print_row(f"ladder, {rungs} rungs", time_calls(laddered, frames))
+        print(f"    {ladders.format_stats()}, prebuilt in {build_ms:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Particles: one object + fresh SRCALPHA surface each vs. the pooled ParticleSystem.
+
+Keeps a steady population of live particles (a constant stream, as with the
+boost trail) and times update + draw per frame. The first frames of both
+versions are compared pixel for pixel.
+
+    python benchmarks/bench_particles.py [frames]
+"""
+import random
+import sys
+
+from common import load_game, summarize, time_calls
+
+game = load_game()
+import pygame
+
+from particles import ParticleSystem
+
+COUNTS = (20, 200, 1000, 5000)
+LIFE = 20
+COLORS = ((0, 255, 255), (255, 200, 50))
+
+
+class ObjectParticle:
+    """The old per-object particle, kept here as the baseline."""
+    def __init__(self, x, y, color, size, vx, vy):
+        self.x = x; self.y = y; self.size = size
+        self.color = color; self.life = LIFE
+        self.vx = vx; self.vy = vy
+
+    def update(self):
+        self.x += self.vx; self.y += self.vy
+        self.life -= 1; self.size = max(0, self.size - 0.2)
+
+    def draw(self, surf):
+        if self.life > 0 and self.size > 0:
+            s = pygame.Surface((int(self.size)*2, int(self.size)*2), pygame.SRCALPHA)
+            pygame.draw.circle(s, (*self.color, 150), (int(self.size), int(self.size)), int(self.size))
+            surf.blit(s, (int(self.x), int(self.y)))
+
+
+def spawn_args(rng, per_frame):
+    return [(rng.uniform(0, game.W), rng.uniform(0, game.H - 100), COLORS[rng.random() < 0.5],
+             rng.randint(4, 8), rng.uniform(-1, 1), rng.uniform(2, 5)) for _ in range(per_frame)]
+
+
+def run_objects(frame, plan):
+    particles = []
+    def step(i):
+        for args in plan[i]:
+            particles.append(ObjectParticle(*args))
+        for p in particles[:]:
+            p.update()
+            if p.life <= 0:
+                particles.remove(p)
+        for p in particles:
+            p.draw(frame)
+    return step
+
+
+def run_pooled(frame, plan):
+    system = ParticleSystem()
+    def step(i):
+        for x, y, color, size, vx, vy in plan[i]:
+            system.emit(x, y, color, size, vx, vy, LIFE)
+        system.update()
+        system.draw(frame)
+    return step
+
+
+def same_pixels(plan, frames=LIFE * 2):
+    a = pygame.Surface((game.W, game.H)).convert()
+    b = a.copy()
+    old, new = run_objects(a, plan), run_pooled(b, plan)
+    for i in range(frames):
+        a.fill((0, 0, 0)); b.fill((0, 0, 0))
+        old(i); new(i)
+        if pygame.image.tobytes(a, "RGB") != pygame.image.tobytes(b, "RGB"):
+            return False
+    return True
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rng = random.Random(1)
+    frame = pygame.Surface((game.W, game.H)).convert()
+    print(f"{'live':>6} {'objects ms':>11} {'pooled ms':>10} {'p95 pooled':>11} {'speedup':>8}  same pixels")
+    for live in COUNTS:
+        per_frame = max(1, live // (LIFE - 1))
+        plan = [spawn_args(rng, per_frame) for _ in range(frames + 10)]
+        before = summarize(time_calls(run_objects(frame, plan), frames))
+        after = summarize(time_calls(run_pooled(frame, plan), frames))
+        print(f"{per_frame * (LIFE - 1):>6} {before['mean_ms']:>11.3f} {after['mean_ms']:>10.3f} "
+              f"{after['p95_ms']:>11.3f} {before['mean_ms'] / after['mean_ms']:>7.1f}x  {same_pixels(plan)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Per-frame cost of draw_road, immediate mode vs. baked layers.
+
+    python benchmarks/bench_road.py [frames]
+"""
+import sys
+
+from common import load_game, print_row, time_calls
+
+game = load_game()
+import pygame
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    frame = pygame.Surface((game.W, game.H)).convert()
+    step = 0.0015 * 2.0   # dash_offset advance per frame at base speed
+
+    before = time_calls(lambda i: game.render_road(frame, (i * step) % 1.0), frames)
+    game.ROAD_CACHE.clear()
+    after = time_calls(lambda i: game.draw_road(frame, (i * step) % 1.0), frames)
+
+    print_row("immediate (before)", before)
+    print_row("baked layers (after)", after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Scripted game-loop scenarios with machine-readable results.
+
+Each scenario runs World.step plus the race drawing path of main() (draw_world,
+draw_hud and, while boosting, BoostPostFX) for a fixed number of frames with a
+fixed seed, restarting after every crash. Countdowns are skipped untimed.
+
+    dense   obstacles spawn at a quarter of the normal distance; autopilot
+    robot   robot mode held on, firing every frame it can without reloads
+    boost   boost held the whole run, warp effect drawn every frame
+    churn   a run four times as long, so buildings keep spawning and retiring
+
+Per scenario the script reports mean/p95/p99 frame time, the Python memory
+allocated per frame and the hit rates of the sprite, shadow and text caches
+and the facade atlas. Allocations come from a second, shorter pass under
+tracemalloc (tracing slows the loop down): "alloc" is the traced peak above
+the frame's starting point, "retained" what is still held at the end of the
+frame. SDL's own pixel buffers are not traced.
+
+The JSON goes to stdout (or --out), the table to stderr, so runs of two
+commits can be compared:
+
+    python benchmarks/bench_scenarios.py > before.json
+    python benchmarks/bench_scenarios.py --compare before.json [--only boost,churn] [--frames N]
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from common import ROOT_DIR, load_game, summarize
+
+game = load_game()
+import pygame
+
+import simulate
+
+WARMUP = 60
+
+
+def skip_countdown(world):
+    idle = game.FrameInput()
+    while world.counting_down:
+        world.step(idle)
+    world.take_events()
+
+
+def dense_setup(world):
+    world.spawn_threshold = 0.12
+
+
+def dense_inputs(world, rng):
+    return simulate.autopilot(world, rng, boost_chance=0.3)
+
+
+def robot_setup(world):
+    world.robot_active = True
+    world.robot_timer = game.ROBOT_DURATION_FRAMES
+
+
+def robot_inputs(world, rng):
+    world.robot_timer = game.ROBOT_DURATION_FRAMES
+    world.ammo = game.MAG_SIZE
+    inputs = game.FrameInput(shoot=True)
+    # wander over the lanes, so the robot also rams what it does not shoot
+    if rng.random() < 0.05:
+        inputs.left, inputs.right = (True, False) if rng.random() < 0.5 else (False, True)
+    return inputs
+
+
+def boost_inputs(world, rng):
+    inputs = simulate.autopilot(world, rng, boost_chance=0.0)
+    inputs.boost = True
+    return inputs
+
+
+def churn_inputs(world, rng):
+    return simulate.autopilot(world, rng, boost_chance=0.5)
+
+
+# name: (setup after every start, inputs per frame, frames as a multiple of --frames)
+SCENARIOS = {
+    "dense": (dense_setup, dense_inputs, 1),
+    "robot": (robot_setup, robot_inputs, 1),
+    "boost": (None, boost_inputs, 1),
+    "churn": (None, churn_inputs, 4),
+}
+
+
+class ScenarioRun:
+    """One scenario's world, inputs and drawing, advanced one frame per call."""
+
+    def __init__(self, setup, make_inputs, seed, car_idx=0):
+        random.seed(seed)
+        self.rng = random.Random(seed)
+        self.setup = setup
+        self.make_inputs = make_inputs
+        self.car_idx = car_idx
+        self.world = game.World(array_obstacles=game.ARRAY_OBSTACLES)
+        self.frame = pygame.Surface((game.W, game.H)).convert()
+        self.crashes = 0
+        self.start()
+
+    def start(self):
+        self.world.start(self.car_idx)
+        skip_countdown(self.world)
+        if self.setup is not None:
+            self.setup(self.world)
+
+    def __call__(self, i):
+        world = self.world
+        if not world.alive and not world.explosions:
+            self.crashes += 1
+            self.start()
+        inputs = self.make_inputs(world, self.rng)
+        world.step(inputs)
+        world.take_events()
+
+        frame = self.frame
+        game.draw_world(frame, world)
+        game.draw_hud(frame, world)
+        if inputs.boost and world.racing:
+            pr = world.player.get_rect()
+            origin = (pr.centerx, pr.centery - int(pr.h * 0.25))
+            game.BOOST_FX.apply(frame, game.clamp(world.speed / 0.01, 0.0, 1.0), origin)
+
+
+def cache_counters():
+    s = game.SPRITE_CACHE.stats()
+    sh = game.SHADOW_CACHE.stats()
+    t = game.TEXT_CACHE.stats()
+    f = game.FACADE_ATLAS.stats()
+    return {
+        "sprite": (s["hits"], s["misses"]),
+        "shadow": (sh["hits"], sh["misses"]),
+        "text": (t["hits"], t["misses"]),
+        "facade": (f["served"], f["starved"]),
+    }
+
+
+def hit_rates(before, after):
+    rates = {}
+    for name, (hits, misses) in after.items():
+        hits -= before[name][0]
+        misses -= before[name][1]
+        rates[name] = hits / (hits + misses) if hits + misses else None
+    return rates
+
+
+def time_frames(step, count):
+    samples = []
+    for i in range(count):
+        t0 = time.perf_counter_ns()
+        step(i)
+        samples.append((time.perf_counter_ns() - t0) / 1e6)
+    return samples
+
+
+def trace_frames(step, count):
+    """Traced bytes allocated (peak) and retained per frame, in KiB."""
+    alloc, retained = [], []
+    tracemalloc.start()
+    try:
+        for i in range(count):
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            step(i)
+            current, peak = tracemalloc.get_traced_memory()
+            alloc.append((peak - start) / 1024)
+            retained.append((current - start) / 1024)
+    finally:
+        tracemalloc.stop()
+    return alloc, retained
+
+
+def run_scenario(name, frames, trace_frames_count, seed):
+    setup, make_inputs, scale = SCENARIOS[name]
+    count = frames * scale
+    step = ScenarioRun(setup, make_inputs, seed)
+    for i in range(WARMUP):
+        step(i)
+
+    counters = cache_counters()
+    samples = time_frames(step, count)
+    rates = hit_rates(counters, cache_counters())
+    alloc, retained = trace_frames(step, min(trace_frames_count, count))
+
+    result = {"frames": count}
+    result.update(summarize(samples))
+    result["max_ms"] = max(samples)
+    result["alloc_kib_per_frame"] = sum(alloc) / len(alloc)
+    result["alloc_kib_p95"] = sorted(alloc)[int(0.95 * (len(alloc) - 1))]
+    result["retained_kib_per_frame"] = sum(retained) / len(retained)
+    result["cache_hit_rate"] = rates
+    result["crashes"] = step.crashes
+    result["obstacles"] = len(step.world.obstacles)
+    result["buildings"] = len(step.world.buildings)
+    result["texture"] = {(k[:-len("_bytes")] + "_mib" if k.endswith("_bytes") else k): (v / 2**20 if k.endswith("_bytes") else v)
+                         for k, v in game.texture_memory_report().items()}
+    return result
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                             capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.strip() or None
+
+
+def format_rate(rate):
+    return "   -" if rate is None else f"{100 * rate:3.0f}%"
+
+
+def print_table(results, baseline=None, out=sys.stderr):
+    print(f"{'scenario':<8} {'mean':>8} {'p95':>8} {'p99':>8}  {'alloc/fr':>9}  "
+          f"sprite shadow text facade", file=out)
+    for name, r in results.items():
+        rates = r["cache_hit_rate"]
+        print(f"{name:<8} {r['mean_ms']:6.2f}ms {r['p95_ms']:6.2f}ms {r['p99_ms']:6.2f}ms  "
+              f"{r['alloc_kib_per_frame']:6.1f}KiB  "
+              f"{format_rate(rates['sprite'])}   {format_rate(rates['shadow'])}  "
+              f"{format_rate(rates['text'])}  {format_rate(rates['facade'])}", file=out)
+        old = (baseline or {}).get(name)
+        if old:
+            deltas = "  ".join(f"{k[:-3]} {100 * (r[k] / old[k] - 1):+5.1f}%"
+                               for k in ("mean_ms", "p95_ms", "p99_ms") if old[k])
+            print(f"{'':<8} vs baseline: {deltas}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=1200, help="timed frames per scenario (churn runs 4x)")
+    parser.add_argument("--trace-frames", type=int, default=300, help="frames of the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", default=",".join(SCENARIOS), help="comma-separated scenario names")
+    parser.add_argument("--out", help="write the JSON here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON output to print deltas against")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    # same worker as the game; frames still block on a facade that is not ready yet
+    game.FACADE_ATLAS.start()
+
+    results = {}
+    for name in names:
+        results[name] = run_scenario(name, args.frames, args.trace_frames, args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["scenarios"]
+    print_table(results, baseline)
+
+    report = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "seed": args.seed,
+        "frames": args.frames,
+        "trace_frames": args.trace_frames,
+        "scenarios": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Shadow surfaces allocated per frame: a new ellipse per call vs. SHADOW_CACHE.
+
+Records every draw_shadow() call of a seeded autopilot race drawn with
+draw_world(), then replays the calls frame by frame with both versions. The
+old version creates one SRCALPHA surface per call; the cached one only on a
+miss.
+
+    python benchmarks/bench_shadows.py [frames]
+"""
+import random
+import sys
+
+from common import load_game, print_row, time_calls
+
+game = load_game()
+import pygame
+
+import simulate
+
+
+def uncached_draw_shadow(surf, rect, alpha=100):
+    if rect.width <= 0 or rect.height <= 0: return
+    shadow_surf = pygame.Surface((rect.width, max(1, rect.height // 4)), pygame.SRCALPHA)
+    pygame.draw.ellipse(shadow_surf, (0, 0, 0, alpha), shadow_surf.get_rect())
+    surf.blit(shadow_surf, (rect.x, rect.bottom - rect.height // 6))
+
+
+def record_race(frames, seed=3):
+    """[(rect, alpha), ...] per frame for a seeded race."""
+    trace = []
+    def record(surf, rect, alpha=100):
+        trace[-1].append((rect.copy(), alpha))
+
+    cached_draw_shadow = game.draw_shadow
+    game.draw_shadow = record
+    random.seed(seed)
+    rng = random.Random(seed)
+    world = game.World()
+    world.start(0)
+    frame = pygame.Surface((game.W, game.H)).convert()
+    for _ in range(frames):
+        world.step(simulate.autopilot(world, rng))
+        world.take_events()
+        if not world.alive and not world.explosions:
+            world.start(0)
+        trace.append([])
+        game.draw_world(frame, world)
+    game.draw_shadow = cached_draw_shadow
+    return trace
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2400
+    trace = record_race(frames)
+    frame = pygame.Surface((game.W, game.H)).convert()
+
+    def replay(shadow_fn):
+        def step(i):
+            for rect, alpha in trace[i]:
+                shadow_fn(frame, rect, alpha)
+        return step
+
+    before = time_calls(replay(uncached_draw_shadow), frames, warmup=0)
+    game.SHADOW_CACHE.clear()
+    game.SHADOW_CACHE.reset_stats()
+    after = time_calls(replay(game.draw_shadow), frames, warmup=0)
+
+    calls = sum(len(calls) for calls in trace)
+    misses = game.SHADOW_CACHE.stats()["misses"]
+    print_row("new surface per shadow", before)
+    print_row("shadow cache", after)
+    print(f"shadow surfaces per frame: {calls / frames:.1f} before, {misses / frames:.2f} after")
+    print(game.SHADOW_CACHE.format_stats("shadow cache"))
+
+
+if __name__ == "__main__":
+    main()
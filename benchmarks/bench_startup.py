@@ -0,0 +1,62 @@
+"""Cold-start time with loose PNG/JPEG files vs. the memory-mapped sprite bundle.
+
+Every run is a fresh interpreter that imports the game (window, fonts, menu
+assets) and then collects all race assets. Runs alternate between the two
+modes; the OS file cache is warm after the first run, so this measures
+decoding and scaling, not disk reads. Builds a bundle in a temporary
+directory first.
+
+    python benchmarks/bench_startup.py [runs]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT_DIR, print_row
+
+CHILD = """
+import time
+t0 = time.perf_counter()
+import sys
+sys.path.insert(0, {root!r})
+import main
+t_menu = time.perf_counter()
+main.load_race_assets()
+t_all = time.perf_counter()
+bundle = main.BUNDLE.stats() if main.BUNDLE else None
+print(json.dumps({{"menu_ms": (t_menu - t0) * 1000, "all_ms": (t_all - t0) * 1000, "bundle": bundle}}))
+"""
+
+
+def run_child(bundle_path):
+    env = dict(os.environ, TT_ASSET_BUNDLE=bundle_path)
+    code = "import json\n" + CHILD.format(root=ROOT_DIR)
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sprites.bundle")
+        subprocess.run([sys.executable, os.path.join(ROOT_DIR, "build_bundle.py"), "--out", path],
+                       env=dict(os.environ, TT_ASSET_BUNDLE=""), check=True, capture_output=True)
+        print(f"bundle: {os.path.getsize(path) / 2**20:.1f} MiB")
+
+        results = {"loose": [], "bundle": []}
+        for _ in range(runs):
+            results["loose"].append(run_child(""))
+            results["bundle"].append(run_child(path))
+
+    for mode, rows in results.items():
+        print_row(f"{mode}: first screen", [r["menu_ms"] for r in rows])
+        print_row(f"{mode}: all assets", [r["all_ms"] for r in rows])
+    stats = results["bundle"][-1]["bundle"]
+    print(f"bundle served {stats['hits']} sprites, {stats['misses']} from loose files, "
+          f"zero-copy: {stats['zero_copy']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Shared helpers for the benchmark scripts.
+
+Every benchmark runs headless under the SDL dummy drivers and imports the
+game module from the repository root.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")   # keeps stdout clean for JSON output
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+def load_game():
+    import main
+    main.load_race_assets()
+    return main
+
+
+def time_calls(fn, count, warmup=10):
+    """Call fn(i) `count` times and return the per-call times in ms."""
+    for i in range(warmup):
+        fn(i)
+    samples = []
+    for i in range(count):
+        t0 = time.perf_counter_ns()
+        fn(i)
+        samples.append((time.perf_counter_ns() - t0) / 1e6)
+    return samples
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def summarize(samples):
+    return {
+        "mean_ms": sum(samples) / len(samples) if samples else 0.0,
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+    }
+
+
+def print_row(name, samples):
+    s = summarize(samples)
+    print(f"{name:<28} mean {s['mean_ms']:8.3f} ms   p95 {s['p95_ms']:8.3f} ms   p99 {s['p99_ms']:8.3f} ms")
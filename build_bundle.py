@@ -0,0 +1,31 @@
+"""Pack the game's sprites into one memory-mapped bundle (see bundle.py):
+
+    python build_bundle.py [--out assets/sprites.bundle]
+
+The game reads sprites from the bundle when it exists and falls back to the
+loose files in assets/images for anything missing or changed since the build.
+Rebuild after changing images, or after changing W/H (the poster is stored
+at window size).
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import time
+
+import main as game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=game.ASSET_BUNDLE_PATH or os.path.join(game.BASE_DIR, "assets/sprites.bundle"))
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    count, size = game.build_asset_bundle(args.out)
+    print(f"{count} sprites, {size / 2**20:.1f} MiB -> {args.out} ({time.perf_counter() - t0:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Pre-packed sprite bundle: raw pixels in display format, memory-mapped.
+
+A bundle is one file with a JSON index followed by the pixel data of every
+sprite, already decoded (and pre-scaled where the game scales at load time).
+Opening it maps the file; get() wraps the sprite's bytes in a Surface with
+pygame.image.frombuffer, so nothing is decoded or copied. The mapping is
+copy-on-write, so drawing onto such a surface never touches the file.
+
+Pixels are stored as BGRA bytes, which is the ARGB8888 layout SDL picks for
+alpha surfaces on little-endian machines. If convert_alpha() gives another
+layout here, get() converts (one copy per sprite). Opaque sprites (the
+poster) are always converted to the display format without alpha, so they
+blit without blending.
+
+Layout: MAGIC, u32 index length, index JSON, then each sprite's data at an
+ALIGN-ed offset. Every entry remembers the size and mtime of its source
+file; get() returns None for an entry whose source changed since the bundle
+was built, so the caller falls back to the loose file.
+"""
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+MAGIC = b"TTSPRB01"
+ALIGN = 64
+PIXEL_FORMAT = "BGRA"
+
+
+def _source_stamp(source):
+    try:
+        st = os.stat(source)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def write_bundle(path, entries):
+    """Write [(name, surface, source_path, opaque), ...] to `path`; returns the byte size."""
+    index = {}
+    blobs = []
+    offset = 0
+    for name, surf, source, opaque in entries:
+        data = pygame.image.tobytes(surf, PIXEL_FORMAT)
+        index[name] = {
+            "offset": offset,
+            "size": surf.get_size(),
+            "opaque": bool(opaque),
+            "source": _source_stamp(source) if source else None,
+        }
+        blobs.append(data)
+        offset += len(data)
+        offset += -offset % ALIGN
+
+    header = json.dumps({"format": PIXEL_FORMAT, "entries": index}).encode("utf-8")
+    data_start = len(MAGIC) + 4 + len(header)
+    data_start += -data_start % ALIGN
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - f.tell()))
+        for data in blobs:
+            f.write(data)
+            f.write(b"\0" * (-f.tell() % ALIGN))
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+
+class SpriteBundle:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if self.map[:len(MAGIC)] != MAGIC:
+            self.map.close()
+            raise ValueError(f"{path}: not a sprite bundle")
+        (header_len,) = struct.unpack_from("<I", self.map, len(MAGIC))
+        start = len(MAGIC) + 4
+        index = json.loads(bytes(self.map[start:start + header_len]))
+        if index.get("format") != PIXEL_FORMAT:
+            self.map.close()
+            raise ValueError(f"{path}: unsupported pixel format {index.get('format')!r}")
+        self.data_start = start + header_len
+        self.data_start += -self.data_start % ALIGN
+        self.entries = index["entries"]
+        self.view = memoryview(self.map)
+        self.native = self._native_layout()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @classmethod
+    def open(cls, path):
+        """The bundle at `path`, or None if there is none (or it is unreadable)."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+    @staticmethod
+    def _native_layout():
+        probe = pygame.image.frombuffer(bytearray(4), (1, 1), PIXEL_FORMAT)
+        try:
+            return probe.get_masks() == probe.convert_alpha().get_masks()
+        except pygame.error:
+            return False   # no display yet
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def names(self):
+        return self.entries.keys()
+
+    def get(self, name, source=None):
+        """Surface for `name`, or None if missing or older than `source`."""
+        entry = self.entries.get(name)
+        if entry is None:
+            self.misses += 1
+            return None
+        if source and entry["source"] is not None:
+            stamp = _source_stamp(source)
+            if stamp is not None and stamp != entry["source"]:
+                self.stale += 1
+                return None
+        w, h = entry["size"]
+        start = self.data_start + entry["offset"]
+        surf = pygame.image.frombuffer(self.view[start:start + w * h * 4], (w, h), PIXEL_FORMAT)
+        if entry["opaque"]:
+            surf = surf.convert()
+        elif not self.native:
+            surf = surf.convert_alpha()
+        self.hits += 1
+        return surf
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "bytes": len(self.map),
+            "zero_copy": self.native,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"sprite bundle: {s['hits']} served, {s['misses']} missing, {s['stale']} stale, "
+                f"{s['entries']} entries, {s['bytes'] / 2**20:.1f} MiB mapped"
+                f"{'' if s['zero_copy'] else ' (converted)'}")
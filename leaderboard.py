@@ -0,0 +1,193 @@
+"""Run history and high scores in a local SQLite database.
+
+Every finished run is stored (score, car, time, duration, kills), with
+indexes for the top-K queries the game and operators need: overall, per car
+and per day.
+
+All database work happens on one writer thread that owns the connection;
+the game thread never touches the disk. record() queues the insert and
+answers from an in-memory list of the best scores (loaded by the writer at
+start-up and merged with this session's runs), so the crash screen can show
+the leaderboard in the same frame. top() and recent() run on the writer
+thread and return a concurrent.futures.Future.
+
+On first use an existing JSON leaderboard (a plain list of scores) is
+imported once; those runs have no car, time, duration or kills.
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    car INTEGER,
+    started_at REAL,
+    day TEXT,
+    duration_s REAL,
+    kills INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_car ON runs (car, score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, score DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+COLUMNS = ("score", "car", "started_at", "day", "duration_s", "kills")
+
+
+def day_of(timestamp):
+    """Local calendar day of a time.time() value, as 'YYYY-MM-DD'."""
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+class Leaderboard:
+    def __init__(self, path, legacy_json=None, cache_size=10):
+        self.path = path
+        self.legacy_json = legacy_json
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.stored_best = []
+        self.session_scores = []
+        self.jobs = queue.Queue()
+        self.written = 0
+        self.errors = 0
+        self.last_error = None
+        self.thread = threading.Thread(target=self._work, name="leaderboard", daemon=True)
+        self.thread.start()
+
+    # --- game thread ---
+
+    def record(self, score, car=None, duration_s=None, kills=None, started_at=None):
+        """Queue a finished run; returns the best scores including it (no disk access)."""
+        if started_at is None:
+            started_at = time.time() - (duration_s or 0.0)
+        row = (int(score), car, started_at, day_of(started_at), duration_s, kills)
+        with self.lock:
+            self.session_scores.append(row[0])
+        self.jobs.put((self._insert, (row,), None))
+        return self.best_scores()
+
+    def best_scores(self, k=3):
+        """Top `k` scores known so far, from memory."""
+        with self.lock:
+            scores = sorted(self.stored_best + self.session_scores, reverse=True)
+        return scores[:k]
+
+    def top(self, k=3, car=None, day=None):
+        """Future for the `k` best runs (dicts), overall or for one car and/or day."""
+        return self._call(self._top, k, car, day)
+
+    def recent(self, k=10):
+        """Future for the last `k` stored runs, newest first."""
+        return self._call(self._recent, k)
+
+    def flush(self, timeout=None):
+        """Wait until every queued write is done."""
+        return self._call(self._noop).result(timeout)
+
+    def close(self, timeout=2.0):
+        self.jobs.put(None)
+        self.thread.join(timeout)
+
+    def stats(self):
+        return {"written": self.written, "pending": self.jobs.qsize(), "errors": self.errors}
+
+    def format_stats(self):
+        s = self.stats()
+        error = f" (last: {self.last_error})" if self.last_error else ""
+        return f"leaderboard: {s['written']} runs written, {s['pending']} queued, {s['errors']} errors{error}"
+
+    def _call(self, fn, *args):
+        future = Future()
+        self.jobs.put((fn, args, future))
+        return future
+
+    # --- writer thread ---
+
+    def _work(self):
+        db = None
+        try:
+            db = self._open()
+        except (sqlite3.Error, OSError) as e:
+            self._error(e)
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            fn, args, future = job
+            try:
+                if db is None:
+                    raise sqlite3.OperationalError(f"cannot open {self.path}")
+                result = fn(db, *args)
+            except (sqlite3.Error, OSError) as e:
+                self._error(e)
+                if future is not None:
+                    future.set_exception(e)
+                continue
+            if future is not None:
+                future.set_result(result)
+        if db is not None:
+            db.close()
+
+    def _error(self, e):
+        self.errors += 1
+        self.last_error = f"{type(e).__name__}: {e}"
+
+    def _open(self):
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        db.execute("PRAGMA user_version=%d" % SCHEMA_VERSION)
+        self._migrate_json(db)
+        rows = db.execute("SELECT score FROM runs ORDER BY score DESC LIMIT ?", (self.cache_size,))
+        with self.lock:
+            self.stored_best = [score for (score,) in rows]
+        return db
+
+    def _migrate_json(self, db):
+        if not self.legacy_json or not os.path.exists(self.legacy_json):
+            return
+        if db.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone():
+            return
+        try:
+            with open(self.legacy_json, "r") as f:
+                scores = [int(s) for s in json.load(f)]
+        except (OSError, ValueError, TypeError) as e:
+            self._error(e)
+            scores = []
+        with db:
+            db.executemany("INSERT INTO runs (score) VALUES (?)", [(s,) for s in scores])
+            db.execute("INSERT INTO meta (key, value) VALUES ('migrated_json', ?)", (str(len(scores)),))
+
+    def _noop(self, db):
+        pass
+
+    def _insert(self, db, row):
+        with db:
+            db.execute(f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)", row)
+        self.written += 1
+
+    def _top(self, db, k, car, day):
+        where, params = [], []
+        if car is not None:
+            where.append("car = ?")
+            params.append(car)
+        if day is not None:
+            where.append("day = ?")
+            params.append(day)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY score DESC LIMIT ?"
+        return [dict(zip(COLUMNS, row)) for row in db.execute(sql, params + [k])]
+
+    def _recent(self, db, k):
+        sql = f"SELECT {', '.join(COLUMNS)} FROM runs ORDER BY id DESC LIMIT ?"
+        return [dict(zip(COLUMNS, row)) for row in db.execute(sql, (k,))]
@@ -2,16 +2,49 @@ import pygame
 import random
 import sys
 import os
-import json
+import atexit
+import threading
+import time
+from collections import deque
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from projection import Projection
+from sprite_cache import SpriteCache
+from sprite_ladder import LadderSet
+from particles import ParticleSystem
+from text_cache import TextCache, GlyphAtlas, stack, unpremultiply, OUTLINE
+from presenter import Presenter, RenderScheduler
+from assets import AssetLoader
+from bundle import SpriteBundle, write_bundle
+from sound_cache import PCMCache
+from audio import AudioManager
+from leaderboard import Leaderboard
+from profiler import FrameProfiler
 
 # --- PATH CONFIGURATION ---
 BASE_DIR = os.path.dirname(__file__)
 ASSETS_DIR = os.path.join(BASE_DIR, "assets/images")
 SOUND_DIR = os.path.join(BASE_DIR, "assets/sound")
-LEADERBOARD_FILE = os.path.join(BASE_DIR, "leaderboard.json")
+LEADERBOARD_FILE = os.path.join(BASE_DIR, "leaderboard.json")   # oud formaat, wordt eenmalig overgenomen
+LEADERBOARD_DB = os.path.join(BASE_DIR, "leaderboard.db")
+# Voorverpakte sprites (python build_bundle.py); TT_ASSET_BUNDLE="" = altijd losse bestanden
+ASSET_BUNDLE_PATH = os.environ.get("TT_ASSET_BUNDLE", os.path.join(BASE_DIR, "assets/sprites.bundle"))
+BUNDLE = None   # SpriteBundle, geopend na set_mode
 
 def load_image(name):
     path = os.path.join(ASSETS_DIR, name)
+    if BUNDLE is not None:
+        surf = BUNDLE.get(name, path)
+        if surf is not None:
+            return surf
+    return load_image_file(path)
+
+def load_image_file(path):
     try:
         return pygame.image.load(path).convert_alpha()
     except FileNotFoundError:
@@ -22,33 +55,26 @@ def load_image(name):
 def load_sound(name):
     path = os.path.join(SOUND_DIR, name)
     try:
-        return pygame.mixer.Sound(path)
+        return SOUND_CACHE.load(path)
     except FileNotFoundError:
         return None
 
 # --- LEADERBOARD LOGICA ---
-def get_high_scores():
-    if not os.path.exists(LEADERBOARD_FILE):
-        return []
-    try:
-        with open(LEADERBOARD_FILE, "r") as f:
-            return json.load(f)
-    except:
-        return []
-
-def save_new_score(score):
-    scores = get_high_scores()
-    scores.append(score)
-    scores.sort(reverse=True)
-    scores = scores[:3]
-    
-    with open(LEADERBOARD_FILE, "w") as f:
-        json.dump(scores, f)
-    return scores
+# Alle runs in SQLite; schrijven gebeurt op een eigen thread (zie leaderboard.py).
+# Pas main() opent de database: simulate.py, de benchmarks en build_bundle.py laten de scores met rust.
+_leaderboard = None
+
+def get_leaderboard():
+    """The score database; opened (writer thread started) on the first call."""
+    global _leaderboard
+    if _leaderboard is None:
+        _leaderboard = Leaderboard(LEADERBOARD_DB, LEADERBOARD_FILE)
+        atexit.register(_leaderboard.close)
+    return _leaderboard
 
 def draw_leaderboard_panel(surf, scores, center_x, start_y):
     """Tekent de scores minimalistisch (zonder kader)."""
-    title = FONT.render("LEADERBOARD", True, NEON_CYAN)
+    title = TEXT_CACHE.render(FONT, "LEADERBOARD", NEON_CYAN)
     surf.blit(title, (center_x - title.get_width() // 2, start_y))
 
     for i in range(3):
@@ -67,126 +93,208 @@ def draw_leaderboard_panel(surf, scores, center_x, start_y):
             color = (80, 80, 80)
 
         row_y = start_y + 40 + (i * 30)
-        rank_txt = FONT.render(rank_str, True, color)
+        rank_txt = TEXT_CACHE.render(FONT, rank_str, color)
         surf.blit(rank_txt, (center_x - 70, row_y))
 
-        score_txt = FONT.render(score_str, True, WHITE)
+        score_txt = TEXT_CACHE.render(FONT, score_str, WHITE)
         surf.blit(score_txt, (center_x + 70 - score_txt.get_width(), row_y))
 
 # --- INITIALIZATION ---
 pygame.init()
 pygame.mixer.init()
+# Gedecodeerde geluidseffecten (ruwe PCM in het mixer-formaat) naast de mp3's
+SOUND_CACHE_DIR = os.path.join(SOUND_DIR, ".pcm-cache")
+SOUND_CACHE = PCMCache(SOUND_CACHE_DIR)
+# Mixer-kanalen: kanaal 0 vast voor de motor-loop, de rest gedeeld door effecten.
+# Per effect maximaal zoveel stemmen tegelijk; daarboven wordt de oudste hergebruikt.
+AUDIO_CHANNELS = 16
+VOICE_LIMITS = {"shoot": 4, "explosion": 3, "transform": 1, "beep": 1, "go": 1}
+AUDIO = AudioManager(AUDIO_CHANNELS, ("engine",), VOICE_LIMITS)
 
 W, H = 1024, 768
 screen = pygame.display.set_mode((W, H))
 pygame.display.set_caption("Triple Threat - Choose Your Lane")
 clock = pygame.time.Clock()
-
-# --- FONTS ---
-FONT = pygame.font.SysFont("Arial", 22, bold=True)
-BIG_FONT = pygame.font.SysFont("Arial", 64, bold=True)
-COUNTDOWN_FONT = pygame.font.SysFont("Arial", 120, bold=True)
-BUTTON_FONT = pygame.font.SysFont("Arial", 24, bold=True)
-SMALL_FONT = pygame.font.SysFont("Arial", 16, bold=True)
-INFO_FONT = pygame.font.SysFont("Times New Roman", 30, bold=True)
+BUNDLE = SpriteBundle.open(ASSET_BUNDLE_PATH)
 
 # --- ASSETS LOADING ---
-CAR_DRIVE_1 = pygame.transform.rotate(load_image("racecars/porsche_backview.png"), 0)
-CAR_DRIVE_2 = pygame.transform.rotate(load_image("racecars/bmwm3_backview.png"), 0)
-CAR_DRIVE_3 = pygame.transform.rotate(load_image("racecars/skyline_backview.png"), 0)
-PLAYER_DRIVE_SPRITES = [CAR_DRIVE_1, CAR_DRIVE_2, CAR_DRIVE_3]
-
-MENU_CAR_1 = pygame.transform.rotate(load_image("racecars/porsche_frontview.png"), 0)
-MENU_CAR_2 = pygame.transform.rotate(load_image("racecars/BMW_frontview.png"), 0)
-MENU_CAR_3 = pygame.transform.rotate(load_image("racecars/R34_frontview.png"), 0)
-PLAYER_MENU_VIEWS = [MENU_CAR_1, MENU_CAR_2, MENU_CAR_3]
-
-ENEMY_FILENAMES = ["enemy-cars/kart.png", "enemy-cars/front_view.png", "enemy-cars/sport_car.png",
-                   "enemy-cars/bmw.png", "enemy-cars/bmw2.png", "enemy-cars/front_view_skyline_enemy.png",
-                   "enemy-cars/porsche.png"]
-IMG_ENEMIES = [pygame.transform.rotate(load_image(f), 0) for f in ENEMY_FILENAMES]
-IMG_FALLBACK_ENEMY = pygame.transform.rotate(load_image("car.png"), 0)
-
-MAG_ICON = load_image("ammo.png")
-
-def load_robot_frames(folder, prefix, max_count=60):
-    frames = []
-    for i in range(1, max_count + 1):
-        img = load_image(os.path.join("animations", folder, f"{prefix}_{i}.png"))
-
-        # detect fallback (your load_image creates a 50x50 magenta surface)
-        if img.get_width() == 50 and img.get_height() == 50:
-            break
-
-        frames.append(img)
-
-    return frames
+# Alle bestanden worden op ASSET_WORKERS threads geladen. Voor het eerste
+# scherm wachten we alleen op groep "menu" (poster, menu-auto's); "race" en
+# "sound" laden door terwijl het menu draait (zie load_race_assets).
+ASSET_WORKERS = 4
+STARTUP_PROFILE = True
+ASSETS = AssetLoader(ASSET_WORKERS)
+
+# Poster en skyline staan voorgeschaald in de bundle, onder deze namen
+POSTER_FILE, POSTER_KEY = "poster.jpg", f"poster.jpg@{W}x{H}"
+SKYLINE_FILE, SKYLINE_H = "skyline.png", 160
+SKYLINE_KEY = f"skyline.png@h{SKYLINE_H}"
+
+def from_bundle(key, name):
+    """Pre-scaled `key` from the bundle, if it is there and `name` did not change."""
+    if BUNDLE is None:
+        return None
+    return BUNDLE.get(key, os.path.join(ASSETS_DIR, name))
 
+def load_poster():
+    return from_bundle(POSTER_KEY, POSTER_FILE) or scale_poster()
 
+def scale_poster():
+    try:
+        poster = pygame.image.load(os.path.join(ASSETS_DIR, POSTER_FILE)).convert()
+        return pygame.transform.smoothscale(poster, (W, H))
+    except Exception:
+        return None
 
-ROBOT_TRANSFORM_FRAMES_PER_CAR = [
-    load_robot_frames("porsche-transformation", "porsche_transform"),
-    load_robot_frames("bmw-transformation", "bmw_transform"),
-    load_robot_frames("skyline-transformation", "nissan_transform"),
-]
+def load_skyline():
+    return from_bundle(SKYLINE_KEY, SKYLINE_FILE) or scale_skyline()
 
-ROBOT_RUN_FRAMES_PER_CAR = [
-    load_robot_frames("porsche-animation", "porsche_trans"),
-    load_robot_frames("bmw-animation", "bmw_trans"),
-    load_robot_frames("skyline-animation", "skyline_trans"),
-]
+def scale_skyline():
+    try:
+        raw_skyline = load_image_file(os.path.join(ASSETS_DIR, SKYLINE_FILE))
+        if raw_skyline.get_width() == 50:
+            return None
+        sky_w, sky_h = raw_skyline.get_size()
+        return pygame.transform.smoothscale(raw_skyline, (int(sky_w * SKYLINE_H / sky_h), SKYLINE_H))
+    except Exception:
+        return None
 
+def load_sound_at(name, volume=None):
+    sound = load_sound(name)
+    if sound and volume is not None:
+        sound.set_volume(volume)
+    return sound
 
-try:
-    raw_skyline = load_image("skyline.png")
-    if raw_skyline.get_width() == 50:
-        IMG_SKYLINE = None
-    else:
-        sky_w, sky_h = raw_skyline.get_size()
-        target_h = 160
-        scale_factor = target_h / sky_h
-        new_w = int(sky_w * scale_factor)
-        IMG_SKYLINE = pygame.transform.smoothscale(raw_skyline, (new_w, target_h))
-except Exception:
-    IMG_SKYLINE = None
+def robot_frame_files(folder, prefix, max_count=60):
+    """animations/<folder>/<prefix>_1.png, _2.png, ... up to the first missing one.
 
-try:
-    poster_path = os.path.join(ASSETS_DIR, "poster.jpg")
-    IMG_POSTER = pygame.image.load(poster_path).convert()
-    IMG_POSTER = pygame.transform.smoothscale(IMG_POSTER, (W, H))
-except Exception:
-    IMG_POSTER = None
+    Frames count as present if they are in the bundle or on disk.
+    """
+    try:
+        present = set(os.listdir(os.path.join(ASSETS_DIR, "animations", folder)))
+    except OSError:
+        present = set()
+    files = []
+    for i in range(1, max_count + 1):
+        name = os.path.join("animations", folder, f"{prefix}_{i}.png")
+        if os.path.basename(name) not in present and (BUNDLE is None or name not in BUNDLE):
+            break
+        files.append(name)
+    return files
 
-SOUND_ENGINE = load_sound("car-effect1.mp3")
+MENU_VIEW_FILES = ["racecars/porsche_frontview.png", "racecars/BMW_frontview.png", "racecars/R34_frontview.png"]
+DRIVE_FILES = ["racecars/porsche_backview.png", "racecars/bmwm3_backview.png", "racecars/skyline_backview.png"]
+ENEMY_FILENAMES = ["enemy-cars/kart.png", "enemy-cars/front_view.png", "enemy-cars/sport_car.png",
+                   "enemy-cars/bmw.png", "enemy-cars/bmw2.png", "enemy-cars/front_view_skyline_enemy.png",
+                   "enemy-cars/porsche.png"]
+ROBOT_TRANSFORM_FOLDERS = [("porsche-transformation", "porsche_transform"),
+                           ("bmw-transformation", "bmw_transform"),
+                           ("skyline-transformation", "nissan_transform")]
+ROBOT_RUN_FOLDERS = [("porsche-animation", "porsche_trans"),
+                     ("bmw-animation", "bmw_trans"),
+                     ("skyline-animation", "skyline_trans")]
+EXPLOSION_FILES = [f"animations/explosion/explosion-c{i}.png" for i in range(1, 11)]
+# naam -> (bestand, volume)
+SOUND_FILES = {
+    "engine": ("car-effect1.mp3", 0.3),
+    "explosion": ("car_explosion.mp3", 0.7),
+    "robot_engine": ("running2.mp3", 0.2),
+    "transform": ("transformation.mp3", 0.7),
+    "beep": ("Beep_start.mp3", 0.6),
+    "go": ("Go_sound.mp3", 0.8),
+    "shoot": ("shot.mp3", 0.3),
+}
 MUSIC_PATH = os.path.join(SOUND_DIR, "Soundtrack.mp3")
-SOUND_EXPLOSION = load_sound("car_explosion.mp3")
-SOUND_ROBOT_ENGINE = load_sound("running2.mp3")
-SOUND_TRANSFORM = load_sound("transformation.mp3")
-SOUND_BEEP = load_sound("Beep_start.mp3")
-SOUND_GO = load_sound("Go_sound.mp3")
-SOUND_SHOOT = load_sound("shot.mp3")
-if SOUND_SHOOT:
-    SOUND_SHOOT.set_volume(0.3)
-if SOUND_EXPLOSION:
-    SOUND_EXPLOSION.set_volume(0.7)
-if SOUND_ENGINE:
-    SOUND_ENGINE.set_volume(0.3)
-if SOUND_ROBOT_ENGINE:
-    SOUND_ROBOT_ENGINE.set_volume(0.2)
-if SOUND_TRANSFORM:
-    SOUND_TRANSFORM.set_volume(0.7)
-if SOUND_BEEP:
-    SOUND_BEEP.set_volume(0.6)
-if SOUND_GO:
-    SOUND_GO.set_volume(0.8)
-
-
-SCALE_CACHE = {}
 
+def build_asset_bundle(path=ASSET_BUNDLE_PATH):
+    """Pack every sprite the game loads, decoded and pre-scaled, into `path`.
+
+    Always reads the loose files. Returns (number of sprites, bytes written).
+    """
+    names = MENU_VIEW_FILES + DRIVE_FILES + ENEMY_FILENAMES + ["car.png", "ammo.png"] + EXPLOSION_FILES
+    for folder in ROBOT_TRANSFORM_FOLDERS + ROBOT_RUN_FOLDERS:
+        names += robot_frame_files(*folder)
+    entries = []
+    for name in dict.fromkeys(names):
+        source = os.path.join(ASSETS_DIR, name)
+        if os.path.exists(source):
+            entries.append((name, load_image_file(source), source, False))
+    poster = scale_poster()
+    if poster is not None:
+        entries.append((POSTER_KEY, poster, os.path.join(ASSETS_DIR, POSTER_FILE), True))
+    skyline = scale_skyline()
+    if skyline is not None:
+        entries.append((SKYLINE_KEY, skyline, os.path.join(ASSETS_DIR, SKYLINE_FILE), False))
+    return len(entries), write_bundle(path, entries)
+
+_menu_jobs = [ASSETS.load("menu", load_image, f) for f in MENU_VIEW_FILES]
+_poster_job = ASSETS.load("menu", load_poster)
+
+# --- FONTS ---
+with ASSETS.timed("fonts"):
+    FONT = pygame.font.SysFont("Arial", 22, bold=True)
+    BIG_FONT = pygame.font.SysFont("Arial", 64, bold=True)
+    COUNTDOWN_FONT = pygame.font.SysFont("Arial", 120, bold=True)
+    BUTTON_FONT = pygame.font.SysFont("Arial", 24, bold=True)
+    SMALL_FONT = pygame.font.SysFont("Arial", 16, bold=True)
+    INFO_FONT = pygame.font.SysFont("Times New Roman", 30, bold=True)
+    KEY_FONT = pygame.font.SysFont("Arial", 22, bold=True)   # toetsen in het info-scherm
+
+ASSETS.wait("menu")
+PLAYER_MENU_VIEWS = [job.result() for job in _menu_jobs]
+IMG_POSTER = _poster_job.result()
+
+# De rest pas na het menu in de wachtrij, zodat het menu de threads voor zich heeft
+# (geluiden eerst: uit de PCM-cache kosten ze bijna niets)
+_sound_jobs = {name: ASSETS.load("sound", load_sound_at, f, vol) for name, (f, vol) in SOUND_FILES.items()}
+_race_jobs = {
+    "drive": [ASSETS.load("race", load_image, f) for f in DRIVE_FILES],
+    "enemies": [ASSETS.load("race", load_image, f) for f in ENEMY_FILENAMES],
+    "fallback": ASSETS.load("race", load_image, "car.png"),
+    "mag": ASSETS.load("race", load_image, "ammo.png"),
+    "skyline": ASSETS.load("race", load_skyline),
+    "explosion": [ASSETS.load("race", load_image, f) for f in EXPLOSION_FILES],
+    "transform": [[ASSETS.load("race", load_image, f) for f in robot_frame_files(*folder)]
+                  for folder in ROBOT_TRANSFORM_FOLDERS],
+    "run": [[ASSETS.load("race", load_image, f) for f in robot_frame_files(*folder)]
+            for folder in ROBOT_RUN_FOLDERS],
+}
+
+# Race-assets: gevuld door load_race_assets(). Geluiden (SOUNDS, naam uit
+# SOUND_FILES): door collect_sounds(), elk zodra het klaar is; tot dan stil.
+PLAYER_DRIVE_SPRITES = []
+IMG_ENEMIES = []
+IMG_FALLBACK_ENEMY = None
+MAG_ICON = None
+ROBOT_TRANSFORM_FRAMES_PER_CAR = []
+ROBOT_RUN_FRAMES_PER_CAR = []
+IMG_SKYLINE = None
 EXPLOSION_FRAMES = []
-for i in range(1, 11):
-    img = load_image(f"animations/explosion/explosion-c{i}.png")
-    EXPLOSION_FRAMES.append(img)
+SOUNDS = {}
+RACE_ASSETS_READY = False
+STARTUP_REPORTED = False
+
+# Scaled sprites: LRU op totaal aantal bytes, maten afgerond op SPRITE_CACHE_STEP px
+SPRITE_CACHE_BUDGET_MB = 48
+SPRITE_CACHE_STEP = 2
+SPRITE_CACHE = SpriteCache(SPRITE_CACHE_BUDGET_MB * 1024 * 1024, SPRITE_CACHE_STEP)
+# Schaduw-ellipsen per (breedte, hoogte, alpha), in een eigen cache zodat ze
+# geen geschaalde sprites verdringen
+SHADOW_CACHE_BUDGET_MB = 16
+SHADOW_CACHE_STEP = 2
+SHADOW_SIZE_TOLERANCE = 0.04
+SHADOW_CACHE = SpriteCache(SHADOW_CACHE_BUDGET_MB * 1024 * 1024, SHADOW_CACHE_STEP)
+# Gerenderde teksten (LRU) en losse witte cijfers voor de score (WHITE staat pas bij COLORS)
+TEXT_CACHE_SIZE = 256
+TEXT_CACHE = TextCache(TEXT_CACHE_SIZE)
+SCORE_DIGITS = GlyphAtlas(FONT, (255, 255, 255))
+# Auto's, robot en explosies: vaste ladder van geschaalde versies (smoothscale).
+# Meer sporten = kleinere sprongen in grootte maar meer geheugen; PREBUILD maakt
+# alles bij het laden in plaats van bij eerste gebruik.
+SPRITE_LADDER_RUNGS = 40
+SPRITE_LADDER_PREBUILD = False
+DUMP_STATS_AT_EXIT = False
+
 
 # --- CONSTANTS ---
 LANES = 3
@@ -214,6 +322,30 @@ ROBOT_ANIM_SPEED = 0.15            # frames per tick (can be fractional)
 ROBOT_CONTACT_SCORE_CAR = 300
 ROBOT_CONTACT_SCORE_OTHER = 120
 
+# Alleen gewijzigde rechthoeken naar het scherm (display.update) als het beeld
+# grotendeels stilstaat: pauze, crash, info-scherm, menu
+DIRTY_RECTS = False
+
+# Stilstaande schermen (menu, pauze, crash) zakken na IDLE_AFTER_S seconden
+# zonder verandering naar IDLE_FPS; input maakt ze meteen weer wakker
+IDLE_FPS = 4
+IDLE_AFTER_S = 1.0
+
+# Frame-profiler per fase (grafiek rechtsboven + CSV in PROFILE_DIR); F3 schakelt
+FRAME_PROFILER = False
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+
+# Boost-effect (ghost, warp-strepen, zoom): "high", "low" (zwakke kiosk-pc's) of "off"
+BOOST_FX_QUALITY = "high"
+
+# Keep obstacles in NumPy arrays (ObstacleStore) instead of a list of objects
+ARRAY_OBSTACLES = False
+
+# Kogel/obstakel-botsingen: LaneBroadPhase pas vanaf zoveel kogels, en zolang er niet meer dan
+# zoveel obstakels per kogel zijn; anders is de simpele all-pairs lus sneller (bench_collisions.py)
+BROAD_PHASE_MIN_BULLETS = 4
+BROAD_PHASE_MAX_OBSTACLES_PER_BULLET = 8
+
 # --- COLORS ---
 NEON_CYAN = (0, 255, 255)
 NEON_RED = (255, 50, 50)
@@ -241,7 +373,6 @@ LANTERN_GLOW = (255, 200, 50)
 # --- HELPER FUNCTIONS ---
 def clamp(x, a, b): return max(a, min(b, x))
 def lerp(a, b, t): return a + (b - a) * t
-def ease_in(t): return t * t
 
 def road_edges_at_y(y):
     t = (y - ROAD_FAR_Y) / (ROAD_NEAR_Y - ROAD_FAR_Y)
@@ -249,124 +380,209 @@ def road_edges_at_y(y):
     half_w = lerp(ROAD_FAR_W / 2, ROAD_NEAR_W / 2, t)
     return ROAD_CENTER_X - half_w, ROAD_CENTER_X + half_w
 
-def y_from_z(z):
-    if z < 0: z = 0
-    t = ease_in(z)
-    return lerp(ROAD_FAR_Y, ROAD_NEAR_Y, t)
-
-def lane_center_x_at_y(lane_idx, y):
-    left, right = road_edges_at_y(y)
-    lane_w = (right - left) / LANES
-    return left + lane_w * (lane_idx + 0.5)
-
-def scale_cached(img, size, cache):
-    if len(cache) > 2000:
-        cache.clear()
-    w, h = max(1, int(size[0])), max(1, int(size[1]))
-    key = (id(img), w, h)
-    if key not in cache:
-        cache[key] = pygame.transform.scale(img, (w, h))
-    return cache[key]
+# z -> (y, scale, left, right, lane centers) uit voorberekende tabellen
+PROJECTION = Projection(ROAD_FAR_Y, ROAD_NEAR_Y, ROAD_FAR_W, ROAD_NEAR_W, ROAD_CENTER_X, LANES)
+
+def texture_memory_report():
+    """Current and peak bytes held by the facade atlas, the sprite caches and the background."""
+    atlas = FACADE_ATLAS.stats()
+    sprites = SPRITE_CACHE.stats()
+    return {
+        "atlas_bytes": atlas["texture_bytes"],
+        "atlas_peak_bytes": atlas["peak_texture_bytes"],
+        "scale_cache_bytes": sprites["bytes"],
+        "scale_cache_peak_bytes": sprites["peak_bytes"],
+        "scale_cache_entries": sprites["entries"],
+        "ladder_bytes": SPRITE_LADDERS.stats()["bytes"],
+        "background_bytes": BACKGROUND_CACHE.bytes(),
+    }
+
+# Gezet door main(), zodat dump_stats() ook de presenter- en scheduler-tellers kan tonen
+_presenter = None
+_scheduler = None
+
+def dump_stats():
+    print(SPRITE_CACHE.format_stats())
+    print(SPRITE_LADDERS.format_stats())
+    print(SHADOW_CACHE.format_stats("shadow cache"))
+    print(TEXT_CACHE.format_stats())
+    if BUNDLE is not None:
+        print(BUNDLE.format_stats())
+    print(SOUND_CACHE.format_stats())
+    print(AUDIO.format_stats())
+    if _leaderboard is not None:
+        print(_leaderboard.format_stats())
+    if _presenter is not None:
+        print(_presenter.format_stats())
+    if _scheduler is not None:
+        print(_scheduler.format_stats())
+    if PROFILER.csv_path:
+        print(f"frame profile: {PROFILER.csv_path}")
+    mem = texture_memory_report()
+    print(f"texture memory: atlas {mem['atlas_bytes'] / 2**20:.1f} MiB (peak {mem['atlas_peak_bytes'] / 2**20:.1f}), "
+          f"scale cache {mem['scale_cache_bytes'] / 2**20:.1f} MiB (peak {mem['scale_cache_peak_bytes'] / 2**20:.1f}), "
+          f"ladders {mem['ladder_bytes'] / 2**20:.1f} MiB, background {mem['background_bytes'] / 2**20:.1f} MiB")
 
 def draw_text_with_outline(surf, text, font, color, pos, center=False):
-    outline_color = (0, 0, 0)
-    render_base = font.render(text, True, color)
-    render_outline = font.render(text, True, outline_color)
-    if center:
-        rect = render_base.get_rect(center=pos)
-        x, y = rect.topleft
-    else:
-        x, y = pos
-    surf.blit(render_outline, (x-2, y))
-    surf.blit(render_outline, (x+2, y))
-    surf.blit(render_outline, (x, y-2))
-    surf.blit(render_outline, (x+2, y))
-    surf.blit(render_base, (x, y))
+    return TEXT_CACHE.blit_outlined(surf, font, text, color, pos, center)
 
-def draw_shadow(surf, rect, alpha=100):
-    if rect.width <= 0 or rect.height <= 0: return
-    shadow_surf = pygame.Surface((rect.width, max(1, rect.height // 4)), pygame.SRCALPHA)
+def draw_score(surf, score, pos=(20, 20)):
+    # "SCORE: " uit de tekstcache, de cijfers uit de glyph-atlas: geen font.render per frame
+    rect = draw_text_with_outline(surf, "SCORE: ", FONT, WHITE, pos)
+    x = pos[0] + FONT.size("SCORE: ")[0]
+    end_x = SCORE_DIGITS.draw(surf, str(score), (x, pos[1]))
+    return rect.union((x - OUTLINE, pos[1] - OUTLINE, end_x - x + 2 * OUTLINE, FONT.get_height() + OUTLINE))
+
+def render_shadow(size, alpha):
+    shadow_surf = pygame.Surface(size, pygame.SRCALPHA)
     pygame.draw.ellipse(shadow_surf, (0, 0, 0, alpha), shadow_surf.get_rect())
-    surf.blit(shadow_surf, (rect.x, rect.bottom - rect.height // 6))
+    return shadow_surf
 
-def draw_button(surf, rect, text, is_danger=False):
-    mouse_pos = pygame.mouse.get_pos()
-    is_hovering = rect.collidepoint(mouse_pos)
-    shadow_rect = rect.copy(); shadow_rect.y += 4
-    s_shadow = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
+def draw_shadow(surf, rect, alpha=100):
+    if rect.width <= 0 or rect.height <= 0: return
+    w = rect.width
+    h = max(1, rect.height // 4)
+    # grote schaduwen grover afronden (~SHADOW_SIZE_TOLERANCE), anders past
+    # elke nieuwe z een nieuwe maat
+    step = max(1, int(w * SHADOW_SIZE_TOLERANCE))
+    if step > 1:
+        w = max(step, (w + step // 2) // step * step)
+        h = max(1, (h + step // 2) // step * step)
+    shadow_surf = SHADOW_CACHE.render(("shadow", alpha), (w, h), lambda size: render_shadow(size, alpha))
+    # maat is afgerond: centreren op de rect
+    x = rect.centerx - shadow_surf.get_width() // 2
+    surf.blit(shadow_surf, (x, rect.bottom - rect.height // 6))
+
+# --- UI WIDGETS ---
+# Widgets renderen hun beelden vooraf (bij aanmaken of bij een nieuwe maat/tekst);
+# tekenen is daarna één blit per widget.
+
+def composite(size, layers):
+    """Stack SRCALPHA (surface, pos) layers into one premultiplied image.
+
+    Plain alpha blits onto a transparent surface darken the colours, so the
+    layers are combined premultiplied; blit the result with
+    BLEND_PREMULTIPLIED to get the same pixels as blitting the layers one by one.
+    """
+    return stack(size, [(layer.convert_alpha().premul_alpha(), pos) for layer, pos in layers])
+
+def render_button(size, text, is_danger, hover):
+    w, h = size
+    s_shadow = pygame.Surface((w, h), pygame.SRCALPHA)
     pygame.draw.rect(s_shadow, (0, 0, 0, 100), s_shadow.get_rect(), border_radius=10)
-    surf.blit(s_shadow, shadow_rect.topleft)
 
-    s_body = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
+    s_body = pygame.Surface((w, h), pygame.SRCALPHA)
     if is_danger:
-        bg_color = (220, 20, 20, 230) if is_hovering else (160, 0, 0, 200)
-        border_color = (255, 100, 100) if is_hovering else (200, 50, 50)
+        bg_color = (220, 20, 20, 230) if hover else (160, 0, 0, 200)
+        border_color = (255, 100, 100) if hover else (200, 50, 50)
     else:
-        bg_color = (0, 180, 255, 230) if is_hovering else (0, 100, 180, 200)
-        border_color = (150, 255, 255) if is_hovering else (0, 200, 255)
-
+        bg_color = (0, 180, 255, 230) if hover else (0, 100, 180, 200)
+        border_color = (150, 255, 255) if hover else (0, 200, 255)
     pygame.draw.rect(s_body, bg_color, s_body.get_rect(), border_radius=10)
-    surf.blit(s_body, rect.topleft)
-    g = pygame.Surface((rect.width, rect.height // 2), pygame.SRCALPHA)
+
+    g = pygame.Surface((w, h // 2), pygame.SRCALPHA)
     pygame.draw.rect(g, (255, 255, 255, 30), g.get_rect(), border_top_left_radius=10, border_top_right_radius=10)
-    surf.blit(g, rect.topleft)
-    pygame.draw.rect(surf, border_color, rect, 2, border_radius=10)
+    border = pygame.Surface((w, h), pygame.SRCALPHA)
+    pygame.draw.rect(border, border_color, border.get_rect(), 2, border_radius=10)
 
     text_surf = BUTTON_FONT.render(text, True, WHITE)
-    text_rect = text_surf.get_rect(center=rect.center)
+    text_rect = text_surf.get_rect(center=(w // 2, h // 2))
     text_shadow = BUTTON_FONT.render(text, True, (0, 0, 0))
-    surf.blit(text_shadow, (text_rect.x + 1, text_rect.y + 1))
-    surf.blit(text_surf, text_rect)
-
-def draw_countdown_lights(surf, stage):
-    center_x = W // 2
-    center_y = H // 4
-    if stage == 0:
-        offset_x = random.randint(-3, 3)
-        offset_y = random.randint(-3, 3)
-        txt_surf = COUNTDOWN_FONT.render("GO!", True, NEON_CYAN)
-        shadow_surf = COUNTDOWN_FONT.render("GO!", True, (0, 50, 100))
-        txt_rect = txt_surf.get_rect(center=(center_x, H // 2))
-        surf.blit(shadow_surf, (txt_rect.x + offset_x + 4, txt_rect.y + offset_y + 4))
-        surf.blit(txt_surf, (txt_rect.x + offset_x, txt_rect.y + offset_y))
-        return
-
-    box_w, box_h = 220, 80
-    box_rect = pygame.Rect(0, 0, box_w, box_h)
-    box_rect.center = (center_x, center_y)
-    pygame.draw.rect(surf, (20, 22, 25), box_rect, border_radius=20)
-    pygame.draw.rect(surf, (160, 170, 180), box_rect, 4, border_radius=20)
-    pygame.draw.rect(surf, (10, 10, 10), box_rect.inflate(-6, -6), 2, border_radius=18)
-
-    radius = 22
-    spacing = 65
-    colors = {
-        3: {"lit": (255, 20, 20),   "dark": (60, 10, 10),   "glow": (255, 0, 0)},
-        2: {"lit": (255, 180, 0),   "dark": (60, 40, 0),    "glow": (255, 140, 0)},
-        1: {"lit": (0, 255, 80),    "dark": (0, 60, 20),    "glow": (0, 255, 0)}
-    }
-    current_set = colors.get(stage, colors[3])
-    positions = [(center_x - spacing, center_y), (center_x, center_y), (center_x + spacing, center_y)]
-
-    for x, y in positions:
-        pygame.draw.circle(surf, (5, 5, 5), (x, y), radius + 4)
-        pygame.draw.circle(surf, (80, 80, 90), (x, y), radius + 4, 2)
-        glow_radius = int(radius * 1)
-        glow_surf = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-        glow_rgb = current_set["glow"]
-        pygame.draw.circle(glow_surf, (*glow_rgb, 30), (glow_radius, glow_radius), glow_radius)
-        surf.blit(glow_surf, (x - glow_radius, y - glow_radius), special_flags=pygame.BLEND_ADD)
-        main_color = current_set["lit"]
-        pygame.draw.circle(surf, main_color, (x, y), radius)
-
-def generate_building_surface(w, h, side):
+    return composite((w, h + Button.SHADOW_OFFSET), [
+        (s_shadow, (0, Button.SHADOW_OFFSET)), (s_body, (0, 0)), (g, (0, 0)), (border, (0, 0)),
+        (text_shadow, (text_rect.x + 1, text_rect.y + 1)), (text_surf, text_rect.topleft),
+    ])
+
+class Button:
+    """Button with pre-rendered normal and hover images.
+
+    Images are built per (size, text, style) the first time that combination
+    is drawn and kept, so toggling a label (the info button) or moving the
+    rect costs nothing.
+    """
+    SHADOW_OFFSET = 4
+
+    def __init__(self, rect, text, is_danger=False):
+        self.rect = pygame.Rect(rect)
+        self.text = text
+        self.is_danger = is_danger
+        self.images = {}
+        self.current()
+
+    def set_label(self, text, is_danger=None):
+        self.text = text
+        if is_danger is not None:
+            self.is_danger = is_danger
+
+    def collidepoint(self, pos):
+        return self.rect.collidepoint(pos)
+
+    def current(self):
+        key = (self.rect.size, self.text, self.is_danger)
+        images = self.images.get(key)
+        if images is None:
+            images = tuple(render_button(self.rect.size, self.text, self.is_danger, hover) for hover in (False, True))
+            self.images[key] = images
+        return images
+
+    def draw(self, surf, hover=None):
+        if hover is None:
+            hover = self.rect.collidepoint(pygame.mouse.get_pos())
+        return surf.blit(self.current()[hover], self.rect.topleft, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+class CountdownLights:
+    """Start lights for stages 3-2-1 and the "GO!" text, rendered once."""
+    BOX_SIZE = (220, 80)
+
+    def __init__(self):
+        self.box_rect = pygame.Rect((0, 0), self.BOX_SIZE)
+        self.box_rect.center = (W // 2, H // 4)
+        self.stages = {stage: self.render_stage(stage) for stage in (1, 2, 3)}
+        self.go_text = COUNTDOWN_FONT.render("GO!", True, NEON_CYAN)
+        self.go_shadow = COUNTDOWN_FONT.render("GO!", True, (0, 50, 100))
+
+    def render_stage(self, stage):
+        img = pygame.Surface(self.BOX_SIZE, pygame.SRCALPHA)
+        box_rect = img.get_rect()
+        pygame.draw.rect(img, (20, 22, 25), box_rect, border_radius=20)
+        pygame.draw.rect(img, (160, 170, 180), box_rect, 4, border_radius=20)
+        pygame.draw.rect(img, (10, 10, 10), box_rect.inflate(-6, -6), 2, border_radius=18)
+
+        radius = 22
+        spacing = 65
+        colors = {
+            3: {"lit": (255, 20, 20),   "dark": (60, 10, 10),   "glow": (255, 0, 0)},
+            2: {"lit": (255, 180, 0),   "dark": (60, 40, 0),    "glow": (255, 140, 0)},
+            1: {"lit": (0, 255, 80),    "dark": (0, 60, 20),    "glow": (0, 255, 0)}
+        }
+        current_set = colors.get(stage, colors[3])
+        cx, cy = box_rect.center
+        glow_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(glow_surf, (*current_set["glow"], 30), (radius, radius), radius)
+        for x, y in [(cx - spacing, cy), (cx, cy), (cx + spacing, cy)]:
+            pygame.draw.circle(img, (5, 5, 5), (x, y), radius + 4)
+            pygame.draw.circle(img, (80, 80, 90), (x, y), radius + 4, 2)
+            img.blit(glow_surf, (x - radius, y - radius), special_flags=pygame.BLEND_ADD)
+            pygame.draw.circle(img, current_set["lit"], (x, y), radius)
+        return img
+
+    def draw(self, surf, stage):
+        if stage == 0:
+            offset_x = random.randint(-3, 3)
+            offset_y = random.randint(-3, 3)
+            txt_rect = self.go_text.get_rect(center=(W // 2, H // 2))
+            r = surf.blit(self.go_shadow, (txt_rect.x + offset_x + 4, txt_rect.y + offset_y + 4))
+            return r.union(surf.blit(self.go_text, (txt_rect.x + offset_x, txt_rect.y + offset_y)))
+        return surf.blit(self.stages.get(stage, self.stages[3]), self.box_rect.topleft)
+
+def generate_building_surface(w, h, side, rng=random):
     surf = pygame.Surface((w, h), pygame.SRCALPHA)
     # surf.fill(BUILDING_BASE) 
     
     # Als je wilt dat het gebouw een basiskleur heeft, teken dan een rect:
     pygame.draw.rect(surf, BUILDING_BASE, (0, 0, w, h)) 
     
-    side_width = random.randint(5, 15)
+    side_width = rng.randint(5, 15)
     if side == -1:
         pygame.draw.rect(surf, BUILDING_SIDE, (0, 0, side_width, h))
         draw_area_x = side_width
@@ -375,27 +591,27 @@ def generate_building_surface(w, h, side):
         draw_area_x = 0
 
     face_w = w - side_width
-    win_w = random.randint(4, 8)
-    win_h = random.randint(6, 12)
-    gap_x = random.randint(3, 5)
-    gap_y = random.randint(4, 8)
+    win_w = rng.randint(4, 8)
+    win_h = rng.randint(6, 12)
+    gap_x = rng.randint(3, 5)
+    gap_y = rng.randint(4, 8)
     
     cols = face_w // (win_w + gap_x)
     rows = h // (win_h + gap_y)
-    style = random.choice(["scattered", "lines", "office"])
+    style = rng.choice(["scattered", "lines", "office"])
     
     for r in range(1, rows):
-        is_lit_col = random.random() < 0.3 if style == "lines" else False
+        is_lit_col = rng.random() < 0.3 if style == "lines" else False
         for c in range(cols):
             px = draw_area_x + c * (win_w + gap_x) + 2
             py = r * (win_h + gap_y) + 4
             
-            if style == "lines": lit = is_lit_col and random.random() < 0.9
-            elif style == "office": lit = random.random() < 0.6
-            else: lit = random.random() < 0.2
+            if style == "lines": lit = is_lit_col and rng.random() < 0.9
+            elif style == "office": lit = rng.random() < 0.6
+            else: lit = rng.random() < 0.2
             
             if lit:
-                rnd = random.random()
+                rnd = rng.random()
                 if rnd < 0.8: color = WIN_WARM
                 elif rnd < 0.99: color = WIN_COOL
                 else: color = WIN_RED
@@ -406,38 +622,153 @@ def generate_building_surface(w, h, side):
     pygame.draw.rect(surf, (40, 40, 60), (0, 0, w, 4))
     return surf
 
-def draw_tech_info_button(surf, rect, hover):
-    center = rect.center
-    radius = rect.width // 2
-    import math
-    time_val = pygame.time.get_ticks() / 500.0
-    pulse_scale = 1.0 + (math.sin(time_val) * 0.1) if not hover else 1.2
-    
-    base_col = (0, 100, 150)
-    border_col = NEON_CYAN
-    text_col = NEON_CYAN
-    
-    if hover:
-        base_col = (0, 150, 200)
-        border_col = (200, 255, 255)
-        text_col = WHITE
-
-    glow_surf = pygame.Surface((int(rect.width * 2), int(rect.height * 2)), pygame.SRCALPHA)
-    glow_radius = int(radius * pulse_scale)
-    pygame.draw.circle(glow_surf, (*border_col, 50), (rect.width, rect.height), glow_radius)
-    surf.blit(glow_surf, (center[0] - rect.width, center[1] - rect.height), special_flags=pygame.BLEND_ADD)
-
-    pygame.draw.circle(surf, (*base_col, 200), center, radius)
-    thickness = 3 if hover else 2
-    pygame.draw.circle(surf, border_col, center, radius, thickness)
-    
-    txt = INFO_FONT.render("i", True, text_col)
-    txt_rect = txt.get_rect(center=center)
-    txt_rect.y -= 3 
-    surf.blit(txt, txt_rect)
+def make_building_facade(side, layer, rng=random):
+    """Random building size + facade; returns (surface, base_w, base_h)."""
+    size_mult = 1.0 if layer == 1 else 1.5
+    base_w = int(rng.randint(100, 180) * size_mult)
+    base_h = int(rng.randint(250, 500) * size_mult)
+
+    surf = generate_building_surface(base_w, base_h, side, rng)
+    if layer == 2:
+        darkener = pygame.Surface((base_w, base_h), pygame.SRCALPHA)
+        darkener.fill((0, 0, 10, 100))
+        surf.blit(darkener, (0, 0))
+    return surf, base_w, base_h
+
+# Tints are multiplied into the facade colours; index 0 leaves it as is.
+FACADE_TINTS = [(255, 255, 255), (215, 225, 255), (255, 232, 210), (200, 200, 212)]
+
+class FacadeAtlas:
+    """Fixed set of seeded building facades shared by every Building.
+
+    There are `variants` slots per (side, layer); slot k is always drawn from
+    the same seed, so a slot never has to be regenerated. A Building refers
+    to a slot plus a tint index, and tinted copies are made once per
+    (slot, tint). Texture memory is therefore bounded by
+    slots * tints, however many buildings spawn over a session.
+
+    A worker thread (start()) generates the slots ahead of use. If a Building
+    needs a kind whose slots are all still empty, one is generated inline and
+    counted as starved.
+    """
+    KINDS = ((-1, 1), (1, 1), (-1, 2), (1, 2))
+
+    def __init__(self, variants=6, tints=FACADE_TINTS, seed=1234):
+        self.variants = variants
+        self.tints = tints
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.slots = {kind: [None] * variants for kind in self.KINDS}
+        self.tinted = {}
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+        self.served = 0
+        self.starved = 0
+        self.starved_ms = 0.0
+        self.texture_bytes = 0
+        self.peak_texture_bytes = 0
+
+    def _slot_rng(self, kind, slot):
+        return random.Random(self.seed * 1000 + self.KINDS.index(kind) * 100 + slot)
+
+    def _store(self, kind, slot, item):
+        with self.lock:
+            if self.slots[kind][slot] is not None:
+                return self.slots[kind][slot]
+            self.slots[kind][slot] = item
+            self._add_bytes(item[0])
+            return item
+
+    def _add_bytes(self, surf):
+        self.texture_bytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        self.peak_texture_bytes = max(self.peak_texture_bytes, self.texture_bytes)
+
+    def pick(self, side, layer):
+        """(image, base_w, base_h, slot, tint) for a new Building."""
+        kind = (side, layer)
+        slot = self.rng.randrange(self.variants)
+        tint = self.rng.randrange(len(self.tints))
+        item = self.slots[kind][slot]
+        if item is None:
+            ready = [i for i, s in enumerate(self.slots[kind]) if s is not None]
+            if ready:
+                slot = ready[slot % len(ready)]
+                item = self.slots[kind][slot]
+        if item is None:
+            t0 = time.perf_counter()
+            item = self._store(kind, slot, make_building_facade(side, layer, self._slot_rng(kind, slot)))
+            self.starved += 1
+            self.starved_ms += (time.perf_counter() - t0) * 1000.0
+        else:
+            self.served += 1
+        return self.image(kind, slot, tint), item[1], item[2], slot, tint
+
+    def image(self, kind, slot, tint):
+        base = self.slots[kind][slot][0]
+        if tint == 0:
+            return base
+        key = (kind, slot, tint)
+        surf = self.tinted.get(key)
+        if surf is None:
+            surf = base.copy()
+            surf.fill(self.tints[tint], special_flags=pygame.BLEND_RGB_MULT)
+            with self.lock:
+                self.tinted[key] = surf
+                self._add_bytes(surf)
+        return surf
+
+    def fill_one(self):
+        """Generate one empty slot; False when the atlas is complete."""
+        for kind in self.KINDS:
+            for slot, item in enumerate(self.slots[kind]):
+                if item is None:
+                    self._store(kind, slot, make_building_facade(kind[0], kind[1], self._slot_rng(kind, slot)))
+                    return True
+        return False
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._work, name="facade-atlas", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _work(self):
+        while self.running and self.fill_one():
+            pass
+        self.running = False
+
+    def stats(self):
+        taken = self.served + self.starved
+        return {
+            "served": self.served,
+            "starved": self.starved,
+            "starved_pct": 100.0 * self.starved / taken if taken else 0.0,
+            "starved_ms": self.starved_ms,
+            "ready_slots": sum(s is not None for slots in self.slots.values() for s in slots),
+            "texture_bytes": self.texture_bytes,
+            "peak_texture_bytes": self.peak_texture_bytes,
+        }
+
+FACADE_ATLAS = FacadeAtlas()
 
 # --- DRAWING ENVIRONMENT ---
-def draw_background_and_terrain(surf, t_scroll):
+BG_BANDS = 120
+BG_STRIPES = 15
+# The stripe of band i is int(i / 8 + 15 * t_scroll) % 2, so the pattern only
+# changes every 1/120 of t_scroll and repeats after 16 of those steps.
+BG_PHASE_STEPS = BG_BANDS
+BG_PHASES = 2 * BG_BANDS // BG_STRIPES
+
+def render_background_and_terrain(surf, t_scroll):
+    """Tekent lucht, gras en stoepen rechtstreeks (zonder cache)."""
     if IMG_SKYLINE:
         img_w = IMG_SKYLINE.get_width()
         current_x = 0
@@ -450,7 +781,7 @@ def draw_background_and_terrain(surf, t_scroll):
             col = (10, 5 + c//2, 20 + c)
             pygame.draw.line(surf, col, (0, y), (W, y))
 
-    bands = 120
+    bands = BG_BANDS
     for i in range(bands):
         t0 = i / bands
         t1 = (i + 1) / bands
@@ -459,7 +790,7 @@ def draw_background_and_terrain(surf, t_scroll):
         left0, right0 = road_edges_at_y(y0)
         left1, right1 = road_edges_at_y(y1)
         
-        scroll_val = (t0 + t_scroll) * 15
+        scroll_val = (t0 + t_scroll) * BG_STRIPES
         stripe = int(scroll_val) % 2
         
         col_grass = GRASS_LIGHT if stripe == 0 else GRASS_DARK
@@ -475,7 +806,63 @@ def draw_background_and_terrain(surf, t_scroll):
         pygame.draw.polygon(surf, col_side, poly_l)
         pygame.draw.polygon(surf, col_side, poly_r)
 
-def draw_road(surf, dash_offset=0.0):
+class BackgroundCache:
+    """Sky once, terrain band once per stripe phase, per resolution.
+
+    Only the rows from ROAD_FAR_Y to ROAD_NEAR_Y (grass and sidewalks) change
+    with the phase. The sky above the band (and whatever is below it) is the
+    same in every phase, so those strips are kept once and only the band is
+    cached per phase. Everything is cut from full renders, so the result is
+    pixel-identical to render_background_and_terrain().
+    """
+    def __init__(self):
+        self.size = None
+        self.band = None
+        self.static = None
+        self.phases = {}
+
+    def get(self, size, t_scroll):
+        """(static strips as (surface, pos) pairs, terrain band, its position)."""
+        if size != self.size:
+            self.phases.clear()
+            self.size = size
+            w, h = size
+            top = max(0, int(ROAD_FAR_Y))
+            self.band = pygame.Rect(0, top, w, max(0, min(h, int(ROAD_NEAR_Y) + 1) - top))
+            self.static = None
+        phase = int(t_scroll * BG_PHASE_STEPS) % BG_PHASES
+        terrain = self.phases.get(phase)
+        if terrain is None:
+            full = pygame.Surface(size).convert()
+            # midden van de stap, zodat afronding nooit in de volgende fase valt
+            render_background_and_terrain(full, (phase + 0.5) / BG_PHASE_STEPS)
+            if self.static is None:
+                w, h = size
+                strips = [pygame.Rect(0, 0, w, self.band.top),
+                          pygame.Rect(0, self.band.bottom, w, h - self.band.bottom)]
+                self.static = [(full.subsurface(r).copy(), r.topleft) for r in strips if r.h > 0]
+            terrain = full.subsurface(self.band).copy()
+            self.phases[phase] = terrain
+        return self.static, terrain, self.band.topleft
+
+    def clear(self):
+        self.phases.clear()
+        self.static = None
+
+    def bytes(self):
+        surfs = list(self.phases.values()) + [s for s, _ in self.static or ()]
+        return sum(s.get_width() * s.get_height() * s.get_bytesize() for s in surfs)
+
+BACKGROUND_CACHE = BackgroundCache()
+
+def draw_background_and_terrain(surf, t_scroll):
+    static, terrain, pos = BACKGROUND_CACHE.get(surf.get_size(), t_scroll)
+    for strip, strip_pos in static:
+        surf.blit(strip, strip_pos)
+    surf.blit(terrain, pos)
+
+def render_road_static(surf):
+    """Asfalt, curbs en rijstrooklijnen: alles wat niet beweegt."""
     far_left = ROAD_CENTER_X - ROAD_FAR_W // 2
     far_right = ROAD_CENTER_X + ROAD_FAR_W // 2
     near_left = ROAD_CENTER_X - ROAD_NEAR_W // 2
@@ -533,11 +920,15 @@ def draw_road(surf, dash_offset=0.0):
         x_near = (ROAD_CENTER_X - ROAD_NEAR_W / 2) + near_lane_w * i
         pygame.draw.line(surf, (70, 70, 80), (x_far, ROAD_FAR_Y), (x_near, ROAD_NEAR_Y), 1)
 
+ROAD_DASH_COUNT = 12
+ROAD_DASH_PERIOD = 1.0 / ROAD_DASH_COUNT   # dash pattern repeats after this offset
+ROAD_DASH_PHASES = 32                      # pre-rendered offsets per period
 
-    dash_count = 12
+def render_road_dashes(surf, dash_offset, lanes=None):
+    dash_count = ROAD_DASH_COUNT
     dash_len = 0.45 / dash_count
 
-    for lane_i in range(1, LANES):
+    for lane_i in (lanes or range(1, LANES)):
         x_far  = (ROAD_CENTER_X - ROAD_FAR_W / 2)  + (ROAD_FAR_W  / LANES) * lane_i
         x_near = (ROAD_CENTER_X - ROAD_NEAR_W / 2) + (ROAD_NEAR_W / LANES) * lane_i
 
@@ -565,24 +956,84 @@ def draw_road(surf, dash_offset=0.0):
                 c = int(lerp(120, 255, p0))
                 pygame.draw.line(surf, (c, c, c), (x0, y0), (x1, y1), 3)
 
-# --- CLASSES ---
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x; self.y = y
-        self.size = random.randint(4, 8)
-        self.color = color; self.life = 20
-        self.vx = random.uniform(-1, 1); self.vy = random.uniform(2, 5)
+def render_road(surf, dash_offset=0.0):
+    render_road_static(surf)
+    render_road_dashes(surf, dash_offset)
 
-    def update(self):
-        self.x += self.vx; self.y += self.vy
-        self.life -= 1; self.size = max(0, self.size - 0.2)
+ROAD_COLORKEY = (255, 0, 255)
 
-    def draw(self, surf):
-        if self.life > 0 and self.size > 0:
-            s = pygame.Surface((int(self.size)*2, int(self.size)*2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, 150), (int(self.size), int(self.size)), int(self.size))
-            surf.blit(s, (int(self.x), int(self.y)))
+def bake_layer(size, render, bounds=None):
+    """Render into a colorkeyed scratch surface and crop it to `bounds`
+    (default: whatever was drawn, which costs a full-surface scan).
 
+    Returns (surface, topleft) or None when nothing was drawn."""
+    scratch = pygame.Surface(size).convert()
+    scratch.fill(ROAD_COLORKEY)
+    scratch.set_colorkey(ROAD_COLORKEY)
+    render(scratch)
+    if bounds is None:
+        bounds = scratch.get_bounding_rect()
+    else:
+        bounds = pygame.Rect(bounds).clip(scratch.get_rect())
+    if bounds.width == 0 or bounds.height == 0:
+        return None
+    layer = scratch.subsurface(bounds).copy()
+    layer.set_colorkey(ROAD_COLORKEY, pygame.RLEACCEL)
+    return layer, bounds.topleft
+
+def lane_line_bounds(lane_i, pad=0):
+    x_far  = (ROAD_CENTER_X - ROAD_FAR_W / 2)  + (ROAD_FAR_W  / LANES) * lane_i
+    x_near = (ROAD_CENTER_X - ROAD_NEAR_W / 2) + (ROAD_NEAR_W / LANES) * lane_i
+    left = int(min(x_far, x_near)) - pad
+    top = ROAD_FAR_Y - pad
+    return pygame.Rect(left, top, int(abs(x_far - x_near)) + 2 * pad + 1, ROAD_NEAR_Y - ROAD_FAR_Y + 2 * pad + 1)
+
+class RoadCache:
+    """Static road baked once; dashes pre-rendered per quantized offset."""
+    def __init__(self):
+        self.key = None
+        self.static = None
+        self.dashes = {}
+
+    def current_key(self, size):
+        return (size, ROAD_NEAR_Y, ROAD_FAR_Y, ROAD_NEAR_W, ROAD_FAR_W, ROAD_CENTER_X, LANES)
+
+    def layers(self, size, dash_offset):
+        key = self.current_key(size)
+        if key != self.key:
+            self.key = key
+            self.static = bake_layer(size, render_road_static)
+            self.dashes.clear()
+
+        phase = int((dash_offset % ROAD_DASH_PERIOD) / ROAD_DASH_PERIOD * ROAD_DASH_PHASES) % ROAD_DASH_PHASES
+        dashes = self.dashes.get(phase)
+        if dashes is None:
+            offset = phase * ROAD_DASH_PERIOD / ROAD_DASH_PHASES
+            # one cropped layer per lane line keeps the frames narrow
+            dashes = []
+            for lane_i in range(1, LANES):
+                layer = bake_layer(size, lambda s: render_road_dashes(s, offset, lanes=(lane_i,)),
+                                   bounds=lane_line_bounds(lane_i, pad=3))
+                if layer:
+                    dashes.append(layer)
+            self.dashes[phase] = dashes
+        return self.static, dashes
+
+    def clear(self):
+        self.key = None
+        self.static = None
+        self.dashes.clear()
+
+ROAD_CACHE = RoadCache()
+
+def draw_road(surf, dash_offset=0.0):
+    static, dashes = ROAD_CACHE.layers(surf.get_size(), dash_offset)
+    if static:
+        surf.blit(*static)
+    for layer in dashes:
+        surf.blit(*layer)
+
+# --- CLASSES ---
 class SideObject: 
     def __init__(self, side, z, kind="lamp", x_offset=0):
         self.side = side 
@@ -595,11 +1046,9 @@ class SideObject:
 
     def draw(self, surf):
         if self.z > 1.2: return 
-        y = y_from_z(self.z)
-        scale = lerp(0.22, 1.18, self.z)
+        y, scale, left_road, right_road, _ = PROJECTION.at(self.z)
         
         # Bereken basispositie (rand van de weg)
-        left_road, right_road = road_edges_at_y(y)
         road_width = right_road - left_road
         sidewalk_offset = road_width * 0.15 
         
@@ -667,29 +1116,16 @@ class Building:
         self.side = side 
         self.z = z
         self.layer = layer 
-        
-        size_mult = 1.0 if layer == 1 else 1.5
-        base_w = int(random.randint(100, 180) * size_mult)
-        base_h = int(random.randint(250, 500) * size_mult)
-        
-        self.original_image = generate_building_surface(base_w, base_h, side)
-        if self.layer == 2:
-            darkener = pygame.Surface((base_w, base_h), pygame.SRCALPHA)
-            darkener.fill((0, 0, 10, 100))
-            self.original_image.blit(darkener, (0,0))
-
-        self.base_w = base_w
-        self.base_h = base_h
+        # gedeelde facade uit de atlas: slot + tint i.p.v. een eigen surface
+        self.original_image, self.base_w, self.base_h, self.slot, self.tint = FACADE_ATLAS.pick(side, layer)
 
     def update(self, speed):
         self.z += speed
 
     def draw(self, surf):
-        y = y_from_z(self.z)
-        scale = lerp(0.22, 1.18, self.z)
+        y, scale, left_road, right_road, _ = PROJECTION.at(self.z)
         w = int(self.base_w * scale)
         h = int(self.base_h * scale)
-        left_road, right_road = road_edges_at_y(y)
 
         road_width = right_road - left_road
         sidewalk_width = road_width * 0.29
@@ -705,7 +1141,7 @@ class Building:
         sink_amount = int(h * 0.05)
         rect = pygame.Rect(int(x), int(y - h) + sink_amount, w, h)
         draw_shadow(surf, rect, alpha=100)
-        img = scale_cached(self.original_image, (w, h), SCALE_CACHE)
+        img = SPRITE_CACHE.scale(self.original_image, (w, h))
         surf.blit(img, rect.topleft)
 
 class Player:
@@ -729,9 +1165,10 @@ class Player:
         self.base_w = 80
         self.base_h = 110
         self.angle = 0
-        self.particles = []
+        self.particles = ParticleSystem()
 
-    def set_robot(self, on: bool):
+    def set_robot(self, on: bool, events=None):
+        """Switch robot mode; the reverse transform queues "transform" on `events`."""
         on = bool(on)
 
         if on:
@@ -756,8 +1193,8 @@ class Player:
                     self.robot_transforming = False
                     self.robot_reverting = True
                     self.robot_frame = float(len(self.transform_frames) - 1)
-                    if SOUND_TRANSFORM:
-                        SOUND_TRANSFORM.play()
+                    if events is not None:
+                        events.append("transform")
             else:
                 self.robot_mode = False
                 self.robot_transforming = False
@@ -800,12 +1237,11 @@ class Player:
         if boosting:
             rect = self.get_rect_no_rotate()
             p_color = (0, 255, 255) if random.random() < 0.5 else (255, 200, 50)
-            self.particles.append(Particle(rect.centerx + random.randint(-10, 10), rect.bottom - 10, p_color))
+            px = rect.centerx + random.randint(-10, 10)
+            self.particles.emit(px, rect.bottom - 10, p_color, random.randint(4, 8),
+                                random.uniform(-1, 1), random.uniform(2, 5), life=20)
 
-        for p in self.particles[:]:
-            p.update()
-            if p.life <= 0:
-                self.particles.remove(p)
+        self.particles.update()
 
         # ---- robot animation update ----
         if self.robot_mode:
@@ -831,13 +1267,13 @@ class Player:
 
 
     def get_rect_no_rotate(self):
-        y = y_from_z(self.z)
+        y, _, _, _, lane_xs = PROJECTION.at(self.z)
         if self.lane != self.target_lane:
-            x_from = lane_center_x_at_y(self.lane, y)
-            x_to = lane_center_x_at_y(self.target_lane, y)
+            x_from = lane_xs[self.lane]
+            x_to = lane_xs[self.target_lane]
             x = lerp(x_from, x_to, clamp(self.lane_blend, 0.0, 1.0))
         else:
-            x = lane_center_x_at_y(self.lane, y)
+            x = lane_xs[self.lane]
 
         scale = lerp(0.35, 1.12, self.z)
         w = int(self.base_w * scale)
@@ -851,8 +1287,7 @@ class Player:
         return self.get_rect_no_rotate()
 
     def draw(self, surf):
-        for p in self.particles:
-            p.draw(surf)
+        self.particles.draw(surf)
 
         r = self.get_rect_no_rotate()
         draw_shadow(surf, r)
@@ -873,13 +1308,13 @@ class Player:
                 robot_scale = 1.45
                 rw = int(r.w * robot_scale)
                 rh = int(r.h * robot_scale)
-                img = scale_cached(img0, (rw, rh), SCALE_CACHE)
+                img = scale_sprite(img0, (rw, rh))
                 dst = img.get_rect(midbottom=r.midbottom)
                 surf.blit(img, dst.topleft)
                 return
 
         # ---- normal car draw ----
-        img = scale_cached(self.original_image, (r.w, r.h), SCALE_CACHE)
+        img = SPRITE_CACHE.scale(self.original_image, (r.w, r.h))
         if abs(self.angle) > 1:
             img = pygame.transform.rotate(img, self.angle)
             new_rect = img.get_rect(center=r.center)
@@ -888,29 +1323,27 @@ class Player:
             surf.blit(img, r.topleft)
 
 
+OBSTACLE_KINDS = ("car", "roadblock", "cone")
+OBSTACLE_SIZES = {"car": (75, 145), "roadblock": (150, 65), "cone": (34, 34)}
+
 class Obstacle:
     def __init__(self, lane, z, kind="car", sprite=None):
         self.lane = lane; self.z = z; self.kind = kind; self.sprite = sprite
-        self.base_w = 75; self.base_h = 145
-        if kind == "roadblock": self.base_w = 150; self.base_h = 65
-        elif kind == "cone": self.base_w = 34; self.base_h = 34
+        self.base_w, self.base_h = OBSTACLE_SIZES[kind]
         self.hp = CAR_MAX_HP if kind == "car" else None
 
     def update(self, dz):
         self.z += dz
 
     def get_rect(self):
-        y = y_from_z(self.z)
-        scale = lerp(0.22, 1.18, self.z)
+        y, scale, left, right, lane_xs = PROJECTION.at(self.z)
         w = int(self.base_w * scale); h = int(self.base_h * scale)
         if self.kind == "roadblock":
-            x0 = lane_center_x_at_y(self.lane, y)
-            x1 = lane_center_x_at_y(self.lane + 1, y)
-            x = (x0 + x1) * 0.5
-            lane_w = (road_edges_at_y(y)[1] - road_edges_at_y(y)[0]) / LANES
+            x = (lane_xs[self.lane] + lane_xs[self.lane + 1]) * 0.5
+            lane_w = (right - left) / LANES
             w = int(lane_w * 2 * 0.95 * scale)
         else:
-            x = lane_center_x_at_y(self.lane, y)
+            x = lane_xs[self.lane]
         rect = pygame.Rect(0, 0, w, h); rect.center = (int(x), int(y - h * 0.10))
         return rect
 
@@ -920,8 +1353,8 @@ class Obstacle:
 
         if self.kind == "car":
             car_img = self.sprite if self.sprite else IMG_FALLBACK_ENEMY
-            img = scale_cached(car_img, (r.w, r.h), SCALE_CACHE)
-            surf.blit(img, r.topleft)
+            img = scale_sprite(car_img, (r.w, r.h))
+            surf.blit(img, img.get_rect(midbottom=r.midbottom).topleft)
 
             if self.hp is not None:
                 pct = clamp(self.hp / CAR_MAX_HP, 0.0, 1.0)
@@ -943,6 +1376,135 @@ class Obstacle:
             mid_rect = pygame.Rect(r.x + 2, r.y + r.h//3, r.w - 4, r.h//3)
             pygame.draw.rect(surf, (255, 255, 255), mid_rect)
 
+class ObstacleView(Obstacle):
+    """An Obstacle whose lane, z and hp live in a row of an ObstacleStore."""
+    def __init__(self, store, slot, kind, sprite):
+        self.store = store
+        self.slot = slot
+        self.kind = kind
+        self.sprite = sprite
+        self.base_w, self.base_h = OBSTACLE_SIZES[kind]
+
+    @property
+    def lane(self):
+        return int(self.store.lane[self.slot])
+
+    @property
+    def z(self):
+        return float(self.store.z[self.slot])
+
+    @z.setter
+    def z(self, value):
+        self.store.z[self.slot] = value
+
+    @property
+    def hp(self):
+        hp = int(self.store.hp[self.slot])
+        return None if hp < 0 else hp
+
+    @hp.setter
+    def hp(self, value):
+        self.store.hp[self.slot] = -1 if value is None else value
+
+class ObstacleStore:
+    """Struct-of-arrays obstacle storage.
+
+    lane, z, kind, hp and sprite index are NumPy arrays, so advancing,
+    culling and picking the collision window are one array operation each.
+    Iterating yields ObstacleView objects (one per row), so collision and
+    drawing code written for a list of Obstacles keeps working.
+    """
+    def __init__(self, capacity=64):
+        if np is None:
+            raise RuntimeError("ObstacleStore needs NumPy")
+        self.n = 0
+        self.lane = np.zeros(capacity, np.int32)
+        self.z = np.zeros(capacity, np.float64)
+        self.kind = np.zeros(capacity, np.int8)
+        self.hp = np.zeros(capacity, np.int32)
+        self.sprite = np.zeros(capacity, np.int32)
+        self.views = []
+
+    def arrays(self):
+        return (self.lane, self.z, self.kind, self.hp, self.sprite)
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def _grow(self):
+        capacity = 2 * len(self.z)
+        for name in ("lane", "z", "kind", "hp", "sprite"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def append(self, obs):
+        if self.n == len(self.z):
+            self._grow()
+        i = self.n
+        self.lane[i] = obs.lane
+        self.z[i] = obs.z
+        self.kind[i] = OBSTACLE_KINDS.index(obs.kind)
+        self.hp[i] = -1 if obs.hp is None else obs.hp
+        self.sprite[i] = IMG_ENEMIES.index(obs.sprite) if obs.sprite in IMG_ENEMIES else -1
+        self.views.append(ObstacleView(self, i, obs.kind, obs.sprite))
+        self.n += 1
+
+    def remove(self, view):
+        # rows after the slot move up one, so the order stays that of the list
+        # path (first hit in obstacle order, draw order of equal z)
+        i = view.slot
+        n = self.n
+        if i != n - 1:
+            for arr in self.arrays():
+                arr[i:n - 1] = arr[i + 1:n]
+        del self.views[i]
+        for slot in range(i, n - 1):
+            self.views[slot].slot = slot
+        self.n -= 1
+        view.store = None
+        view.slot = -1
+
+    def clear(self):
+        for view in self.views:
+            view.store = None
+            view.slot = -1
+        self.views = []
+        self.n = 0
+
+    def advance(self, dz):
+        self.z[:self.n] += dz
+
+    def cull_beyond(self, z_max):
+        """Drop every obstacle with z > z_max."""
+        keep = np.flatnonzero(self.z[:self.n] <= z_max)
+        if len(keep) == self.n:
+            return
+        for arr in self.arrays():
+            arr[:len(keep)] = arr[keep]
+        kept = set(keep.tolist())
+        for slot, view in enumerate(self.views):
+            if slot not in kept:
+                view.store = None
+                view.slot = -1
+        self.views = [self.views[i] for i in keep]
+        for slot, view in enumerate(self.views):
+            view.slot = slot
+        self.n = len(keep)
+
+    def in_window(self, z_min, z_max):
+        """Views with z_min < z < z_max."""
+        z = self.z[:self.n]
+        return [self.views[i] for i in np.flatnonzero((z > z_min) & (z < z_max))]
+
+    def in_draw_order(self):
+        order = np.argsort(-self.z[:self.n], kind="stable")
+        return [self.views[i] for i in order]
+
 class Bullet:
     def __init__(self, lane, z, robot=False):
         self.lane = lane
@@ -955,9 +1517,8 @@ class Bullet:
         self.z -= self.speed
 
     def get_pos(self):
-        y = y_from_z(self.z)
-        x = lane_center_x_at_y(self.lane, y)
-        return int(x), int(y)
+        y, _, _, _, lane_xs = PROJECTION.at(self.z)
+        return int(lane_xs[self.lane]), int(y)
 
     def get_rect(self):
         x, y = self.get_pos()
@@ -984,11 +1545,33 @@ class Explosion:
         scale = lerp(0.35, 1.35, self.z)
         w = max(2, int(img.get_width() * scale))
         h = max(2, int(img.get_height() * scale))
-        img_s = scale_cached(img, (w, h), SCALE_CACHE)
+        img_s = scale_sprite(img, (w, h))
         rect = img_s.get_rect(center=(self.x, self.y))
-        surf.blit(img_s, rect.topleft)
+        return surf.blit(img_s, rect.topleft)
     def done(self): return int(self.frame) >= len(EXPLOSION_FRAMES)
 
+# --- SPRITE LADDERS ---
+# Schaalbereik per soort sprite: wat draw() met z in [0, ~1.3] kan vragen.
+SPRITE_LADDERS = LadderSet(SPRITE_LADDER_RUNGS, SPRITE_LADDER_PREBUILD)
+
+def register_sprite_ladders():
+    for img in IMG_ENEMIES + [IMG_FALLBACK_ENEMY]:
+        SPRITE_LADDERS.add(img, OBSTACLE_SIZES["car"], 0.15, 1.6)
+    for frames in ROBOT_TRANSFORM_FRAMES_PER_CAR + ROBOT_RUN_FRAMES_PER_CAR:
+        for img in frames:
+            if img:
+                # Player.base_w/base_h * robot_scale
+                SPRITE_LADDERS.add(img, (80 * 1.45, 110 * 1.45), 0.35, 1.12)
+    for img in EXPLOSION_FRAMES:
+        SPRITE_LADDERS.add(img, img.get_size(), 0.35, 1.6)
+
+def scale_sprite(img, size):
+    """img at (about) size: nearest ladder rung, else via SPRITE_CACHE."""
+    ladder = SPRITE_LADDERS.get(img)
+    if ladder is not None:
+        return ladder.nearest(size)
+    return SPRITE_CACHE.scale(img, size)
+
 def choose_spawn_pattern(obstacles, z_spawn):
     occupied_lanes = []
     for o in obstacles:
@@ -1008,85 +1591,225 @@ def choose_spawn_pattern(obstacles, z_spawn):
         new_obs.append((l, kind))
     return new_obs
 
-def draw_boost_warp(surf, intensity, origin=None):
-    if intensity <= 0: return
-    w, h = surf.get_size()
-    if origin is None: origin = (w // 2, h // 2)
-    ox, oy = origin
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    n = int(10 + 22 * intensity)
-    max_len = int(140 + 220 * intensity)
-    base_alpha = int(18 + 55 * intensity)
-    for _ in range(n):
-        ang = random.uniform(-2.6, 2.6)
-        start_r = random.uniform(70, 160)
-        vx, vy = pygame.math.Vector2(1, 0).rotate_rad(ang)
-        x0 = ox + int(start_r * 1.15 * vx)
-        y0 = oy + int(start_r * 0.95 * vy)
-        end_r = start_r + random.uniform(max_len * 0.45, max_len)
-        x1 = ox + int(end_r * 1.20 * vx)
-        y1 = oy + int(end_r * 1.00 * vy)
-        x0 = clamp(x0, -80, w + 80); y0 = clamp(y0, -80, h + 80)
-        x1 = clamp(x1, -80, w + 80); y1 = clamp(y1, -80, h + 80)
-        thick = 1 if random.random() < 0.85 else 2
-        dist = max(1, ((x0 - ox) ** 2 + (y0 - oy) ** 2) ** 0.5)
-        fade = clamp(dist / 260.0, 0.25, 1.0)
-        a = int(base_alpha * fade)
-        col = (200, 255, 255, a)
-        pygame.draw.line(overlay, col, (x0, y0), (x1, y1), thick)
-    overlay.set_alpha(int(160 * intensity))
-    surf.blit(overlay, (0, 0))
+class BoostPostFX:
+    """Boost post-process (ghost trail, warp streaks, zoom) with reused buffers.
+
+    Quality tiers:
+      "high": ghost trail, warp streaks, smoothscale zoom
+      "low":  half the streaks, nearest-neighbour zoom, no ghost trail
+      "off":  the frame is shown as is
+
+    Intensity is rounded to `steps` levels. Per level the zoom crop rect and
+    `variants` streak patterns (origin-relative lines with their alpha) are
+    generated once; each frame draws one pattern into a reused overlay and
+    blits only the area the lines cover.
+    """
+    QUALITIES = ("off", "low", "high")
+    GHOST_SHIFT = 6
+    MAX_ZOOM = 0.06
+
+    def __init__(self, size, quality="high", steps=8, variants=8, seed=99):
+        self.size = size
+        self.steps = steps
+        self.variants = variants
+        self.rng = random.Random(seed)
+        self.patterns = {}
+        self.frame_no = 0
+        self.overlay = None
+        self.overlay_dirty = None
+        self.ghost = None
+        self.out = None
+        self.set_quality(quality)
+
+        w, h = size
+        self.crops = []
+        for i in range(steps + 1):
+            zoom = 1.0 + self.MAX_ZOOM * i / steps
+            cw, ch = round(w / zoom), round(h / zoom)
+            self.crops.append(pygame.Rect((w - cw) // 2, (h - ch) // 2, cw, ch))
+
+    def set_quality(self, quality):
+        if quality not in self.QUALITIES:
+            raise ValueError(f"boost quality must be one of {self.QUALITIES}, not {quality!r}")
+        self.quality = quality
+
+    def streak_pattern(self, step, variant):
+        """Lines (dx0, dy0, dx1, dy1, thickness, alpha) relative to the origin."""
+        key = (step, variant)
+        lines = self.patterns.get(key)
+        if lines is None:
+            rng = self.rng
+            intensity = step / self.steps
+            n = int(10 + 22 * intensity)
+            max_len = int(140 + 220 * intensity)
+            base_alpha = int(18 + 55 * intensity)
+            # overlay.set_alpha() van vroeger zit nu in de alpha van elke lijn
+            layer_alpha = int(160 * intensity)
+            lines = []
+            for _ in range(n):
+                ang = rng.uniform(-2.6, 2.6)
+                start_r = rng.uniform(70, 160)
+                vx, vy = pygame.math.Vector2(1, 0).rotate_rad(ang)
+                dx0 = int(start_r * 1.15 * vx)
+                dy0 = int(start_r * 0.95 * vy)
+                end_r = start_r + rng.uniform(max_len * 0.45, max_len)
+                dx1 = int(end_r * 1.20 * vx)
+                dy1 = int(end_r * 1.00 * vy)
+                thick = 1 if rng.random() < 0.85 else 2
+                dist = max(1, (dx0 ** 2 + dy0 ** 2) ** 0.5)
+                fade = clamp(dist / 260.0, 0.25, 1.0)
+                a = int(base_alpha * fade) * layer_alpha // 255
+                lines.append((dx0, dy0, dx1, dy1, thick, (200, 255, 255, a)))
+            self.patterns[key] = lines
+        return lines
+
+    def buffers(self, frame):
+        if self.out is None:
+            self.out = pygame.Surface(self.size).convert(frame)
+            self.ghost = pygame.Surface(self.size).convert(frame)
+            self.overlay = pygame.Surface(self.size, pygame.SRCALPHA)
+
+    def draw_streaks(self, frame, step, origin):
+        w, h = self.size
+        ox, oy = origin
+        lines = self.streak_pattern(step, self.frame_no % self.variants)
+        if self.quality == "low":
+            lines = lines[::2]
+
+        overlay = self.overlay
+        if self.overlay_dirty:
+            overlay.fill((0, 0, 0, 0), self.overlay_dirty)
+        dirty = None
+        for dx0, dy0, dx1, dy1, thick, col in lines:
+            x0 = clamp(ox + dx0, -80, w + 80); y0 = clamp(oy + dy0, -80, h + 80)
+            x1 = clamp(ox + dx1, -80, w + 80); y1 = clamp(oy + dy1, -80, h + 80)
+            r = pygame.draw.line(overlay, col, (x0, y0), (x1, y1), thick)
+            dirty = r if dirty is None else dirty.union(r)
+        self.overlay_dirty = dirty
+        if dirty:
+            frame.blit(overlay, dirty.topleft, dirty)
+
+    def apply(self, frame, intensity, origin=None):
+        """Post-process `frame` in place where possible; returns the surface to show."""
+        if self.quality == "off":
+            return frame
+        step = round(clamp(intensity, 0.0, 1.0) * self.steps)
+        if step == 0:
+            return frame
+        self.buffers(frame)
+        self.frame_no += 1
+        w, h = self.size
+
+        if self.quality == "high":
+            shift = self.GHOST_SHIFT
+            self.ghost.blit(frame, (0, shift))
+            self.ghost.set_alpha(int(60 + 90 * intensity))
+            frame.blit(self.ghost, (0, shift), (0, shift, w, h - shift))
+
+        if origin:
+            self.draw_streaks(frame, step, origin)
+
+        src = frame.subsurface(self.crops[step])
+        if self.quality == "high":
+            pygame.transform.smoothscale(src, self.size, self.out)
+        else:
+            pygame.transform.scale(src, self.size, self.out)
+        return self.out
+
+class InfoOverlay:
+    """The controls panel, rendered once into cached layers.
+
+    A black full-screen dim layer and the text panel (cropped to the text)
+    are rebuilt only when a gameplay constant they show changes; fading in
+    and out just sets their alpha.
+    """
+    DIM_ALPHA = 190
+
+    def __init__(self):
+        self.dim = None
+        self.panel = None
+        self.panel_pos = (0, 0)
+        self.key = None
+
+    @staticmethod
+    def shown_constants():
+        return (W, H, CAR_MAX_HP, MAG_SIZE, RELOAD_TIME, ROBOT_KILLS_TO_UNLOCK, ROBOT_DURATION_FRAMES)
+
+    def render(self):
+        self.dim = pygame.Surface((W, H)).convert()
+        self.dim.fill((0, 0, 0))
+        layer = pygame.Surface((W, H), pygame.SRCALPHA)
+
+        cx = W // 2
+        top = H // 2 - 240
+        draw_text_with_outline(layer, "CONTROLS", BIG_FONT, WHITE, (cx, top), center=True)
+
+        y = top + 80
+        reload_sec = RELOAD_TIME / 60.0
+        lines = [
+            ("Move left",  "LEFT / A"),
+            ("Move right", "RIGHT / D"),
+            ("Boost",      "UP / W"),
+            ("Brake",      "DOWN / S"),
+            ("Shoot",      "SPACE"),
+            ("Pause",      "ESC"),
+            ("Info",       "I"),
+            ("Quit",       "Q"),
+            ("Restart (crash)", "R"),
+            ("", ""),
+            ("Gameplay", ""),
+            ("Enemy car HP", f"{CAR_MAX_HP} hits (1 hit in ROBOT)"),
+            ("Magazine size", f"{MAG_SIZE} shots"),
+            ("Reload time", f"{reload_sec:.1f}s"),
+            ("Robot unlock", f"{ROBOT_KILLS_TO_UNLOCK} car kills"),
+            ("Robot duration", f"{ROBOT_DURATION_FRAMES/60:.1f}s"),
+            ("Robot contact", "Destroys obstacles"),
+        ]
+
+        lx = cx - 300
+        rx = cx + 60
+
+        for left, right in lines:
+            if left == "" and right == "":
+                y += 16
+                continue
+            if right == "" and left != "":
+                draw_text_with_outline(layer, left, KEY_FONT, NEON_CYAN, (lx, y))
+                y += 34
+                continue
+            draw_text_with_outline(layer, left, FONT, WHITE, (lx, y))
+            draw_text_with_outline(layer, right, KEY_FONT, WHITE, (rx, y))
+            y += 30
+
+        bounds = layer.get_bounding_rect()
+        self.panel = unpremultiply(layer.subsurface(bounds).copy())
+        self.panel_pos = bounds.topleft
+
+    def draw(self, target_surf, alpha):
+        key = self.shown_constants()
+        if key != self.key:
+            self.render()
+            self.key = key
+        self.dim.set_alpha(int(self.DIM_ALPHA * (alpha / 255.0)))
+        target_surf.blit(self.dim, (0, 0))
+        self.panel.set_alpha(alpha)
+        target_surf.blit(self.panel, self.panel_pos)
+
+INFO_OVERLAY = InfoOverlay()
+BOOST_FX = BoostPostFX((W, H), BOOST_FX_QUALITY)
+
+PROFILE_PHASES = ("events", "sim", "background", "buildings", "road", "entities", "hud", "boost", "profiler", "present")
+PROFILER = FrameProfiler(PROFILE_PHASES, SMALL_FONT, csv_dir=PROFILE_DIR)
+PROFILER_POS = (W - PROFILER.history - 10, 80)
+if FRAME_PROFILER:
+    PROFILER.enable()
+atexit.register(PROFILER.disable)
 
 def draw_info_overlay(target_surf, info_alpha, started, alive, paused, counting_down, ammo, reloading,
                       kills, robot_ready, robot_active, robot_timer):
     if info_alpha <= 1:
         return
-    a = int(info_alpha)
-    overlay = pygame.Surface((W, H), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, int(190 * (a / 255.0))))
-    target_surf.blit(overlay, (0, 0))
-
-    cx = W // 2
-    top = H // 2 - 240
-    draw_text_with_outline(target_surf, "CONTROLS", BIG_FONT, WHITE, (cx, top), center=True)
-
-    y = top + 80
-    reload_sec = RELOAD_TIME / 60.0
-    lines = [
-        ("Move left",  "LEFT / A"),
-        ("Move right", "RIGHT / D"),
-        ("Boost",      "UP / W"),
-        ("Brake",      "DOWN / S"),
-        ("Shoot",      "SPACE"),
-        ("Pause",      "ESC"),
-        ("Info",       "I"),
-        ("Quit",       "Q"),
-        ("Restart (crash)", "R"),
-        ("", ""),
-        ("Gameplay", ""),
-        ("Enemy car HP", f"{CAR_MAX_HP} hits (1 hit in ROBOT)"),
-        ("Magazine size", f"{MAG_SIZE} shots"),
-        ("Reload time", f"{reload_sec:.1f}s"),
-        ("Robot unlock", f"{ROBOT_KILLS_TO_UNLOCK} car kills"),
-        ("Robot duration", f"{ROBOT_DURATION_FRAMES/60:.1f}s"),
-        ("Robot contact", "Destroys obstacles"),
-    ]
-
-    lx = cx - 300
-    rx = cx + 60
-    key_font = pygame.font.SysFont("Arial", 22, bold=True)
-
-    for left, right in lines:
-        if left == "" and right == "":
-            y += 16
-            continue
-        if right == "" and left != "":
-            draw_text_with_outline(target_surf, left, key_font, NEON_CYAN, (lx, y))
-            y += 34
-            continue
-        draw_text_with_outline(target_surf, left, FONT, WHITE, (lx, y))
-        draw_text_with_outline(target_surf, right, key_font, WHITE, (rx, y))
-        y += 30
+    INFO_OVERLAY.draw(target_surf, int(info_alpha))
 
     status = []
     if not started:
@@ -1120,23 +1843,23 @@ def draw_ammo_hud(frame, ammo, reloading, robot_ready, robot_active, robot_timer
     hud_x, hud_y = 20, 92
 
     if robot_active:
-        draw_text_with_outline(frame, f"ROBOT MODE: {robot_timer//60 + 1}s", FONT, NEON_CYAN, (hud_x, hud_y))
+        drawn = [draw_text_with_outline(frame, f"ROBOT MODE: {robot_timer//60 + 1}s", FONT, NEON_CYAN, (hud_x, hud_y))]
         hud_y += 28
     elif robot_ready:
-        draw_text_with_outline(frame, "ROBOT READY!", FONT, NEON_CYAN, (hud_x, hud_y))
+        drawn = [draw_text_with_outline(frame, "ROBOT READY!", FONT, NEON_CYAN, (hud_x, hud_y))]
         hud_y += 28
     else:
-        draw_text_with_outline(frame, f"ROBOT: {kills}/{ROBOT_KILLS_TO_UNLOCK}", SMALL_FONT, (200, 200, 200), (hud_x, hud_y))
+        drawn = [draw_text_with_outline(frame, f"ROBOT: {kills}/{ROBOT_KILLS_TO_UNLOCK}", SMALL_FONT, (200, 200, 200), (hud_x, hud_y))]
         hud_y += 20
 
     if reloading:
-        draw_text_with_outline(frame, "RELOADING...", FONT, NEON_RED, (hud_x, hud_y))
+        drawn.append(draw_text_with_outline(frame, "RELOADING...", FONT, NEON_RED, (hud_x, hud_y)))
         hud_y += 28
 
     icon_h = 38
     icon_w = int(MAG_ICON.get_width() * (icon_h / max(1, MAG_ICON.get_height())))
-    mag_icon_s = scale_cached(MAG_ICON, (icon_w, icon_h), SCALE_CACHE)
-    frame.blit(mag_icon_s, (hud_x, hud_y))
+    mag_icon_s = SPRITE_CACHE.scale(MAG_ICON, (icon_w, icon_h))
+    drawn.append(frame.blit(mag_icon_s, (hud_x, hud_y)))
 
     pip_x = hud_x + icon_w + 12
     pip_y = hud_y + 8
@@ -1144,70 +1867,595 @@ def draw_ammo_hud(frame, ammo, reloading, robot_ready, robot_active, robot_timer
     for i in range(MAG_SIZE):
         x = pip_x + i * (pip_w + pip_gap)
         col = NEON_CYAN if i < ammo else (60, 60, 70)
-        pygame.draw.rect(frame, col, (x, pip_y, pip_w, pip_h), border_radius=3)
+        drawn.append(pygame.draw.rect(frame, col, (x, pip_y, pip_w, pip_h), border_radius=3))
+    return drawn[0].unionall(drawn[1:])
+
+# --- SIMULATION ---
+SIM_DT_MS = 1000.0 / 60.0   # one fixed simulation step = one frame at 60 fps
+
+class FrameInput:
+    """Input for one simulation step: held keys plus one-shot key presses."""
+    def __init__(self, boost=False, brake=False, left=False, right=False, shoot=False):
+        self.boost = boost
+        self.brake = brake
+        self.left = left
+        self.right = right
+        self.shoot = shoot
+
+def bullet_lane_corridors(z_near=1.0):
+    """x-range every bullet of a lane can occupy, over all z it can reach."""
+    pad = Bullet(0, 0, robot=True).radius + 2 + 1
+    far = PROJECTION.exact(0.0)[4]
+    near = PROJECTION.exact(z_near)[4]
+    return [(min(far[i], near[i]) - pad, max(far[i], near[i]) + pad) for i in range(LANES)]
+
+class LaneBroadPhase:
+    """Bullet vs. obstacle candidates, bucketed per lane and sorted by depth.
+
+    Each obstacle rect is built once. An obstacle goes into every lane whose
+    bullet corridor its rect overlaps (a roadblock ends up in two or three),
+    and each bucket is sorted on rect.bottom. A bullet then only tests the
+    rects in its own lane with bottom in (bullet.top, bullet.bottom + the
+    tallest rect in that lane): exactly the ones that can overlap it. When a
+    bullet overlaps several, the first in obstacle order wins, like the old
+    all-pairs loop.
+    """
+    def __init__(self, obstacles, corridors):
+        buckets = [[] for _ in range(LANES)]
+        for order, obs in enumerate(obstacles):
+            rect = obs.get_rect()
+            entry = (rect.bottom, order, obs, rect)
+            for lane, (lo, hi) in enumerate(corridors):
+                if rect.right > lo and rect.left < hi:
+                    buckets[lane].append(entry)
+        for bucket in buckets:
+            bucket.sort(key=lambda e: e[0])
+        self.buckets = buckets
+        self.bottoms = [[e[0] for e in bucket] for bucket in buckets]
+        self.max_h = [max((e[3].height for e in bucket), default=0) for bucket in buckets]
+        self.dead = set()
+        self.tests = 0
+
+    def first_hit(self, brect, lane):
+        """(order, obstacle, rect) of the obstacle this bullet hits, or None."""
+        bottoms = self.bottoms[lane]
+        lo = bisect_right(bottoms, brect.top)
+        hi = bisect_left(bottoms, brect.bottom + self.max_h[lane])
+        best = None
+        for _, order, obs, rect in self.buckets[lane][lo:hi]:
+            if order in self.dead or (best is not None and order > best[0]):
+                continue
+            self.tests += 1
+            if brect.colliderect(rect):
+                best = (order, obs, rect)
+        return best
+
+    def discard(self, order):
+        self.dead.add(order)
+
+def use_broad_phase(n_bullets, n_obstacles):
+    """Whether LaneBroadPhase beats first_hit_all_pairs for this many bullets and obstacles.
+
+    The broad phase builds every obstacle rect up front; the all-pairs loop
+    only builds rects until a bullet hits something. With one or two bullets,
+    or many obstacles per bullet, that early exit wins.
+    """
+    return (n_bullets >= BROAD_PHASE_MIN_BULLETS
+            and n_obstacles <= BROAD_PHASE_MAX_OBSTACLES_PER_BULLET * n_bullets)
+
+def first_hit_all_pairs(obstacles, brect):
+    """(obstacle, rect) of the first obstacle in order that `brect` overlaps, or None."""
+    for obs in obstacles:
+        rect = obs.get_rect()
+        if brect.colliderect(rect):
+            return obs, rect
+    return None
+
+class World:
+    """All gameplay state of one run, advanced with a fixed step.
+
+    step() never draws and never plays audio: things the player should hear
+    are queued as event names ("shoot", "explosion", "crash", ...) that the
+    caller drains with take_events(). This keeps the simulation usable under
+    the SDL dummy driver for benchmarks and balancing runs (see simulate.py).
+    """
+    def __init__(self, array_obstacles=False):
+        self.player = None
+        self.obstacles = ObstacleStore() if array_obstacles else []
+        self.buildings = []
+        self.bullets = []
+        self.explosions = []
+        self.events = []
+        self.shake_frames = 0
+        self.shake_strength = 0
+        self.enemy_cycle_i = 0
+        self.frame_count = 0
+        self.car_idx = None
+        self.start_frame = 0
+        self.bullet_corridors = bullet_lane_corridors()
+        self.reset_run()
+
+    def reset_run(self):
+        self.score = 0
+        self.last_score = 0
+        self.alive = True
+        self.counting_down = False
+        self.countdown_timer = 0
+        self.countdown_stage = 3
+
+        self.base_speed = 0.0015
+        self.speed_ramp = 0.0000002
+        self.speed = self.base_speed
+        self.dash_offset = 0.0
+        self.spawn_progress = 0.0
+        self.lantern_spawn_progress = 0.0
+        self.building_spawn_progress = 0.0
+        self.spawn_threshold = 0.45
+
+        self.shoot_cooldown = 0
+        self.ammo = MAG_SIZE
+        self.reloading = False
+        self.reload_timer = 0
+
+        self.kills = 0          # telt naar de robot, wordt dan weer 0
+        self.run_kills = 0      # alle vernietigde obstakels deze run
+        self.robot_ready = False
+        self.robot_active = False
+        self.robot_timer = 0
+        self.prev_robot_active = False
+
+        self.bullets.clear()
+        self.explosions.clear()
+        self.obstacles.clear()
+        self.buildings.clear()
+
+    def start(self, car_idx):
+        """Reset the run, create the player and start the countdown."""
+        load_race_assets()
+        self.reset_run()
+        self.car_idx = car_idx
+        self.start_frame = self.frame_count
+        self.player = Player(
+            PLAYER_DRIVE_SPRITES[car_idx],
+            ROBOT_TRANSFORM_FRAMES_PER_CAR[car_idx],
+            ROBOT_RUN_FRAMES_PER_CAR[car_idx],
+        )
+        self.counting_down = True
+        self.countdown_stage = 3
+        self.countdown_timer = 60
+        self.events.append("beep")
+
+    def run_seconds(self):
+        """Simulated time since start() (countdown included)."""
+        return (self.frame_count - self.start_frame) * SIM_DT_MS / 1000.0
+
+    @property
+    def racing(self):
+        return self.player is not None and self.alive and not self.counting_down
+
+    def take_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+    def start_shake(self, frames, strength):
+        self.shake_frames = max(self.shake_frames, frames)
+        self.shake_strength = max(self.shake_strength, strength)
+
+    def next_shake_offset(self):
+        """Camera offset for the next rendered frame (ticks the shake down)."""
+        if self.shake_frames <= 0:
+            return 0, 0
+        dx = random.randint(-self.shake_strength, self.shake_strength)
+        dy = random.randint(-self.shake_strength, self.shake_strength)
+        self.shake_frames -= 1
+        if self.shake_frames <= 0:
+            self.shake_strength = 0
+        return dx, dy
+
+    def spawn_explosion_at_rect(self, r, z):
+        self.explosions.append(Explosion(r.centerx, r.centery, z))
+        self.events.append("explosion")
+        self.start_shake(10, 7)
+
+    def try_shoot(self):
+        # Shoot (robot fires faster; robot bullets one-shot cars)
+        if self.reloading or self.ammo <= 0 or self.shoot_cooldown > 0:
+            return
+        self.bullets.append(Bullet(self.player.lane, self.player.z - 0.08, robot=self.robot_active))
+        self.shoot_cooldown = ROBOT_SHOOT_COOLDOWN if self.robot_active else NORMAL_SHOOT_COOLDOWN
+        self.ammo -= 1
+        self.events.append("shoot")
+        if self.ammo <= 0:
+            self.reloading = True
+            self.reload_timer = RELOAD_TIME
+
+    def step(self, inputs):
+        """Advance the run by one fixed frame of SIM_DT_MS."""
+        self.frame_count += 1
+        player = self.player
+
+        if self.racing:
+            if inputs.left:
+                player.move_left()
+            if inputs.right:
+                player.move_right()
+            if inputs.shoot:
+                self.try_shoot()
+
+        self.tick_shoot_cooldown()
+
+        if player is None or not self.alive:
+            self.update_explosions()
+            return
+
+        if not self.counting_down:
+            if self.reloading:
+                self.reload_timer -= 1
+                if self.reload_timer <= 0:
+                    self.reloading = False
+                    self.ammo = MAG_SIZE
+
+            if self.robot_active:
+                self.robot_timer -= 1
+                if self.robot_timer <= 0:
+                    self.robot_active = False
+                    self.robot_timer = 0
+
+        if self.robot_active and not self.prev_robot_active:
+            player.start_robot_transform()   # plays transform then runs
+        player.set_robot(self.robot_active, self.events)
+        self.prev_robot_active = self.robot_active
+
+        if self.counting_down:
+            self.update_countdown()
+        else:
+            self.update_race(inputs)
+
+    def tick_shoot_cooldown(self):
+        """Count the shot cooldown down one frame; also runs while paused and in the menu."""
+        if self.shoot_cooldown > 0:
+            self.shoot_cooldown -= 1
+
+    def update_countdown(self):
+        self.countdown_timer -= 1
+        if self.countdown_timer <= 0:
+            self.countdown_stage -= 1
+            self.countdown_timer = 60
+
+            if self.countdown_stage in (2, 1):
+                self.events.append("beep")
+            elif self.countdown_stage == 0:
+                self.events.append("go")
+
+        if self.countdown_stage < 0:
+            self.counting_down = False
+
+    def update_race(self, inputs):
+        boosting = inputs.boost
+        braking = inputs.brake
+        base_speed = self.base_speed
+        target_speed = base_speed * 1.5 if boosting else (base_speed * 0.7 if braking else base_speed)
+        self.speed = lerp(self.speed, target_speed, 0.1)
+
+        self.player.update(boosting)
+
+        self.score += 1 + int(self.speed * 1000)
+        self.base_speed += self.speed_ramp * SIM_DT_MS
+
+        self.spawn_obstacles()
+        self.spawn_side_objects()
+        self.spawn_buildings()
+
+        speed = self.speed
+        for b in self.buildings[:]:
+            b.update(speed)
+            if b.z > 1.3:
+                self.buildings.remove(b)
+
+        self.update_obstacles()
+        self.update_bullets()
+        self.update_explosions()
+
+        self.dash_offset = (self.dash_offset + speed * 2.0) % 1.0
+
+    def spawn_obstacles(self):
+        self.spawn_progress += self.speed
+        if self.spawn_progress > self.spawn_threshold:
+            self.spawn_progress = 0
+            z_spawn = Z_SPAWN_MIN
+            pattern = choose_spawn_pattern(self.obstacles, z_spawn)
+            for lane, kind in pattern:
+                sprite = None
+                if kind == "car":
+                    sprite = IMG_ENEMIES[self.enemy_cycle_i]
+                    self.enemy_cycle_i = (self.enemy_cycle_i + 1) % len(IMG_ENEMIES)
+                self.obstacles.append(Obstacle(lane, z_spawn, kind, sprite))
+
+    def spawn_side_objects(self):
+        # --- AANGEPASTE SIDEWALK SPAWN MET VAST PATROON ---
+        self.lantern_spawn_progress += self.speed
+        if self.lantern_spawn_progress > 0.30:
+            self.lantern_spawn_progress = 0
+            buildings = self.buildings
+
+            buildings.append(SideObject(-1, Z_SPAWN_MIN, kind="lamp"))
+            buildings.append(SideObject(1, Z_SPAWN_MIN, kind="lamp"))
+
+            if random.random() < 0.3:
+                buildings.append(SideObject(-1, Z_SPAWN_MIN + 0.005, kind="bin", x_offset=15))
+
+            if random.random() < 0.3:
+                buildings.append(SideObject(1, Z_SPAWN_MIN + 0.005, kind="bin", x_offset=-15))
+
+    def spawn_buildings(self):
+        # --- AANGEPASTE BUILDING SPAWN LOGICA ---
+        self.building_spawn_progress += self.speed
+        if self.building_spawn_progress <= 0.01:
+            return
+        self.building_spawn_progress = 0
+        buildings = self.buildings
+
+        # --- EERSTE LAAG (Dicht op de weg) ---
+        if not any(isinstance(b, Building) and b.layer == 1 and b.side == -1 and abs(b.z - Z_SPAWN_MIN) < 0.08 for b in buildings):
+            buildings.append(Building(-1, Z_SPAWN_MIN, layer=1))
+
+        if not any(isinstance(b, Building) and b.layer == 1 and b.side == 1 and abs(b.z - Z_SPAWN_MIN) < 0.08 for b in buildings):
+            buildings.append(Building(1, Z_SPAWN_MIN, layer=1))
+
+        # --- TWEEDE LAAG (Achtergrond, optioneel 'vol' maken) ---
+        if random.random() < 0.6:
+            if not any(isinstance(b, Building) and b.layer == 2 and b.side == -1 and abs(b.z - Z_SPAWN_MIN) < 0.15 for b in buildings):
+                buildings.append(Building(-1, Z_SPAWN_MIN, layer=2))
+            if not any(isinstance(b, Building) and b.layer == 2 and b.side == 1 and abs(b.z - Z_SPAWN_MIN) < 0.15 for b in buildings):
+                buildings.append(Building(1, Z_SPAWN_MIN, layer=2))
+
+    def update_obstacles(self):
+        player = self.player
+        p_rect = player.get_rect()
+        obstacles = self.obstacles
+        if isinstance(obstacles, ObstacleStore):
+            obstacles.advance(self.speed)
+            obstacles.cull_beyond(1.3)
+            candidates = obstacles.in_window(0.85, 1.0)
+        else:
+            for obs in obstacles:
+                obs.update(self.speed)
+            obstacles[:] = [obs for obs in obstacles if obs.z <= 1.3]
+            candidates = [obs for obs in obstacles if 0.85 < obs.z < 1.0]
+
+        for obs in candidates:
+            o_rect = obs.get_rect()
+            hitbox = o_rect.inflate(-15, -15)
+            if p_rect.colliderect(hitbox):
+                if self.robot_active:
+                    # ROBOT: destroy obstacles on contact
+                    self.spawn_explosion_at_rect(o_rect, obs.z)
+                    self.run_kills += 1
+                    if obs.kind == "car":
+                        self.score += ROBOT_CONTACT_SCORE_CAR
+                    else:
+                        self.score += ROBOT_CONTACT_SCORE_OTHER
+                    obstacles.remove(obs)
+                    # small impact shake
+                    self.start_shake(12, 8)
+                else:
+                    # NORMAL: crash
+                    self.alive = False
+                    self.last_score = self.score
+                    self.events.append("crash")
+                    self.explosions.append(Explosion(p_rect.centerx, p_rect.centery, player.z))
+                    self.start_shake(22, 10)
+
+    def obstacles_in_draw_order(self):
+        if isinstance(self.obstacles, ObstacleStore):
+            return self.obstacles.in_draw_order()
+        self.obstacles.sort(key=lambda o: -o.z)
+        return self.obstacles
+
+    def update_bullets(self):
+        for blt in self.bullets:
+            blt.update()
+        bullets = [blt for blt in self.bullets if blt.z >= 0.02]
+        if bullets and len(self.obstacles):
+            remaining = []
+            if use_broad_phase(len(bullets), len(self.obstacles)):
+                broad = LaneBroadPhase(self.obstacles, self.bullet_corridors)
+                for blt in bullets:
+                    hit = broad.first_hit(blt.get_rect(), blt.lane)
+                    if hit is None:
+                        remaining.append(blt)
+                        continue
+                    order, obs, orect = hit
+                    if self.hit_obstacle(obs, orect, blt.robot):
+                        broad.discard(order)
+            else:
+                for blt in bullets:
+                    hit = first_hit_all_pairs(self.obstacles, blt.get_rect())
+                    if hit is None:
+                        remaining.append(blt)
+                        continue
+                    self.hit_obstacle(hit[0], hit[1], blt.robot)
+            bullets = remaining
+        self.bullets[:] = bullets
+
+    def hit_obstacle(self, obs, orect, robot_bullet):
+        """Apply a bullet hit; returns True when the obstacle was destroyed."""
+        if obs.kind == "car":
+            if robot_bullet:
+                obs.hp = 0
+            else:
+                obs.hp -= 1
+
+            self.score += 40
+
+            if obs.hp <= 0:
+                if not self.robot_active:
+                    self.kills += 1
+                self.run_kills += 1
+                self.events.append("explosion")
+                self.explosions.append(Explosion(orect.centerx, orect.centery, obs.z))
+                self.start_shake(12, 7)
+                self.obstacles.remove(obs)
+                self.score += 300
+
+                if (not self.robot_ready) and (self.kills >= ROBOT_KILLS_TO_UNLOCK) and (not self.robot_active):
+                    self.robot_ready = True
+                    self.robot_active = True
+                    self.robot_timer = ROBOT_DURATION_FRAMES
+                    self.kills = 0
+                    self.events.append("transform")
+                    self.robot_ready = False
+                return True
+            return False
+        else:
+            self.events.append("explosion")
+            self.explosions.append(Explosion(orect.centerx, orect.centery, obs.z))
+            self.start_shake(8, 5)
+            self.obstacles.remove(obs)
+            self.score += 100
+            return True
+
+    def update_explosions(self):
+        for ex in self.explosions[:]:
+            ex.update()
+            if ex.done():
+                self.explosions.remove(ex)
+
+# --- AUDIO ---
+def play_world_events(events):
+    """Play the sounds for the events a World.step() queued."""
+    for name in events:
+        if name == "crash":
+            AUDIO.set_loop("engine", None)
+            name = "explosion"
+        AUDIO.play(name, SOUNDS.get(name))
+
+def load_race_assets():
+    """Collect the "race" group (blocks until it is loaded).
+
+    Called when a race starts; the menu calls it earlier once the group is
+    ready, so starting a race normally does not wait. Sounds do not block:
+    see collect_sounds().
+    """
+    global PLAYER_DRIVE_SPRITES, IMG_ENEMIES, IMG_FALLBACK_ENEMY, MAG_ICON, IMG_SKYLINE
+    global ROBOT_TRANSFORM_FRAMES_PER_CAR, ROBOT_RUN_FRAMES_PER_CAR, EXPLOSION_FRAMES
+    global RACE_ASSETS_READY
+    if RACE_ASSETS_READY:
+        return
+    ASSETS.wait("race")
+    with ASSETS.timed("finish"):
+        jobs = _race_jobs
+        PLAYER_DRIVE_SPRITES = [job.result() for job in jobs["drive"]]
+        IMG_ENEMIES = [job.result() for job in jobs["enemies"]]
+        IMG_FALLBACK_ENEMY = jobs["fallback"].result()
+        MAG_ICON = jobs["mag"].result()
+        IMG_SKYLINE = jobs["skyline"].result()
+        EXPLOSION_FRAMES = [job.result() for job in jobs["explosion"]]
+        ROBOT_TRANSFORM_FRAMES_PER_CAR = [[job.result() for job in car] for car in jobs["transform"]]
+        ROBOT_RUN_FRAMES_PER_CAR = [[job.result() for job in car] for car in jobs["run"]]
+
+        register_sprite_ladders()
+        BACKGROUND_CACHE.clear()
+    RACE_ASSETS_READY = True
+    collect_sounds()
+
+def collect_sounds():
+    """Take over the sound effects that have finished decoding (never blocks)."""
+    if len(SOUNDS) == len(_sound_jobs):
+        return
+    for name, job in _sound_jobs.items():
+        if name not in SOUNDS and job.done():
+            SOUNDS[name] = job.result()
+
+def poll_race_assets():
+    """Per frame from main(): collect race assets and sounds once they are loaded."""
+    global STARTUP_REPORTED
+    if not RACE_ASSETS_READY and ASSETS.ready("race"):
+        load_race_assets()
+    collect_sounds()
+    if RACE_ASSETS_READY and ASSETS.ready("sound") and STARTUP_PROFILE and not STARTUP_REPORTED:
+        STARTUP_REPORTED = True
+        print(ASSETS.format_report())
+
+def update_engine_sounds(boosting, robot_active):
+    """Engine loop for this frame: car engine while boosting, robot engine in robot mode.
+
+    AUDIO.set_loop() only touches the mixer when the loop actually changes.
+    """
+    if not boosting:
+        AUDIO.set_loop("engine", None)
+    elif robot_active:
+        AUDIO.set_loop("engine", SOUNDS.get("robot_engine"))
+    else:
+        AUDIO.set_loop("engine", SOUNDS.get("engine"))
 
 # --- MAIN ---
-def main():
-    bullets = []
-    explosions = []
-    shake_frames = 0
-    shake_strength = 0
+def draw_world(frame, world):
+    """Background, road and every entity of `world`, back to front.
+
+    Returns the rects of the explosions, which keep animating while the road
+    stands still (pause, crash screen).
+    """
+    draw_background_and_terrain(frame, world.dash_offset)
+    PROFILER.mark("background")
+
+    world.buildings.sort(key=lambda b: b.z)
+    for b in world.buildings:
+        b.draw(frame)
+    PROFILER.mark("buildings")
+
+    draw_road(frame, world.dash_offset)
+    PROFILER.mark("road")
+
+    for obs in world.obstacles_in_draw_order():
+        obs.draw(frame)
+
+    for blt in world.bullets:
+        blt.draw(frame)
+
+    if world.player:
+        world.player.draw(frame)
 
-    def start_shake(frames, strength):
-        nonlocal shake_frames, shake_strength
-        shake_frames = max(shake_frames, frames)
-        shake_strength = max(shake_strength, strength)
+    rects = [r for r in (ex.draw(frame) for ex in world.explosions) if r]
+    PROFILER.mark("entities")
+    return rects
 
-    player = None
+def draw_hud(frame, world):
+    """Score, speed bar, robot status and ammo; returns the rect they cover."""
+    rect = draw_score(frame, world.score)
+    speed_pct = min(1.0, (world.speed / 0.01))
+    rect.union_ip(pygame.draw.rect(frame, (50, 50, 50), (20, 60, 200, 20), border_radius=5))
+    pygame.draw.rect(frame, NEON_CYAN, (20, 60, int(200 * speed_pct), 20), border_radius=5)
+    rect.union_ip(draw_text_with_outline(frame, "SPEED", SMALL_FONT, WHITE, (25, 62)))
+
+    rect.union_ip(draw_ammo_hud(frame, world.ammo, world.reloading, world.robot_ready, world.robot_active,
+                                world.robot_timer, world.kills))
+    return rect
+
+def main():
+    global _presenter, _scheduler
+    world = World(array_obstacles=ARRAY_OBSTACLES)
+    # opened now, so the best scores are loaded long before the first crash
+    leaderboard = get_leaderboard()
     selected_car_idx = 0
-    obstacles = []
-    buildings = [] 
-    
-    score = 0
-    last_score = 0
-    alive = True
-    paused = False
+    FACADE_ATLAS.start()
+
     started = False
-    counting_down = False
-    countdown_timer = 0
-    countdown_stage = 3
-    base_speed = 0.0015
-    speed_ramp = 0.0000002
-    speed = base_speed
-    dash_offset = 0.0
-    spawn_progress = 0.0
-    lantern_spawn_progress = 0.0
-    building_spawn_progress = 0.0
-    spawn_threshold = 0.45
-
-    shoot_cooldown = 0
-    ammo = MAG_SIZE
-    reloading = False
-    reload_timer = 0
+    paused = False
+
     show_info = False
     info_alpha = 0.0
     INFO_FADE_SPEED = 900.0
-    
+
     score_saved = False
     high_scores = []
 
-    kills = 0
-    robot_ready = False
-    robot_active = False
-    robot_timer = 0
-    prev_robot_active = False
-
     def toggle_info(open_it=None):
         nonlocal show_info
         if open_it is None: show_info = not show_info
         else: show_info = bool(open_it)
 
-    def spawn_explosion_at_rect(r, z):
-        explosions.append(Explosion(r.centerx, r.centery, z))
-        if SOUND_EXPLOSION:
-            SOUND_EXPLOSION.play()
-        start_shake(10, 7)
-
     if os.path.exists(MUSIC_PATH):
         try:
             pygame.mixer.music.load(MUSIC_PATH)
@@ -1216,7 +2464,6 @@ def main():
         except:
             pass
 
-    enemy_cycle_i = 0
     btn_w, btn_h = 200, 50
     center_x = W // 2 - btn_w // 2
     car_card_w, car_card_h = 100, 140
@@ -1230,17 +2477,47 @@ def main():
         r = pygame.Rect(start_x + i * (car_card_w + car_spacing), cards_y, car_card_w, car_card_h)
         car_rects.append(r)
 
-    btn_play = pygame.Rect(center_x, H // 2 + 80, btn_w, btn_h)
-    btn_quit_menu = pygame.Rect(center_x, H // 2 + 140, btn_w, btn_h)
-    btn_restart = pygame.Rect(center_x, H // 2 + 40, btn_w, btn_h)
-    btn_quit_over = pygame.Rect(center_x, H // 2 + 120, btn_w, btn_h)
-    btn_info = pygame.Rect(W - 70, 20, 50, 50)
-    
-    lantern_spawn_count = 0 # Teller initialiseren
+    # Kaartachtergrond en geschaalde auto's voor het menu: eenmalig
+    card_bg = pygame.Surface((car_card_w, car_card_h), pygame.SRCALPHA)
+    pygame.draw.rect(card_bg, (16, 24, 48, 230), card_bg.get_rect(), border_radius=10)
+    menu_car_imgs = []
+    for menu_img, rect in zip(PLAYER_MENU_VIEWS, car_rects):
+        iw, ih = menu_img.get_size()
+        aspect = iw / ih
+        target_w = rect.width - 20
+        target_h = int(target_w / aspect)
+        if target_h > rect.height - 40:
+            target_h = rect.height - 40
+            target_w = int(target_h * aspect)
+        menu_car_imgs.append(pygame.transform.smoothscale(menu_img, (target_w, target_h)))
+
+    btn_play = Button((center_x, H // 2 + 80, btn_w, btn_h), "PLAY")
+    btn_quit_menu = Button((center_x, H // 2 + 140, btn_w, btn_h), "QUIT", is_danger=True)
+    btn_restart = Button((center_x, H // 2 + 40, btn_w, btn_h), "RESTART")
+    btn_quit_over = Button((center_x, H // 2 + 120, btn_w, btn_h), "QUIT", is_danger=True)
+    btn_info = Button((W - 70, 20, 50, 50), "i")
+    p_resume = Button((center_x, H // 2 - 30, btn_w, btn_h), "CONTINUE")
+    p_restart = Button((center_x, H // 2 + 30, btn_w, btn_h), "RESTART")
+    p_quit = Button((center_x, H // 2 + 90, btn_w, btn_h), "QUIT", is_danger=True)
+    countdown_lights = CountdownLights()
+
+    # Vaste back buffer en tint-lagen: geen Surface per frame
+    back_buffer = pygame.Surface((W, H)).convert()
+    crash_tint = pygame.Surface((W, H)).convert()
+    crash_tint.fill((50, 0, 0))
+    crash_tint.set_alpha(200)
+    pause_tint = pygame.Surface((W, H)).convert()
+    pause_tint.fill((0, 0, 0))
+    pause_tint.set_alpha(150)
+    presenter = _presenter = Presenter(screen, DIRTY_RECTS)
+    scheduler = _scheduler = RenderScheduler(60, IDLE_FPS, IDLE_AFTER_S)
+    last_scene = None
 
     while True:
-        dt = clock.tick(60)
+        dt = scheduler.wait(clock)
+        PROFILER.begin_frame()
         dt_s = dt / 1000.0
+        poll_race_assets()
 
         target = 255.0 if show_info else 0.0
         if info_alpha < target:
@@ -1248,7 +2525,10 @@ def main():
         elif info_alpha > target:
             info_alpha = max(target, info_alpha - INFO_FADE_SPEED * dt_s)
 
+        inputs = FrameInput()
+
         for event in pygame.event.get():
+            scheduler.poke()
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -1263,12 +2543,6 @@ def main():
                     continue
 
                 if paused:
-                    # Define temporary buttons for the pause menu positions
-                    # Use center_x and btn_w/h which are already defined in your main()
-                    p_resume  = pygame.Rect(center_x, H // 2 - 30, btn_w, btn_h)
-                    p_restart = pygame.Rect(center_x, H // 2 + 30, btn_w, btn_h)
-                    p_quit    = pygame.Rect(center_x, H // 2 + 90, btn_w, btn_h)
-
                     if p_resume.collidepoint(event.pos):
                         paused = False
                     elif p_restart.collidepoint(event.pos):
@@ -1276,7 +2550,7 @@ def main():
                     elif p_quit.collidepoint(event.pos):
                         pygame.quit()
                         sys.exit()
-                    
+
                     continue
 
                 if not started:
@@ -1286,43 +2560,14 @@ def main():
 
                     if btn_play.collidepoint(event.pos):
                         started = True
-                        counting_down = True
-                        countdown_stage = 3
-                        countdown_timer = 60
-                        if SOUND_BEEP:
-                            SOUND_BEEP.play()
-
-                        player = Player(
-                            PLAYER_DRIVE_SPRITES[selected_car_idx],
-                            ROBOT_TRANSFORM_FRAMES_PER_CAR[selected_car_idx],
-                            ROBOT_RUN_FRAMES_PER_CAR[selected_car_idx],
-                        )
-
-
-                        ammo = MAG_SIZE
-                        reloading = False
-                        reload_timer = 0
-                        shoot_cooldown = 0
-
                         paused = False
-                        alive = True
-                        score = 0
-                        last_score = 0
-                        bullets.clear()
-                        explosions.clear()
-                        obstacles.clear()
-                        buildings.clear()
-
-                        kills = 0
-                        robot_ready = False
-                        robot_active = False
-                        robot_timer = 0
+                        world.start(selected_car_idx)
 
                     if btn_quit_menu.collidepoint(event.pos):
                         pygame.quit()
                         sys.exit()
 
-                elif not alive:
+                elif not world.alive:
                     if btn_restart.collidepoint(event.pos):
                         return main()
                     if btn_quit_over.collidepoint(event.pos):
@@ -1334,6 +2579,10 @@ def main():
                     pygame.quit()
                     sys.exit()
 
+                if event.key == pygame.K_F3:
+                    PROFILER.toggle()
+                    continue
+
                 if event.key == pygame.K_i:
                     toggle_info()
                     continue
@@ -1342,7 +2591,7 @@ def main():
                     if info_alpha > 5 or show_info:
                         toggle_info(False)
                         continue
-                    if started and alive and (not counting_down):
+                    if started and world.racing:
                         paused = not paused
                     continue
 
@@ -1353,301 +2602,51 @@ def main():
                         selected_car_idx = min(len(PLAYER_MENU_VIEWS) - 1, selected_car_idx + 1)
                     if event.key in (pygame.K_SPACE, pygame.K_RETURN):
                         started = True
-                        counting_down = True
-                        countdown_stage = 3
-                        countdown_timer = 60
-                        if SOUND_BEEP:
-                            SOUND_BEEP.play()
-
-                        player = Player(
-                            PLAYER_DRIVE_SPRITES[selected_car_idx],
-                            ROBOT_TRANSFORM_FRAMES_PER_CAR[selected_car_idx],
-                            ROBOT_RUN_FRAMES_PER_CAR[selected_car_idx],
-                        )
-                        ammo = MAG_SIZE
-                        reloading = False
-                        reload_timer = 0
-                        shoot_cooldown = 0
-
                         paused = False
-                        alive = True
-                        score = 0
-                        last_score = 0
-                        bullets.clear()
-                        explosions.clear()
-                        obstacles.clear()
-                        buildings.clear()
-
-                        kills = 0
-                        robot_ready = False
-                        robot_active = False
-                        robot_timer = 0
-
-                elif alive and not counting_down:
+                        world.start(selected_car_idx)
+
+                elif world.alive and not world.counting_down:
                     if not paused:
                         if event.key in (pygame.K_LEFT, pygame.K_a):
-                            player.move_left()
+                            inputs.left = True
                         if event.key in (pygame.K_RIGHT, pygame.K_d):
-                            player.move_right()
-
+                            inputs.right = True
                         if event.key == pygame.K_SPACE:
-                            # Shoot (robot fires faster; robot bullets one-shot cars)
-                            if (not reloading) and ammo > 0 and shoot_cooldown <= 0:
-                                bullets.append(Bullet(player.lane, player.z - 0.08, robot=robot_active))
-                                shoot_cooldown = ROBOT_SHOOT_COOLDOWN if robot_active else NORMAL_SHOOT_COOLDOWN
-                                ammo -= 1
-                                if SOUND_SHOOT:
-                                    SOUND_SHOOT.play()
-                                if ammo <= 0:
-                                    reloading = True
-                                    reload_timer = RELOAD_TIME
+                            inputs.shoot = True
 
                 else:
                     if event.key == pygame.K_r:
                         return main()
 
         keys = pygame.key.get_pressed()
+        inputs.boost = keys[pygame.K_UP] or keys[pygame.K_w]
+        inputs.brake = keys[pygame.K_DOWN] or keys[pygame.K_s]
+        PROFILER.mark("events")
 
-        cam_dx = cam_dy = 0
-        if shake_frames > 0:
-            cam_dx = random.randint(-shake_strength, shake_strength)
-            cam_dy = random.randint(-shake_strength, shake_strength)
-            shake_frames -= 1
-            if shake_frames <= 0:
-                shake_strength = 0
-
-        if shoot_cooldown > 0:
-            shoot_cooldown -= 1
-
-        if started and alive and (not paused) and (not counting_down):
-            if reloading:
-                reload_timer -= 1
-                if reload_timer <= 0:
-                    reloading = False
-                    ammo = MAG_SIZE
-
-        if started and alive and (not paused) and (not counting_down):
-            if robot_active:
-                robot_timer -= 1
-                if robot_timer <= 0:
-                    robot_active = False
-                    robot_timer = 0
-
-
-        if player:
-            if robot_active and not prev_robot_active:
-                player.start_robot_transform()   # plays transform then runs
-            player.set_robot(robot_active)
-
-        prev_robot_active = robot_active
-
-        if started and alive and not paused:
-            if counting_down:
-                countdown_timer -= 1
-                if countdown_timer <= 0:
-                    countdown_stage -= 1
-                    countdown_timer = 60
-
-                    if countdown_stage in (2, 1):
-                        if SOUND_BEEP:
-                            SOUND_BEEP.play()
-                    elif countdown_stage == 0:
-                        if SOUND_GO:
-                            SOUND_GO.play()
-
-                if countdown_stage < 0:
-                    counting_down = False
-
-            else:
-                boosting = keys[pygame.K_UP] or keys[pygame.K_w]
-                braking = keys[pygame.K_DOWN] or keys[pygame.K_s]
-                target_speed = base_speed * 1.5 if boosting else (base_speed * 0.7 if braking else base_speed)
-                speed = lerp(speed, target_speed, 0.1)
-
-                if alive:
-                    if boosting:
-                        if robot_active:
-                            if SOUND_ENGINE and SOUND_ENGINE.get_num_channels() == 0:
-                                SOUND_ENGINE.stop()
-
-                            if SOUND_ROBOT_ENGINE and SOUND_ROBOT_ENGINE.get_num_channels() == 0:
-                                SOUND_ROBOT_ENGINE.play(-1)
-                        else:
-                            # Normal car boost sound
-                            if SOUND_ROBOT_ENGINE and SOUND_ROBOT_ENGINE.get_num_channels() == 0:
-                                SOUND_ROBOT_ENGINE.stop()
-
-                            if SOUND_ENGINE and SOUND_ENGINE.get_num_channels() == 0:
-                                SOUND_ENGINE.play(-1)
-                    else:
-                        # Not boosting → stop both
-                        if SOUND_ENGINE:
-                            SOUND_ENGINE.stop()
-                        if SOUND_ROBOT_ENGINE:
-                            SOUND_ROBOT_ENGINE.stop()
-                else:
-                    # Dead → stop all
-                    if SOUND_ENGINE:
-                        SOUND_ENGINE.stop()
-                    if SOUND_ROBOT_ENGINE:
-                        SOUND_ROBOT_ENGINE.stop()
-
-                player.update(boosting)
-
-                score += 1 + int(speed * 1000)
-                base_speed += speed_ramp * dt
-
-                spawn_progress += speed
-                if spawn_progress > spawn_threshold:
-                    spawn_progress = 0
-                    z_spawn = Z_SPAWN_MIN
-                    pattern = choose_spawn_pattern(obstacles, z_spawn)
-                    for lane, kind in pattern:
-                        sprite = None
-                        if kind == "car":
-                            sprite = IMG_ENEMIES[enemy_cycle_i]
-                            enemy_cycle_i = (enemy_cycle_i + 1) % len(IMG_ENEMIES)
-                        obstacles.append(Obstacle(lane, z_spawn, kind, sprite))
-
-                # --- AANGEPASTE SIDEWALK SPAWN MET VAST PATROON ---
-                lantern_spawn_progress += speed
-                if lantern_spawn_progress > 0.30:
-                    lantern_spawn_progress = 0
-                                        
-                    buildings.append(SideObject(-1, Z_SPAWN_MIN, kind="lamp"))
-                    buildings.append(SideObject(1, Z_SPAWN_MIN, kind="lamp"))
-
-                    if random.random() < 0.3: 
-                        buildings.append(SideObject(-1, Z_SPAWN_MIN + 0.005, kind="bin", x_offset=15))
-                        
-                    if random.random() < 0.3:
-                        buildings.append(SideObject(1, Z_SPAWN_MIN + 0.005, kind="bin", x_offset=-15))
-
-                # --- AANGEPASTE BUILDING SPAWN LOGICA ---
-                building_spawn_progress += speed
-                
-                if building_spawn_progress > 0.01:
-                    building_spawn_progress = 0
-
-                    # --- EERSTE LAAG (Dicht op de weg) ---
-                    
-                    if not any(isinstance(b, Building) and b.layer == 1 and b.side == -1 and abs(b.z - Z_SPAWN_MIN) < 0.08 for b in buildings):
-                        buildings.append(Building(-1, Z_SPAWN_MIN, layer=1))
-                    
-                    if not any(isinstance(b, Building) and b.layer == 1 and b.side == 1 and abs(b.z - Z_SPAWN_MIN) < 0.08 for b in buildings):
-                        buildings.append(Building(1, Z_SPAWN_MIN, layer=1))
-
-                    # --- TWEEDE LAAG (Achtergrond, optioneel 'vol' maken) ---
-                    if random.random() < 0.6: 
-                        if not any(isinstance(b, Building) and b.layer == 2 and b.side == -1 and abs(b.z - Z_SPAWN_MIN) < 0.15 for b in buildings):
-                            buildings.append(Building(-1, Z_SPAWN_MIN, layer=2))
-                        if not any(isinstance(b, Building) and b.layer == 2 and b.side == 1 and abs(b.z - Z_SPAWN_MIN) < 0.15 for b in buildings):
-                            buildings.append(Building(1, Z_SPAWN_MIN, layer=2))
-
-                p_rect = player.get_rect()
-                for b in buildings[:]:
-                    b.update(speed)
-                    if b.z > 1.3:
-                        buildings.remove(b)
-
-                for obs in obstacles[:]:
-                    obs.update(speed)
-                    if obs.z > 1.3:
-                        obstacles.remove(obs)
-                        continue
-
-                    if 0.85 < obs.z < 1.0:
-                        o_rect = obs.get_rect()
-                        hitbox = o_rect.inflate(-15, -15)
-                        if p_rect.colliderect(hitbox):
-                            if robot_active:
-                                # ROBOT: destroy obstacles on contact
-                                spawn_explosion_at_rect(o_rect, obs.z)
-                                if obs.kind == "car":
-                                    score += ROBOT_CONTACT_SCORE_CAR
-                                else:
-                                    score += ROBOT_CONTACT_SCORE_OTHER
-                                obstacles.remove(obs)
-                                # small impact shake
-                                start_shake(12, 8)
-                            else:
-                                # NORMAL: crash
-                                alive = False
-                                last_score = score
-                                if SOUND_ENGINE:
-                                    SOUND_ENGINE.stop()
-                                if SOUND_EXPLOSION:
-                                    SOUND_EXPLOSION.play()
-                                explosions.append(Explosion(p_rect.centerx, p_rect.centery, player.z))
-                                start_shake(22, 10)
-
-                for blt in bullets[:]:
-                    blt.update()
-                    if blt.z < 0.02:
-                        bullets.remove(blt)
-
-                for blt in bullets[:]:
-                    brect = blt.get_rect()
-                    hit_any = False
-
-                    for obs in obstacles[:]:
-                        orect = obs.get_rect()
-                        if not brect.colliderect(orect):
-                            continue
-
-                        hit_any = True
-
-                        if obs.kind == "car":
-                            if blt.robot:
-                                obs.hp = 0
-                            else:
-                                obs.hp -= 1
-
-                            score += 40
-
-                            if obs.hp <= 0:
-                                if not robot_active:
-                                    kills += 1
-                                if SOUND_EXPLOSION:
-                                    SOUND_EXPLOSION.play()
-                                explosions.append(Explosion(orect.centerx, orect.centery, obs.z))
-                                start_shake(12, 7)
-                                obstacles.remove(obs)
-                                score += 300
-
-                                if (not robot_ready) and (kills >= ROBOT_KILLS_TO_UNLOCK) and (not robot_active):
-                                    robot_ready = True
-                                    robot_active = True
-                                    robot_timer = ROBOT_DURATION_FRAMES
-                                    kills = 0
-                                    if SOUND_TRANSFORM:
-                                        SOUND_TRANSFORM.play()
-                                    robot_ready = False
-                        else:
-                            if SOUND_EXPLOSION:
-                                SOUND_EXPLOSION.play()
-                            explosions.append(Explosion(orect.centerx, orect.centery, obs.z))
-                            start_shake(8, 5)
-                            obstacles.remove(obs)
-                            score += 100
-
-                        break
-
-                    if hit_any and blt in bullets:
-                        bullets.remove(blt)
-
-                for ex in explosions[:]:
-                    ex.update()
-                    if ex.done():
-                        explosions.remove(ex)
-
-                dash_offset = (dash_offset + speed * 2.0) % 1.0
+        cam_dx, cam_dy = world.next_shake_offset()
 
+        if started and not paused:
+            world.step(inputs)
+            if world.racing:
+                update_engine_sounds(inputs.boost, world.robot_active)
         else:
-            for ex in explosions[:]:
-                ex.update()
-                if ex.done():
-                    explosions.remove(ex)
+            world.tick_shoot_cooldown()
+            world.update_explosions()
+        play_world_events(world.take_events())
+        PROFILER.mark("sim")
+
+        player = world.player
+        alive = world.alive
+        counting_down = world.counting_down
+        speed = world.speed
+
+        # Menu, pauze en crash-scherm alleen opnieuw tekenen bij input of als
+        # er iets beweegt (info-fade, explosies, shake)
+        static = not started or paused or not alive
+        view = (started, paused, alive, selected_car_idx, info_alpha, cam_dx, cam_dy)
+        if not scheduler.update(view, animating=not static or bool(world.explosions)):
+            PROFILER.discard_frame()
+            continue
 
         # --- RENDER ---
         if not started:
@@ -1656,20 +2655,9 @@ def main():
             else:
                 screen.fill((0, 0, 0))
 
-            for i, menu_img in enumerate(PLAYER_MENU_VIEWS):
+            for i, menu_car_img in enumerate(menu_car_imgs):
                 rect = car_rects[i]
-                s = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-                pygame.draw.rect(s, (16, 24, 48, 230), s.get_rect(), border_radius=10)
-                screen.blit(s, rect.topleft)
-
-                iw, ih = menu_img.get_size()
-                aspect = iw / ih
-                target_w = rect.width - 20
-                target_h = int(target_w / aspect)
-                if target_h > rect.height - 40:
-                    target_h = rect.height - 40
-                    target_w = int(target_h * aspect)
-                menu_car_img = pygame.transform.smoothscale(menu_img, (target_w, target_h))
+                screen.blit(card_bg, rect.topleft)
                 img_rect = menu_car_img.get_rect(center=rect.center)
 
                 if i == selected_car_idx:
@@ -1680,126 +2668,105 @@ def main():
 
                 screen.blit(menu_car_img, img_rect.topleft)
 
-            draw_button(screen, btn_play, "PLAY")
-            draw_button(screen, btn_quit_menu, "QUIT", is_danger=True)
-            draw_button(screen, btn_info, "i" if info_alpha < 5 else "X", is_danger=(info_alpha >= 5))
+            changed = [r.inflate(12, 12) for r in car_rects]
+            changed.append(btn_play.draw(screen))
+            changed.append(btn_quit_menu.draw(screen))
+            btn_info.set_label("i" if info_alpha < 5 else "X", is_danger=(info_alpha >= 5))
+            changed.append(btn_info.draw(screen))
 
             draw_info_overlay(
                 screen, info_alpha, started, alive, paused, counting_down,
-                ammo, reloading, kills, robot_ready, robot_active, robot_timer
+                world.ammo, world.reloading, world.kills, world.robot_ready, world.robot_active, world.robot_timer
             )
-
-            pygame.display.flip()
+            PROFILER.mark("hud")
+            if PROFILER.enabled:
+                changed.append(PROFILER.draw(screen, PROFILER_POS))
+                PROFILER.mark("profiler")
+
+            scene = ("menu", selected_car_idx, info_alpha)
+            presenter.present(screen, rects=changed if scene == last_scene else None)
+            last_scene = scene
+            PROFILER.mark("present")
+            PROFILER.end_frame()
+            ASSETS.mark("first frame")
             continue
 
-        frame = pygame.Surface((W, H))
-        draw_background_and_terrain(frame, dash_offset)
-
-        buildings.sort(key=lambda b: b.z)
-        for b in buildings:
-            b.draw(frame)
-
-        draw_road(frame, dash_offset)
+        frame = back_buffer
+        changed = draw_world(frame, world)
 
-        obstacles.sort(key=lambda o: -o.z)
-        for obs in obstacles:
-            obs.draw(frame)
-
-        for blt in bullets:
-            blt.draw(frame)
-
-        if player:
-            player.draw(frame)
-
-        for ex in explosions:
-            ex.draw(frame)
-
-        draw_text_with_outline(frame, f"SCORE: {score}", FONT, WHITE, (20, 20))
-        speed_pct = min(1.0, (speed / 0.01))
-        pygame.draw.rect(frame, (50, 50, 50), (20, 60, 200, 20), border_radius=5)
-        pygame.draw.rect(frame, NEON_CYAN, (20, 60, int(200 * speed_pct), 20), border_radius=5)
-        draw_text_with_outline(frame, "SPEED", SMALL_FONT, WHITE, (25, 62))
-
-        draw_ammo_hud(frame, ammo, reloading, robot_ready, robot_active, robot_timer, kills)
+        changed.append(draw_hud(frame, world))
 
         if counting_down:
-            draw_countdown_lights(frame, countdown_stage)
+            changed.append(countdown_lights.draw(frame, world.countdown_stage))
 
         if not alive:
-            s = pygame.Surface((W, H), pygame.SRCALPHA)
-            s.fill((50, 0, 0, 200))
-            frame.blit(s, (0, 0))
-            
+            frame.blit(crash_tint, (0, 0))
+
             if not score_saved:
-                high_scores = save_new_score(last_score)
+                high_scores = leaderboard.record(world.last_score, car=world.car_idx,
+                                                 duration_s=world.run_seconds(), kills=world.run_kills)
                 score_saved = True
-            
-            txt = BIG_FONT.render("CRASHED!", True, (255, 50, 50))
+
+            txt = TEXT_CACHE.render(BIG_FONT, "CRASHED!", (255, 50, 50))
             frame.blit(txt, (W // 2 - txt.get_width() // 2, H // 2 - 220))
-            
-            score_txt = FONT.render(f"YOUR SCORE: {last_score}", True, WHITE)
+
+            score_txt = TEXT_CACHE.render(FONT, f"YOUR SCORE: {world.last_score}", WHITE)
             frame.blit(score_txt, (W // 2 - score_txt.get_width() // 2, H // 2 - 150))
-            
+
             draw_leaderboard_panel(frame, high_scores, W // 2, H // 2 - 100)
-            
-            btn_restart.y = H // 2 + 90
-            btn_quit_over.y = H // 2 + 150
-            
-            draw_button(frame, btn_restart, "RESTART")
-            draw_button(frame, btn_quit_over, "QUIT", is_danger=True)
+
+            btn_restart.rect.y = H // 2 + 90
+            btn_quit_over.rect.y = H // 2 + 150
+
+            changed.append(btn_restart.draw(frame))
+            changed.append(btn_quit_over.draw(frame))
 
         elif paused:
-            s = pygame.Surface((W, H), pygame.SRCALPHA)
-            s.fill((0, 0, 0, 150))
-            frame.blit(s, (0, 0))
-            txt = BIG_FONT.render("PAUSE", True, WHITE)
+            frame.blit(pause_tint, (0, 0))
+            txt = TEXT_CACHE.render(BIG_FONT, "PAUSE", WHITE)
             frame.blit(txt, (W // 2 - txt.get_width() // 2, H // 2 - 100))
-            p_resume  = pygame.Rect(center_x, H // 2 - 30, btn_w, btn_h)
-            p_restart = pygame.Rect(center_x, H // 2 + 30, btn_w, btn_h)
-            p_quit    = pygame.Rect(center_x, H // 2 + 90, btn_w, btn_h)
-            draw_button(frame, p_resume, "CONTINUE")
-            draw_button(frame, p_restart, "RESTART")
-            draw_button(frame, p_quit, "QUIT", is_danger=True)
-
-        draw_button(frame, btn_info, "i" if info_alpha < 5 else "X", is_danger=(info_alpha >= 5))
+            changed.append(p_resume.draw(frame))
+            changed.append(p_restart.draw(frame))
+            changed.append(p_quit.draw(frame))
+
+        btn_info.set_label("i" if info_alpha < 5 else "X", is_danger=(info_alpha >= 5))
+        changed.append(btn_info.draw(frame))
         draw_info_overlay(
             frame, info_alpha, started, alive, paused, counting_down,
-            ammo, reloading, kills, robot_ready, robot_active, robot_timer
+            world.ammo, world.reloading, world.kills, world.robot_ready, world.robot_active, world.robot_timer
         )
 
+        PROFILER.mark("hud")
+
         car_origin = None
         if player:
             pr = player.get_rect()
             car_origin = (pr.centerx, pr.centery - int(pr.h * 0.25))
 
         boosting_now = False
-        if started and alive and (not paused) and (not counting_down) and (info_alpha <= 5):
-            boosting_now = (keys[pygame.K_UP] or keys[pygame.K_w])
+        if world.racing and (not paused) and (info_alpha <= 5):
+            boosting_now = inputs.boost
 
         final_frame = frame
 
         if boosting_now:
             boost_intensity = clamp(min(1.0, (speed / 0.01)), 0.0, 1.0)
+            final_frame = BOOST_FX.apply(frame, boost_intensity, car_origin)
+        PROFILER.mark("boost")
 
-            ghost = frame.copy()
-            ghost.blit(frame, (0, 6))
-            ghost.set_alpha(int(60 + 90 * boost_intensity))
-            frame.blit(ghost, (0, 0))
-
-            if car_origin:
-                draw_boost_warp(frame, boost_intensity, origin=car_origin)
-
-            zoom = 1.0 + (0.06 * boost_intensity)
-            zoom_w = int(W * zoom)
-            zoom_h = int(H * zoom)
-            zoomed = pygame.transform.smoothscale(frame, (zoom_w, zoom_h))
-            crop_x = (zoom_w - W) // 2
-            crop_y = (zoom_h - H) // 2
-            final_frame = zoomed.subsurface((crop_x, crop_y, W, H))
+        if PROFILER.enabled:
+            changed.append(PROFILER.draw(final_frame, PROFILER_POS))
+            PROFILER.mark("profiler")
 
-        screen.fill((0, 0, 0))
-        screen.blit(final_frame, (cam_dx, cam_dy))
-        pygame.display.flip()
+        # Alleen als de weg stilstaat (pauze, crash, countdown, open info) is
+        # `changed` compleet; anders is het hele beeld veranderd.
+        scene = ("race", paused, alive, counting_down, world.dash_offset, boosting_now, info_alpha)
+        presenter.present(final_frame, (cam_dx, cam_dy), changed if scene == last_scene else None)
+        last_scene = scene
+        PROFILER.mark("present")
+        PROFILER.end_frame()
 
 if __name__ == "__main__":
+    if DUMP_STATS_AT_EXIT:
+        atexit.register(dump_stats)
     main()
@@ -0,0 +1,147 @@
+"""Pooled particle system with pre-rendered particle sprites.
+
+Particles live in preallocated struct-of-arrays storage (x, y, vx, vy, life,
+size, color). update() moves every particle in one vectorized step and
+compacts the survivors in place, keeping their order; draw() blits cached
+circle sprites, one per (color, radius), in a single Surface.blits call.
+
+NumPy is optional: without it the same API runs on plain lists.
+"""
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FIELDS = ("x", "y", "vx", "vy", "life", "size", "color")
+
+
+class ParticleSystem:
+    def __init__(self, capacity=64, alpha=150, shrink=0.2, gravity=0.0):
+        self.alpha = alpha
+        self.shrink = shrink
+        self.gravity = gravity
+        self.n = 0
+        self.colors = []
+        self.color_index = {}
+        self.sprites = {}
+        capacity = max(1, int(capacity))
+        for name in FIELDS:
+            if np is not None:
+                dtype = np.int32 if name == "color" else np.float64
+                setattr(self, name, np.zeros(capacity, dtype))
+            else:
+                setattr(self, name, [0] * capacity)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in FIELDS:
+            old = getattr(self, name)
+            if np is not None:
+                new = np.zeros(capacity, old.dtype)
+                new[:self.n] = old[:self.n]
+            else:
+                new = old[:self.n] + [0] * (capacity - self.n)
+            setattr(self, name, new)
+
+    def _color(self, color):
+        idx = self.color_index.get(color)
+        if idx is None:
+            idx = len(self.colors)
+            self.colors.append(color)
+            self.color_index[color] = idx
+        return idx
+
+    def sprite(self, color_idx, radius):
+        """Pre-rendered circle of `radius` px in colors[color_idx]."""
+        key = (color_idx, radius)
+        surf = self.sprites.get(key)
+        if surf is None:
+            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*self.colors[color_idx], self.alpha), (radius, radius), radius)
+            self.sprites[key] = surf
+        return surf
+
+    def emit(self, x, y, color, size, vx, vy, life=20):
+        if self.n == self.capacity:
+            self._grow(self.n + 1)
+        i = self.n
+        self.x[i] = x; self.y[i] = y
+        self.vx[i] = vx; self.vy[i] = vy
+        self.life[i] = life; self.size[i] = size
+        self.color[i] = self._color(color)
+        self.n += 1
+
+    def clear(self):
+        self.n = 0
+
+    def update(self):
+        n = self.n
+        if not n:
+            return
+        if np is None:
+            self._update_lists()
+            return
+
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        life, size = self.life[:n], self.size[:n]
+        x += vx
+        y += vy
+        if self.gravity:
+            vy += self.gravity
+        life -= 1
+        size -= self.shrink
+        np.maximum(size, 0, out=size)
+
+        alive = life > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            k = len(keep)
+            for name in FIELDS:
+                arr = getattr(self, name)
+                arr[:k] = arr[keep]
+            self.n = k
+
+    def _update_lists(self):
+        k = 0
+        for i in range(self.n):
+            self.x[i] += self.vx[i]
+            self.y[i] += self.vy[i]
+            self.vy[i] += self.gravity
+            self.life[i] -= 1
+            self.size[i] = max(0, self.size[i] - self.shrink)
+            if self.life[i] > 0:
+                if k != i:
+                    for name in FIELDS:
+                        arr = getattr(self, name)
+                        arr[k] = arr[i]
+                k += 1
+        self.n = k
+
+    def draw(self, surf):
+        n = self.n
+        if not n:
+            return
+        sprite = self.sprite
+        if np is None:
+            seq = [(sprite(self.color[i], int(self.size[i])), (int(self.x[i]), int(self.y[i])))
+                   for i in range(n) if self.life[i] > 0 and int(self.size[i]) > 0]
+        else:
+            radius = self.size[:n].astype(np.intp)
+            vis = np.flatnonzero((radius > 0) & (self.life[:n] > 0))
+            if not len(vis):
+                return
+            seq = [(sprite(c, r), (x, y)) for c, r, x, y in zip(
+                self.color[vis].tolist(), radius[vis].tolist(),
+                self.x[vis].astype(np.intp).tolist(), self.y[vis].astype(np.intp).tolist())]
+        surf.blits(seq, doreturn=False)
@@ -0,0 +1,135 @@
+"""Putting finished frames on the display.
+
+The game renders into a persistent back buffer and hands it to a Presenter.
+By default every frame is copied to the screen and flipped. In dirty-rect
+mode the caller also passes the rects that changed since the previous frame;
+only those (plus last frame's rects, so things that moved away get erased)
+are copied and passed to pygame.display.update(). Passing rects=None means
+the whole frame changed.
+
+RenderScheduler paces the loop on screens that are mostly static (menus,
+pause): frames are only drawn when the shown state changes, something
+animates or input arrives, and after a while without changes the loop sleeps
+in pygame.event.wait() at a low tick rate, so the next event wakes it at once.
+"""
+import pygame
+
+
+class Presenter:
+    def __init__(self, screen, dirty_rects=False, full_ratio=0.5):
+        self.screen = screen
+        self.dirty_rects = dirty_rects
+        # above this fraction of the screen a full flip is cheaper
+        self.full_ratio = full_ratio
+        self.prev_rects = None
+        self.prev_offset = (0, 0)
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.pixels = 0
+
+    def present(self, frame, offset=(0, 0), rects=None):
+        screen = self.screen
+        shaken = offset != (0, 0) or self.prev_offset != (0, 0)
+        self.prev_offset = offset
+
+        area = None
+        if self.dirty_rects and rects is not None and self.prev_rects is not None and not shaken:
+            bounds = screen.get_rect()
+            area = [r.clip(bounds) for r in rects + self.prev_rects]
+            area = [r for r in area if r.w > 0 and r.h > 0]
+            if sum(r.w * r.h for r in area) > self.full_ratio * bounds.w * bounds.h:
+                area = None
+        self.prev_rects = [pygame.Rect(r) for r in rects] if rects is not None else None
+
+        if area is None:
+            if frame is not screen:
+                if shaken:
+                    screen.fill((0, 0, 0))
+                screen.blit(frame, offset)
+            pygame.display.flip()
+            self.full_frames += 1
+            self.pixels += screen.get_width() * screen.get_height()
+            return
+
+        if frame is not screen:
+            for r in area:
+                screen.blit(frame, r.topleft, r)
+        pygame.display.update(area)
+        self.partial_frames += 1
+        self.pixels += sum(r.w * r.h for r in area)
+
+    def stats(self):
+        frames = self.full_frames + self.partial_frames
+        w, h = self.screen.get_size()
+        return {
+            "full_frames": self.full_frames,
+            "partial_frames": self.partial_frames,
+            "presented_pct": 100.0 * self.pixels / (frames * w * h) if frames else 0.0,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"presenter: {s['full_frames']} full, {s['partial_frames']} partial frames, "
+                f"{s['presented_pct']:.1f}% of the pixels presented")
+
+
+class RenderScheduler:
+    _NO_VIEW = object()
+
+    def __init__(self, fps=60, idle_fps=4, idle_after=1.0):
+        self.fps = fps
+        self.idle_timeout = max(1, int(1000 / idle_fps))
+        self.idle_after_ms = int(idle_after * 1000)
+        self.view = self._NO_VIEW
+        self.dirty = True
+        self.idle = False
+        self.last_change = pygame.time.get_ticks()
+        self.drawn = 0
+        self.skipped = 0
+        self.idle_waits = 0
+
+    def poke(self):
+        """Input arrived: draw the next frame and leave idle mode."""
+        self.dirty = True
+        self.idle = False
+
+    def wait(self, clock):
+        """Sleep until the next frame; returns the frame time in ms like clock.tick()."""
+        if self.idle:
+            self.idle_waits += 1
+            event = pygame.event.wait(self.idle_timeout)
+            if event.type != pygame.NOEVENT:
+                pygame.event.post(event)
+                self.poke()
+            # the idle sleep is not frame time: animations that start now
+            # (fades) should not jump ahead
+            clock.tick()
+        return clock.tick(self.fps)
+
+    def update(self, view, animating=False):
+        """Whether to draw this frame. `view` is a hashable summary of what is shown."""
+        now = pygame.time.get_ticks()
+        draw = self.dirty or animating or view != self.view
+        self.dirty = False
+        self.view = view
+        if draw:
+            self.last_change = now
+            self.drawn += 1
+        else:
+            self.skipped += 1
+        self.idle = not draw and now - self.last_change >= self.idle_after_ms
+        return draw
+
+    def stats(self):
+        frames = self.drawn + self.skipped
+        return {
+            "drawn": self.drawn,
+            "skipped": self.skipped,
+            "idle_waits": self.idle_waits,
+            "skipped_pct": 100.0 * self.skipped / frames if frames else 0.0,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"render scheduler: {s['drawn']} drawn, {s['skipped']} skipped ({s['skipped_pct']:.1f}%), "
+                f"{s['idle_waits']} idle waits")
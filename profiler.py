@@ -0,0 +1,188 @@
+"""Per-phase frame timing with an on-screen graph and CSV export.
+
+The game loop calls begin_frame(), then mark(phase) at the end of each phase
+(the time since the previous mark goes to that phase), then end_frame(). A
+frame the loop decides not to render after all (idle throttling) is closed
+with discard_frame() instead, so it shows up in neither the graph nor the
+CSV. While the profiler is off these calls return at once, so they can stay
+in the loop.
+
+When on, every frame:
+- is added to a rolling stacked graph, one pixel column per frame and one
+  colour per phase, scrolled in place rather than redrawn;
+- updates the readout: 95th percentile and mean of the whole frame, and
+  the mean per phase, over the graph's history;
+- is written as one CSV row (frame, total and per-phase milliseconds) to
+  a new file in `csv_dir`, if one is given.
+"""
+import csv
+import os
+import time
+from collections import deque
+
+import pygame
+
+COLORS = [
+    (90, 160, 255), (255, 200, 60), (120, 220, 120), (240, 120, 200), (255, 120, 80),
+    (160, 120, 255), (80, 220, 220), (220, 220, 220), (255, 80, 80), (150, 150, 90),
+]
+
+
+class FrameProfiler:
+    def __init__(self, phases, font=None, history=240, height=90, budget_ms=1000.0 / 60.0,
+                 csv_dir=None, refresh=15):
+        self.phases = list(phases)
+        self.index = {name: i for i, name in enumerate(self.phases)}
+        self.font = font
+        self.history = history
+        self.height = height
+        self.budget_ms = budget_ms
+        self.csv_dir = csv_dir
+        self.refresh = refresh
+        self.enabled = False
+        self.open = False
+        self.skipped = 0
+        self.times = [0] * len(self.phases)
+        self.t_last = 0
+        self.rows = deque(maxlen=history)
+        self.frame = 0
+        self.graph = None
+        self.readout = None
+        self.csv_file = None
+        self.csv_writer = None
+        self.csv_path = None
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.open = True
+        self.skipped = 0
+        self.rows.clear()
+        self.graph = pygame.Surface((self.history, self.height))
+        self.graph.fill((0, 0, 0))
+        self.readout = None
+        # switched on mid-frame (F3): time the rest of this frame from here
+        self.times = [0] * len(self.phases)
+        self.t_last = time.perf_counter_ns()
+        if self.csv_dir:
+            os.makedirs(self.csv_dir, exist_ok=True)
+            self.csv_path = os.path.join(self.csv_dir, time.strftime("frames-%Y%m%d-%H%M%S.csv"))
+            self.csv_file = open(self.csv_path, "w", newline="")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(["frame", "total_ms"] + [f"{p}_ms" for p in self.phases])
+
+    def disable(self):
+        self.enabled = False
+        self.open = False
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.open = True
+        self.times = [0] * len(self.phases)
+        self.t_last = time.perf_counter_ns()
+
+    def mark(self, phase):
+        """Book the time since the previous mark (or begin_frame) on `phase`."""
+        if not self.open:
+            return
+        now = time.perf_counter_ns()
+        self.times[self.index[phase]] += now - self.t_last
+        self.t_last = now
+
+    def end_frame(self):
+        if not self.open:
+            return
+        self.open = False
+        ms = [t / 1e6 for t in self.times]
+        total = sum(ms)
+        self.rows.append((total, ms))
+        self._add_column(ms)
+        if self.csv_writer is not None:
+            self.csv_writer.writerow([self.frame, f"{total:.3f}"] + [f"{m:.3f}" for m in ms])
+        self.frame += 1
+        if self.frame % self.refresh == 0:
+            self.readout = None
+
+    def discard_frame(self):
+        """Drop the open frame: it was not rendered, so it is not a sample."""
+        if not self.open:
+            return
+        self.open = False
+        self.skipped += 1
+
+    def _add_column(self, ms):
+        g = self.graph
+        g.scroll(-1, 0)
+        x = self.history - 1
+        g.fill((0, 0, 0), (x, 0, 1, self.height))
+        # twice the budget fills the graph; the budget line sits halfway
+        scale = self.height / (2 * self.budget_ms)
+        y = float(self.height)
+        for i, m in enumerate(ms):
+            top = y - m * scale
+            if int(top) < int(y):
+                g.fill(COLORS[i % len(COLORS)], (x, max(0, int(top)), 1, int(y) - max(0, int(top))))
+            y = top
+            if y <= 0:
+                break
+        g.set_at((x, self.height // 2), (255, 255, 255))
+
+    def stats(self):
+        """p95/mean of the frame total and mean per phase over the history, in ms."""
+        if not self.rows:
+            return {"frames": 0, "skipped": self.skipped, "p95_ms": 0.0, "mean_ms": 0.0, "phases": {}}
+        totals = sorted(total for total, _ in self.rows)
+        n = len(totals)
+        p95 = totals[min(n - 1, int(round(0.95 * (n - 1))))]
+        sums = [0.0] * len(self.phases)
+        for _, ms in self.rows:
+            for i, m in enumerate(ms):
+                sums[i] += m
+        return {
+            "frames": n,
+            "skipped": self.skipped,
+            "p95_ms": p95,
+            "mean_ms": sum(totals) / n,
+            "phases": {p: sums[i] / n for i, p in enumerate(self.phases)},
+        }
+
+    def _render_readout(self):
+        s = self.stats()
+        lines = [(f"frame p95 {s['p95_ms']:.2f} ms  mean {s['mean_ms']:.2f} ms  skipped {s['skipped']}",
+                  (255, 255, 255))]
+        for i, p in enumerate(self.phases):
+            lines.append((f"{p} {s['phases'].get(p, 0.0):.2f}", COLORS[i % len(COLORS)]))
+        images = [self.font.render(text, True, color) for text, color in lines]
+        w = max(img.get_width() for img in images)
+        h = sum(img.get_height() for img in images)
+        surf = pygame.Surface((w + 8, h + 8))
+        surf.fill((0, 0, 0))
+        y = 4
+        for img in images:
+            surf.blit(img, (4, y))
+            y += img.get_height()
+        surf.set_alpha(200)
+        return surf
+
+    def draw(self, surf, pos):
+        """Graph with the readout below it; returns the rect drawn."""
+        if not self.enabled:
+            return None
+        rect = surf.blit(self.graph, pos)
+        if self.font is not None:
+            if self.readout is None:
+                self.readout = self._render_readout()
+            rect.union_ip(surf.blit(self.readout, (pos[0], pos[1] + self.height + 2)))
+        return rect
@@ -0,0 +1,103 @@
+"""Headless runner for the game simulation.
+
+Drives main.World with a simple autopilot under the SDL dummy drivers, without
+drawing anything, so thousands of frames can be simulated per second:
+
+    python simulate.py --frames 20000 --seed 1 --car 2
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import time
+
+import main as game
+
+
+def autopilot(world, rng, boost_chance=0.5):
+    """Dodge obstacles in the own lane, keep shooting and boost now and then."""
+    inputs = game.FrameInput(shoot=True)
+    inputs.boost = rng.random() < boost_chance
+    player = world.player
+    if player is None or player.lane != player.target_lane:
+        return inputs
+
+    blocked = set()
+    for obs in world.obstacles:
+        if 0.55 < obs.z < 1.0:
+            blocked.add(obs.lane)
+            if obs.kind == "roadblock":
+                blocked.add(obs.lane + 1)
+
+    if player.lane in blocked:
+        if player.lane > 0 and (player.lane - 1) not in blocked:
+            inputs.left = True
+        elif player.lane < game.LANES - 1 and (player.lane + 1) not in blocked:
+            inputs.right = True
+    return inputs
+
+
+def run(frames, seed=0, car_idx=0, boost_chance=0.5, array_obstacles=False, spawn_threshold=None):
+    """Simulate `frames` steps, restarting after every crash. Returns stats."""
+    random.seed(seed)
+    rng = random.Random(seed)
+    world = game.World(array_obstacles=array_obstacles)
+
+    def start():
+        world.start(car_idx)
+        if spawn_threshold is not None:
+            world.spawn_threshold = spawn_threshold
+
+    start()
+    scores = []
+    events = 0
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        world.step(autopilot(world, rng, boost_chance))
+        events += len(world.take_events())
+        if not world.alive and not world.explosions:
+            scores.append(world.last_score)
+            start()
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "runs": len(scores),
+        "scores": scores,
+        "events": events,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--car", type=int, default=0, choices=range(len(game.DRIVE_FILES)))
+    parser.add_argument("--boost", type=float, default=0.5, help="chance to hold boost per frame")
+    parser.add_argument("--array-obstacles", action="store_true", help="use the NumPy ObstacleStore")
+    parser.add_argument("--spawn-threshold", type=float, default=None,
+                        help="obstacle spawn distance (default 0.45; lower = denser)")
+    parser.add_argument("--facade-worker", action="store_true",
+                        help="generate the building facade atlas on a worker thread")
+    args = parser.parse_args()
+
+    if args.facade_worker:
+        game.FACADE_ATLAS.start()
+
+    stats = run(args.frames, args.seed, args.car, args.boost, args.array_obstacles, args.spawn_threshold)
+    print(f"{stats['frames']} frames in {stats['seconds']:.2f}s ({stats['fps']:.0f} fps)")
+    print(f"runs finished: {stats['runs']}, events: {stats['events']}")
+    if stats["scores"]:
+        print(f"scores: best {max(stats['scores'])}, mean {sum(stats['scores']) / len(stats['scores']):.0f}")
+    if args.facade_worker:
+        f = game.FACADE_ATLAS.stats()
+        print(f"facades: {f['served']} from atlas, {f['starved']} starved ({f['starved_pct']:.1f}%, {f['starved_ms']:.0f} ms inline)")
+    game.dump_stats()
+
+
+if __name__ == "__main__":
+    main()
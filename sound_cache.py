@@ -0,0 +1,67 @@
+"""Decoded-PCM cache for sound effects.
+
+Decoding an MP3 through pygame.mixer.Sound is slow compared to handing the
+mixer raw samples. PCMCache.load() decodes a file once, writes the raw
+samples (Sound.get_raw(), already in the mixer's format) to a cache
+directory, and on later runs builds the Sound from those bytes with
+pygame.mixer.Sound(buffer=...).
+
+Cache files are named after the source file, a hash of its contents and the
+mixer settings (frequency, format, channels), so editing a sound or opening
+the mixer differently never serves stale or mis-formatted samples. Files for
+old versions are left behind; the directory can be deleted at any time.
+"""
+import hashlib
+import os
+
+import pygame
+
+
+class PCMCache:
+    def __init__(self, cache_dir, mixer_settings=None):
+        self.cache_dir = cache_dir
+        self.mixer_settings = mixer_settings or pygame.mixer.get_init()
+        self.hits = 0
+        self.decoded = 0
+        self.write_errors = 0
+
+    def cache_path(self, path):
+        with open(path, "rb") as f:
+            digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+        freq, fmt, channels = self.mixer_settings
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{digest}-{freq}-{fmt}-{channels}.pcm")
+
+    def load(self, path):
+        """pygame.mixer.Sound for `path`, from cached PCM when there is any.
+
+        Raises FileNotFoundError like Sound(path) does when `path` is missing.
+        """
+        cached = self.cache_path(path)
+        try:
+            with open(cached, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = None
+        if data:
+            self.hits += 1
+            return pygame.mixer.Sound(buffer=data)
+
+        sound = pygame.mixer.Sound(path)
+        self.decoded += 1
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{cached}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(sound.get_raw())
+            os.replace(tmp, cached)
+        except OSError:
+            self.write_errors += 1   # read-only install: just decode every run
+        return sound
+
+    def stats(self):
+        return {"hits": self.hits, "decoded": self.decoded, "write_errors": self.write_errors}
+
+    def format_stats(self):
+        s = self.stats()
+        return f"sound cache: {s['hits']} from PCM, {s['decoded']} decoded, {s['write_errors']} write errors"
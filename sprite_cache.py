@@ -0,0 +1,121 @@
+"""Byte-budgeted LRU cache for scaled sprites.
+
+Scaled copies are keyed on a stable id per source surface (handed out the
+first time a surface is seen and dropped together with it), so a freed
+surface can never alias a new one the way id() can. Requested sizes are
+rounded to a multiple of `step` pixels so neighbouring z values share one
+entry, and the least recently used entries are evicted once the cached
+pixels exceed `budget_bytes`.
+"""
+import itertools
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+
+class SpriteCache:
+    def __init__(self, budget_bytes=48 * 1024 * 1024, step=2):
+        self.budget_bytes = budget_bytes
+        self.step = max(1, int(step))
+        self.entries = OrderedDict()
+        self.source_ids = weakref.WeakKeyDictionary()
+        self.next_id = itertools.count(1)
+        self.bytes = 0
+        self.peak_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def source_key(self, img):
+        key = self.source_ids.get(img)
+        if key is None:
+            key = next(self.next_id)
+            self.source_ids[img] = key
+        return key
+
+    def quantize(self, size):
+        step = self.step
+        w = max(1, int(size[0]))
+        h = max(1, int(size[1]))
+        if step > 1:
+            w = max(step, (w + step // 2) // step * step)
+            h = max(step, (h + step // 2) // step * step)
+        return w, h
+
+    def scale(self, img, size):
+        """img scaled to `size` (rounded to the cache step)."""
+        w, h = self.quantize(size)
+        key = (self.source_key(img), w, h)
+        entries = self.entries
+        surf = entries.get(key)
+        if surf is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = pygame.transform.scale(img, (w, h))
+        self.put(key, surf)
+        return surf
+
+    def render(self, name, size, draw):
+        """Cached surface made by draw((w, h)), for generated sprites (shadows,
+        glows) that have no source image. `name` must be hashable and
+        identify everything else the drawing depends on."""
+        w, h = self.quantize(size)
+        key = (name, w, h)
+        entries = self.entries
+        surf = entries.get(key)
+        if surf is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = draw((w, h))
+        self.put(key, surf)
+        return surf
+
+    def put(self, key, surf):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= self.surface_bytes(old)
+        self.entries[key] = surf
+        self.bytes += self.surface_bytes(surf)
+        while self.bytes > self.budget_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= self.surface_bytes(evicted)
+            self.evictions += 1
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+
+    @staticmethod
+    def surface_bytes(surf):
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+        self.peak_bytes = self.bytes
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "peak_bytes": self.peak_bytes,
+            "budget_bytes": self.budget_bytes,
+        }
+
+    def format_stats(self, label="sprite cache"):
+        s = self.stats()
+        return (f"{label}: {s['hits']} hits, {s['misses']} misses ({100 * s['hit_rate']:.1f}% hit), "
+                f"{s['evictions']} evictions, {s['entries']} entries, "
+                f"{s['bytes'] / 2**20:.1f}/{s['budget_bytes'] / 2**20:.0f} MiB (peak {s['peak_bytes'] / 2**20:.1f})")
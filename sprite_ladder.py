@@ -0,0 +1,80 @@
+"""Pre-scaled "ladders" of sprites that are drawn at many sizes.
+
+Sprites whose size follows z (enemy cars, robot frames, explosions) would
+otherwise be rescaled to a slightly different size almost every frame. A
+ladder holds the sprite at a fixed set of geometrically spaced scales
+("rungs"), made with smoothscale, and drawing picks the nearest rung.
+
+The number of rungs sets the memory/quality trade-off: more rungs means
+smaller size jumps between rungs and more pixels kept in memory. Rungs are
+built on first use unless `prebuild` is set.
+"""
+import math
+from bisect import bisect_left
+
+import pygame
+
+
+class SpriteLadder:
+    def __init__(self, img, base_size, min_scale, max_scale, rungs, prebuild=False):
+        self.img = img
+        self.base_w, self.base_h = base_size
+        if rungs < 2 or max_scale <= min_scale:
+            self.scales = [max_scale]
+        else:
+            ratio = (max_scale / min_scale) ** (1.0 / (rungs - 1))
+            self.scales = [min_scale * ratio ** i for i in range(rungs)]
+        # rung boundaries halfway between neighbours in log space
+        self.bounds = [math.sqrt(a * b) for a, b in zip(self.scales, self.scales[1:])]
+        self.surfaces = [None] * len(self.scales)
+        self.bytes = 0
+        if prebuild:
+            for i in range(len(self.scales)):
+                self.rung(i)
+
+    def rung(self, i):
+        surf = self.surfaces[i]
+        if surf is None:
+            s = self.scales[i]
+            size = (max(1, int(self.base_w * s)), max(1, int(self.base_h * s)))
+            if self.img.get_bitsize() >= 24:
+                surf = pygame.transform.smoothscale(self.img, size)
+            else:
+                surf = pygame.transform.scale(self.img, size)
+            self.surfaces[i] = surf
+            self.bytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        return surf
+
+    def nearest(self, size):
+        """The rung closest to `size` (only the width is compared)."""
+        scale = size[0] / self.base_w if self.base_w else 1.0
+        return self.rung(bisect_left(self.bounds, scale))
+
+
+class LadderSet:
+    """Ladders keyed by source surface, with shared settings and totals."""
+    def __init__(self, rungs=40, prebuild=False):
+        self.rungs = rungs
+        self.prebuild = prebuild
+        self.ladders = {}
+
+    def add(self, img, base_size, min_scale, max_scale):
+        ladder = SpriteLadder(img, base_size, min_scale, max_scale, self.rungs, self.prebuild)
+        self.ladders[img] = ladder
+        return ladder
+
+    def get(self, img):
+        return self.ladders.get(img)
+
+    def stats(self):
+        built = sum(s is not None for l in self.ladders.values() for s in l.surfaces)
+        return {
+            "ladders": len(self.ladders),
+            "rungs_built": built,
+            "bytes": sum(l.bytes for l in self.ladders.values()),
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"sprite ladders: {s['ladders']} sprites x {self.rungs} rungs, "
+                f"{s['rungs_built']} built, {s['bytes'] / 2**20:.1f} MiB")
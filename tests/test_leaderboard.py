@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+import main
+from conftest import ROOT_DIR
+
+
+def test_importing_the_game_leaves_the_score_db_closed():
+    assert main._leaderboard is None
+
+
+def test_headless_simulation_does_not_create_the_score_db(tmp_path):
+    code = (
+        "import main, simulate\n"
+        f"main.LEADERBOARD_DB = {str(tmp_path / 'scores.db')!r}\n"
+        "simulate.run(300, seed=1)\n"
+        "assert main._leaderboard is None\n"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT_DIR, check=True, capture_output=True)
+    assert not os.path.exists(tmp_path / "scores.db")
+
+
+def test_get_leaderboard_opens_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "LEADERBOARD_DB", str(tmp_path / "scores.db"))
+    monkeypatch.setattr(main, "LEADERBOARD_FILE", None)
+    monkeypatch.setattr(main, "_leaderboard", None)
+    board = main.get_leaderboard()
+    try:
+        assert main.get_leaderboard() is board
+        assert board.record(120, car=0, duration_s=3.0, kills=1) == [120]
+        board.flush(timeout=5)
+        assert [run["score"] for run in board.top(3).result(timeout=5)] == [120]
+    finally:
+        board.close()
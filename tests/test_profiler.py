@@ -0,0 +1,49 @@
+import csv
+import time
+
+import pygame
+
+from profiler import FrameProfiler
+
+
+def run_frame(profiler, render=True):
+    profiler.begin_frame()
+    profiler.mark("events")
+    time.sleep(0.002)
+    profiler.mark("sim")
+    if render:
+        profiler.mark("draw")
+        profiler.end_frame()
+    else:
+        profiler.discard_frame()
+
+
+def test_discarded_frames_are_not_sampled(tmp_path):
+    profiler = FrameProfiler(("events", "sim", "draw"), csv_dir=str(tmp_path))
+    profiler.enable()
+    profiler.discard_frame()          # the frame F3 was pressed in
+    run_frame(profiler)
+    for _ in range(5):
+        run_frame(profiler, render=False)
+    time.sleep(0.05)                  # idle wait: must not land in the next sample
+    run_frame(profiler)
+    # marks and end_frame outside a frame are ignored
+    profiler.mark("draw")
+    profiler.end_frame()
+    profiler.disable()
+
+    stats = profiler.stats()
+    assert stats["frames"] == 2
+    assert stats["skipped"] == 6
+    assert stats["mean_ms"] < 40
+    with open(profiler.csv_path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert len(rows) == 3
+
+
+def test_off_profiler_records_nothing():
+    profiler = FrameProfiler(("events", "sim", "draw"))
+    run_frame(profiler)
+    run_frame(profiler, render=False)
+    assert profiler.stats()["frames"] == 0
+    assert profiler.draw(pygame.Surface((10, 10)), (0, 0)) is None
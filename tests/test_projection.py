@@ -0,0 +1,54 @@
+import random
+
+import pygame
+
+import main
+from projection import Projection
+
+
+def exact_obstacle_rect(obs):
+    """Obstacle.get_rect() with PROJECTION.exact() instead of the tables."""
+    y, scale, left, right, lane_xs = main.PROJECTION.exact(obs.z)
+    w = int(obs.base_w * scale); h = int(obs.base_h * scale)
+    if obs.kind == "roadblock":
+        x = (lane_xs[obs.lane] + lane_xs[obs.lane + 1]) * 0.5
+        w = int((right - left) / main.LANES * 2 * 0.95 * scale)
+    else:
+        x = lane_xs[obs.lane]
+    rect = pygame.Rect(0, 0, w, h); rect.center = (int(x), int(y - h * 0.10))
+    return rect
+
+
+def test_obstacle_rects_within_one_pixel_of_exact():
+    rng = random.Random(4)
+    worst = 0
+    for _ in range(200_000):
+        kind = rng.choice(("car", "cone", "roadblock"))
+        lane = rng.randrange(main.LANES - 1 if kind == "roadblock" else main.LANES)
+        obs = main.Obstacle(lane, rng.uniform(0.0, 1.3), kind)
+        got, want = obs.get_rect(), exact_obstacle_rect(obs)
+        worst = max(worst, abs(got.x - want.x), abs(got.y - want.y),
+                    abs(got.w - want.w), abs(got.h - want.h))
+    assert worst <= 1
+
+
+def test_lookups_match_exact_formulas():
+    proj = main.PROJECTION
+    for i in range(0, 13_001):
+        z = i / 10_000
+        y, scale, left, right, centers = proj.at(z)
+        ey, escale, eleft, eright, ecenters = proj.exact(z)
+        assert scale == escale
+        assert abs(y - ey) < 0.5 and abs(left - eleft) < 0.5 and abs(right - eright) < 0.5
+        assert max(abs(a - b) for a, b in zip(centers, ecenters)) < 0.5
+
+
+def test_project_many_matches_at():
+    proj = Projection(100, 700, 80, 900, 400, 4)
+    zs = [0.0, 0.13, 0.5, 0.97, 1.2]
+    ys, scales, lefts, rights, centers = proj.project_many(zs)
+    for k, z in enumerate(zs):
+        y, scale, left, right, lane_xs = proj.at(z)
+        got = [ys[k], scales[k], lefts[k], rights[k], *centers[k]]
+        want = [y, scale, left, right, *lane_xs]
+        assert max(abs(a - b) for a, b in zip(got, want)) < 1e-9
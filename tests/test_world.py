@@ -0,0 +1,103 @@
+import random
+
+import main
+
+
+class RecordingAudio:
+    def __init__(self):
+        self.calls = []
+
+    def play(self, name, sound):
+        self.calls.append(("play", name))
+
+    def set_loop(self, name, sound):
+        self.calls.append(("set_loop", name))
+
+    def stop(self):
+        self.calls.append(("stop", None))
+
+
+def race(world, car_idx=0):
+    world.start(car_idx)
+    idle = main.FrameInput()
+    while world.counting_down:
+        world.step(idle)
+
+
+def test_step_queues_robot_transform_without_playing(monkeypatch):
+    audio = RecordingAudio()
+    monkeypatch.setattr(main, "AUDIO", audio)
+    random.seed(0)
+    world = main.World()
+    race(world)
+    assert world.player.transform_frames
+
+    world.robot_active = True
+    world.robot_timer = 3
+    events = world.take_events()
+    idle = main.FrameInput()
+    for _ in range(10):
+        world.step(idle)
+        events += world.take_events()
+
+    assert audio.calls == []
+    # robot mode was forced on, so the only one is the reverse transform
+    assert events.count("transform") == 1
+    assert world.player.robot_reverting
+
+
+def test_step_never_plays_audio(monkeypatch):
+    audio = RecordingAudio()
+    monkeypatch.setattr(main, "AUDIO", audio)
+    random.seed(1)
+    world = main.World()
+    race(world)
+    inputs = main.FrameInput(shoot=True, boost=True)
+    for _ in range(600):
+        world.step(inputs)
+        if not world.alive and not world.explosions:
+            race(world)
+    assert audio.calls == []
+
+
+def test_all_pairs_and_broad_phase_find_the_same_hits():
+    rng = random.Random(2)
+    corridors = main.bullet_lane_corridors()
+    for _ in range(50):
+        obstacles = []
+        for _ in range(rng.randrange(1, 40)):
+            kind = rng.choice(("car", "cone", "roadblock"))
+            lane = rng.randrange(main.LANES - 1 if kind == "roadblock" else main.LANES)
+            obstacles.append(main.Obstacle(lane, rng.uniform(0.03, 1.0), kind))
+        broad = main.LaneBroadPhase(obstacles, corridors)
+        for _ in range(10):
+            blt = main.Bullet(rng.randrange(main.LANES), rng.uniform(0.02, 0.84))
+            brect = blt.get_rect()
+            hit = broad.first_hit(brect, blt.lane)
+            plain = main.first_hit_all_pairs(obstacles, brect)
+            assert (hit and hit[1]) is (plain and plain[0])
+
+
+def test_shoot_cooldown_runs_out_while_paused():
+    world = main.World()
+    race(world)
+    world.step(main.FrameInput(shoot=True))
+    assert world.shoot_cooldown > 0
+    # the paused branch of main(): no step(), just the cooldown and explosions
+    for _ in range(main.NORMAL_SHOOT_COOLDOWN):
+        world.tick_shoot_cooldown()
+        world.update_explosions()
+    assert world.shoot_cooldown == 0
+
+
+def test_obstacle_store_remove_keeps_row_order():
+    obstacles = [main.Obstacle(i % main.LANES, 0.1 * i, "cone") for i in range(8)]
+    store = main.ObstacleStore(capacity=4)
+    for obs in obstacles:
+        store.append(obs)
+    views = list(store)
+    for k in (2, 0, 5):
+        store.remove(views[k])
+        obstacles.remove(obstacles[[o.z for o in obstacles].index(0.1 * k)])
+    assert [(v.lane, v.z) for v in store] == [(o.lane, o.z) for o in obstacles]
+    assert [v.slot for v in store] == list(range(len(store)))
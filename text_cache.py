@@ -0,0 +1,167 @@
+"""Cached text rendering for the HUD and overlays.
+
+TextCache keeps rendered strings in an LRU keyed by (font, text, color), and
+also the outlined variant (the outline pass blitted around the text) as one
+surface, so a HUD line that did not change costs one blit.
+
+GlyphAtlas is for numbers that change every frame (the score): each
+character is rendered and outlined once, and a number is drawn by blitting
+glyphs at their advance widths, without calling font.render at all.
+
+Outlined images are stored premultiplied; blit them with
+pygame.BLEND_PREMULTIPLIED (TextCache.blit_outlined and GlyphAtlas.draw do).
+"""
+from collections import OrderedDict
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OUTLINE = 2
+# Where the outline copies go relative to the text. (+2, 0) appears twice: the
+# HUD has always drawn it that way, which makes the right edge a bit darker.
+OUTLINE_OFFSETS = ((-OUTLINE, 0), (OUTLINE, 0), (0, -OUTLINE), (OUTLINE, 0))
+
+
+def stack(size, layers):
+    """Premultiplied 'over' of [(surface, pos), ...] on a transparent surface."""
+    img = pygame.Surface(size, pygame.SRCALPHA)
+    for layer, pos in layers:
+        img.blit(layer, pos, special_flags=pygame.BLEND_PREMULTIPLIED)
+    return img
+
+
+def unpremultiply(surf):
+    """Turn a premultiplied SRCALPHA surface back into plain alpha, in place.
+
+    Needed for layers that are faded with set_alpha(), which only works with
+    plain alpha. Without NumPy the surface is left as it is (semi-transparent
+    edges come out slightly darker).
+    """
+    if np is None:
+        return surf
+    alpha = pygame.surfarray.pixels_alpha(surf)
+    rgb = pygame.surfarray.pixels3d(surf)
+    partial = (alpha > 0) & (alpha < 255)
+    a = alpha[partial].astype(np.uint32)[:, None]
+    rgb[partial] = np.minimum(255, (rgb[partial].astype(np.uint32) * 255 + a // 2) // a)
+    del alpha, rgb
+    return surf
+
+
+def outline_layers(base, outline, with_base=True):
+    """Layers for `base` outlined with `outline`, text origin at (OUTLINE, OUTLINE)."""
+    outline = outline.convert_alpha().premul_alpha()
+    layers = [(outline, (OUTLINE + dx, OUTLINE + dy)) for dx, dy in OUTLINE_OFFSETS]
+    if with_base:
+        layers.append((base.convert_alpha().premul_alpha(), (OUTLINE, OUTLINE)))
+    return layers
+
+
+def outlined_size(size):
+    w, h = size
+    return w + 2 * OUTLINE, h + OUTLINE
+
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, make):
+        entries = self.entries
+        surf = entries.get(key)
+        if surf is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = make()
+        entries[key] = surf
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return surf
+
+    def render(self, font, text, color):
+        """font.render(text, True, color), cached."""
+        color = tuple(color)
+        return self._get((font, text, color, None), lambda: font.render(text, True, color))
+
+    def outlined(self, font, text, color, outline_color=(0, 0, 0)):
+        """Premultiplied text + outline; the text itself sits at (OUTLINE, OUTLINE)."""
+        color = tuple(color)
+        outline_color = tuple(outline_color)
+
+        def make():
+            base = font.render(text, True, color)
+            outline = font.render(text, True, outline_color)
+            return stack(outlined_size(base.get_size()), outline_layers(base, outline))
+        return self._get((font, text, color, outline_color), make)
+
+    def blit_outlined(self, surf, font, text, color, pos, center=False):
+        img = self.outlined(font, text, color)
+        if center:
+            w, h = img.get_width() - 2 * OUTLINE, img.get_height() - OUTLINE
+            x, y = pos[0] - w // 2, pos[1] - h // 2
+        else:
+            x, y = pos
+        return surf.blit(img, (x - OUTLINE, y - OUTLINE), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"text cache: {s['hits']} hits, {s['misses']} misses ({100 * s['hit_rate']:.1f}% hit), "
+                f"{s['entries']}/{self.max_entries} entries")
+
+
+class GlyphAtlas:
+    """Outlined glyphs for `chars`, drawn side by side at their advances.
+
+    All outlines are drawn before all glyph bodies, as with a whole rendered
+    string, so an outline never covers the previous character.
+    """
+    def __init__(self, font, color, chars="0123456789", outline_color=(0, 0, 0)):
+        self.font = font
+        self.glyphs = {}
+        for ch in chars:
+            base = font.render(ch, True, color)
+            outline = font.render(ch, True, outline_color)
+            outline_img = stack(outlined_size(base.get_size()), outline_layers(base, outline, with_base=False))
+            # fractional advance: whole strings are laid out with sub-pixel
+            # advances, so the integer metrics() advance drifts over a number
+            advance = font.size(ch * 64)[0] / 64
+            self.glyphs[ch] = (outline_img, base.convert_alpha().premul_alpha(), advance)
+
+    def width(self, text):
+        return round(sum(self.glyphs[ch][2] for ch in text))
+
+    def draw(self, surf, text, pos):
+        """Draw `text` with its top-left at pos; returns the x after the last glyph."""
+        x, y = pos
+        outlines = []
+        bodies = []
+        for ch in text:
+            outline_img, body, advance = self.glyphs[ch]
+            ix = round(x)
+            outlines.append((outline_img, (ix - OUTLINE, y - OUTLINE), None, pygame.BLEND_PREMULTIPLIED))
+            bodies.append((body, (ix, y), None, pygame.BLEND_PREMULTIPLIED))
+            x += advance
+        surf.blits(outlines, doreturn=False)
+        surf.blits(bodies, doreturn=False)
+        return round(x)